@@ -9,8 +9,8 @@ Enhanced Python program with 4-panel dashboard:
 
 REQUIREMENTS:
 - pip install selenium
-- Edge browser installed
-- EdgeDriver (will auto-download with selenium 4.6+)
+- Edge, Chrome or Chromium installed (see BROWSER_BACKEND)
+- Matching driver (will auto-download with selenium 4.6+)
 
 USAGE:
 1. Run: python quinix_dashboard.py
@@ -18,25 +18,55 @@ USAGE:
 3. Click DONE LOGGING IN button
 4. Click START WORKERS button
 5. Watch the dashboard!
+
+UNATTENDED (no Tk, e.g. on a Linux server once the golden profile exists):
+    python quinix_dashboard.py --headless --config quinix.json --max-runtime 240
+Progress is written to stdout as one JSON object per line and the run exits
+with a summary (exit code 0 = every worker drained its list).
 """
 
 import time
 from selenium import webdriver
 from selenium.webdriver.edge.service import Service
 from selenium.webdriver.edge.options import Options
+from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.common.by import By
 from pathlib import Path
 import sys
-import tkinter as tk
-from tkinter import scrolledtext, ttk
+import argparse
 import threading
-from datetime import datetime
+import queue
+from datetime import datetime, date, timedelta
 import subprocess
+import socket
 import os
 import sqlite3
 import shutil
+import json
+import re
+import hashlib
+import gzip
+import asyncio
+import base64
+import struct
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures, TimeoutError as FutureTimeoutError
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from collections import deque
 import ctypes
+import signal
+
+try:
+    import psutil  # Optional: process sampling on Windows/macOS (Linux reads /proc)
+except ImportError:
+    psutil = None
+
+try:
+    import tkinter as tk
+    from tkinter import scrolledtext, ttk
+except ImportError:
+    tk = None  # Servers often ship Python without Tk - only --headless works then
 
 # Windows sleep prevention
 ES_CONTINUOUS = 0x80000000
@@ -50,11 +80,183 @@ ES_DISPLAY_REQUIRED = 0x00000002
 # Update this URL to your Quinyx absence request page
 QUINYX_URL = "https://web.quinyx.com/schedule/191654?end=2026-02-28&start=2026-02-01&timeframe=multiday_month"
 
+# Optional lighter landing page for the workers (None = use QUINYX_URL).
+# Workers only need the notifications panel, so a single-day view renders far
+# less schedule grid, e.g.:
+# "https://web.quinyx.com/schedule/191654?end=2026-02-01&start=2026-02-01&timeframe=day"
+LEAN_LANDING_URL = None
+
+# Date-range sharding: split QUINYX_URL's start..end between the workers so each
+# tab only loads its own slice (overrides LEAN_LANDING_URL while enabled)
+DATE_SHARDING = False
+SHARD_MIN_DAYS = 1  # A slice is never split below this many days when rebalancing
+SHARD_OVERLAP_KEYS = 2  # Top rows two slices may share before the panel counts as ignoring the date filter
+
+# Resource blocking via CDP Network.setBlockedURLs (applied before first navigation).
+# Opt-in: run with PAGE_PROFILE_BENCHMARK first and check the panel still works blocked.
+# SVG (inline UI icons) and LaunchDarkly (feature flags that switch UI parts) are never blocked.
+BLOCK_RESOURCES = False
+BLOCKED_URL_PATTERNS = [
+    # Raster images
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.ico",
+    # Fonts
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*fonts.googleapis.com*", "*fonts.gstatic.com*",
+    # Analytics, tracking and support widgets
+    "*google-analytics.com*", "*googletagmanager.com*", "*hotjar*", "*segment.io*",
+    "*segment.com*", "*mixpanel*", "*intercom*", "*sentry.io*", "*newrelic*", "*nr-data.net*",
+    "*pendo.io*", "*fullstory*",
+]
+PAGE_PROFILE_BENCHMARK = False  # Load every window unblocked and blocked once and log the difference
+
+# Browser backend: 'edge', 'chrome' or 'chromium'
+BROWSER_BACKEND = 'edge'
+BROWSER_BINARY = None  # Optional explicit browser binary, e.g. "/usr/bin/chromium"
+HEADLESS = False  # Run without any visible windows (e.g. on a Linux server)
+
+# Root folder for the per-worker browser profiles
+if os.name == 'nt':
+    PROFILE_ROOT = r"C:\Users\MadsE\Desktop\quinix-workers"
+else:
+    PROFILE_ROOT = os.path.expanduser("~/.quinix-workers")
+
+# Golden profile: log in once, then every worker starts from a trimmed clone
+USE_GOLDEN_PROFILE = True
+GOLDEN_PROFILE_DIR = os.path.join(PROFILE_ROOT, "GoldenProfile")
+PROFILE_TMPFS = None  # e.g. "/dev/shm/quinix-workers" - put the clones on tmpfs for faster profile I/O
+# Cache/history bloat removed from the golden profile and never cloned
+PROFILE_TRIM_PATTERNS = [
+    'Cache', 'Code Cache', 'GPUCache', 'GrShaderCache', 'ShaderCache', 'DawnCache',
+    'DawnGraphiteCache', 'DawnWebGPUCache', 'Service Worker', 'blob_storage', 'Crashpad',
+    'History', 'History-journal', 'Top Sites', 'Top Sites-journal', 'Visited Links',
+    'BrowserMetrics*', 'optimization_guide*', 'Safe Browsing*', 'component_crx_cache',
+    'Singleton*', 'lockfile', '*.log', '*.tmp',
+]
+GOLDEN_INNER_PROFILE = "Golden"  # Name of the profile-directory inside the golden copy
+
+# Session sharing: copy auth cookies/storage from one logged-in window to all others
+SHARE_SESSION = True
+SESSION_CHECK_INTERVAL = 120  # Look for expired sessions every 2 minutes
+LOGIN_URL_MARKERS = ('login', 'signin', 'sso', 'oauth', 'authorize')
+
+# Fleet mode: 'windows' = one browser (own profile/processes/driver) per worker,
+# 'contexts' = ONE browser where every worker is a tab in its own isolated browser context
+FLEET_MODE = 'windows'
+FLEET_BENCHMARK = False  # Launch both fleet modes once and compare startup time + memory first
+
+# Controller backend: 'cdp' = one asyncio loop talking to every browser's DevTools
+# websocket concurrently, 'selenium' = the blocking one-driver-at-a-time path.
+# Workers whose DevTools endpoint cannot be reached always fall back to Selenium.
+CONTROLLER_BACKEND = 'cdp'
+CDP_CALL_TIMEOUT = 15  # Seconds before a single DevTools call is given up
+
+# Headless controller (--headless): no Tk window, JSON lines on stdout
+HEADLESS_PROGRESS_INTERVAL = 60  # Seconds between progress records
+
+# Web dashboard: live view in any browser on this machine, pushed over Server-Sent Events
+WEB_DASHBOARD_PORT = None  # e.g. 8765 -> http://127.0.0.1:8765 (None = off)
+WEB_DASHBOARD_HOST = "127.0.0.1"  # Only this machine - use "0.0.0.0" to expose it on the LAN
+WEB_LOG_LINES = 300  # Log lines kept for clients that connect later
+WEB_CLIENT_QUEUE = 1000  # Pending events per client before a slow client is dropped
+LATENCY_BUCKETS_MS = (250, 500, 1000, 2000, 4000, 8000)  # Histogram upper bounds (last bucket = above)
+
+# Log pipeline: windows get log lines in batches, the full history goes to a
+# rotating JSONL file (rotated files are gzipped: quinix_log.jsonl.1.gz, ...)
+LOG_FLUSH_INTERVAL_MS = 250  # How often queued lines are written into the log window
+LOG_QUEUE_MAX = 2000  # Lines waiting for the window (or the file writer) before the oldest are skipped
+LOG_WIDGET_LINES = 500  # Lines kept in the log window
+LOG_FILE = "quinix_log.jsonl"  # None = no log file
+LOG_FILE_MAX_MB = 20  # Rotate once the current file reaches this size
+LOG_FILE_BACKUPS = 5  # Gzipped rotations kept
+
+# Concurrent polling: hard deadline per driver call + circuit breaker per driver
+POLL_TIMEOUT = 10  # Seconds a single poll/refresh may take before it counts as failed
+POLL_POOL_SIZE = 12  # Threads for the Selenium fan-out
+BREAKER_FAILURE_THRESHOLD = 3  # Consecutive failures before a driver is parked
+BREAKER_COOLDOWN = 120  # Seconds a parked driver is left alone before one trial call
+
+# Keep background windows running at full speed (replaces the silent AudioContext hack)
+ANTI_THROTTLE_FLAGS = [
+    "--disable-background-timer-throttling",
+    "--disable-renderer-backgrounding",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-features=CalculateNativeWinOcclusion,IntensiveWakeUpThrottling",
+]
+
 # Window arrangement settings
 WINDOW_WIDTH = 640
 WINDOW_HEIGHT = 540
+GRID_COLUMNS = 3
+GRID_ROWS = 2
 STATUS_CHECK_INTERVAL = 30  # Check worker status every 30 seconds
 REFRESH_INTERVAL = 300  # Refresh all windows every 5 minutes to keep them active
+PERIODIC_REFRESH = False  # Blanket refresh every REFRESH_INTERVAL (memory trimming makes it unnecessary)
+RESOURCE_SAMPLE_INTERVAL = 10  # Sample CPU/RSS of each worker's browser every 10 seconds
+AUTO_RESTART_DEAD_WORKERS = True  # Kill + relaunch only the dead worker's browser tree
+CLOSE_BROWSERS_ON_EXIT = False  # Kill each worker's browser tree when the controller exits
+
+# Reattach: every browser gets a fixed DevTools port so a restarted controller can pick it up again
+DEBUG_PORT_BASE = 9300  # Worker N listens on DEBUG_PORT_BASE + N (None = let the driver choose)
+STATE_FILE = "quinix_state.json"  # Ports/PIDs/shards of the running fleet
+REATTACH_ON_START = True  # Reconnect to browsers from STATE_FILE that are still alive (windows mode)
+
+# In-place memory trimming: escalate GC -> prune rows -> memory pressure -> reload
+MEMORY_CHECK_INTERVAL = 60  # Read JS heap / DOM nodes per worker every minute
+MEMORY_HEAP_LIMIT_MB = 300  # Trim when the JS heap grows past this
+MEMORY_NODE_LIMIT = 60000  # ... or when the page holds more DOM nodes than this
+MEMORY_HISTORY_POINTS = 120  # Memory samples kept per worker for the over-time report
+
+# Throttle detection: the workers report timer drift, long tasks and hidden time
+THROTTLE_LAG_MS = 1000  # p95 timer drift at/above this means the tab is being throttled
+THROTTLE_STRIKES = 3  # Throttled polls in a row before the controller acts
+THROTTLE_ACTION = 'focus'  # None = only flag it | 'focus' = focus emulation + un-minimise | 'restart' = escalate to restart
+
+# Autoscaling: add/retire workers at runtime from measured throughput and host headroom
+AUTOSCALE = False
+AUTOSCALE_INTERVAL = 300  # Seconds between scaling decisions (long enough to measure throughput)
+AUTOSCALE_MIN_WORKERS = 1
+AUTOSCALE_MAX_WORKERS = 10  # With DATE_SHARDING in windows mode it may open windows beyond the worker files up to this
+AUTOSCALE_ADD_CPU = 60  # Only add a worker while host CPU is below this (%)
+AUTOSCALE_MAX_CPU = 85  # Retire a worker when host CPU is above this (%)
+AUTOSCALE_MIN_FREE_MB = 1024  # Retire a worker when less RAM than this is available
+AUTOSCALE_MAX_ERROR_RATE = 0.05  # Server errors per click above this = the server pushes back
+AUTOSCALE_MIN_GAIN = 0.10  # An added worker must raise fleet throughput by at least 10%
+AUTOSCALE_CEILING_TTL = 1800  # Seconds a "no gain" ceiling holds before adding is tried again
+
+# Workload discovery: learn the real backlog from the listing XHRs instead of a fixed number
+WORKLOAD_ESTIMATE = 11903  # Only used for progress/ETA until the real backlog is known
+WORKLOAD_INDEX_DB = "quinix_workload.db"  # Local index of discovered request IDs (None = in memory)
+DONE_STATUS_PATTERN = re.compile(r'(denied|rejected|declined|approved|cancel)', re.I)
+
+# Endgame: with few rows left the fractional positions collide, so fewer workers keep going
+ENDGAME_THRESHOLD = 60  # Remaining rows at which only the top and bottom worker keep going
+ENDGAME_SOLO_THRESHOLD = 5  # ... and below this only worker 1
+ENDGAME_PARK_URL = "about:blank"  # Parked windows drop their page to free memory
+
+# Retry queue: failed rows come back with exponential backoff, then go to the dead letters
+FAILURE_REASONS = ('NO_DENY_BUTTON', 'EXCEPTION', 'SERVER_ERROR', 'CLIENT_ERROR', 'NO_RESPONSE')
+RETRY_MAX_ATTEMPTS = 3  # Attempts per row before it becomes a dead letter
+RETRY_BASE_DELAY = 30  # Seconds before the first retry, doubled per attempt
+RETRY_MAX_DELAY = 600  # Backoff cap
+NON_RETRYABLE_REASONS = ('CLIENT_ERROR',)  # The server said no - retrying will not change that
+DEAD_LETTER_FILE = "quinix_dead_letters.jsonl"  # One JSON line per row that was given up on
+
+# Run history: every run's config, throughput series, latencies and failures (python quinix_dashboard.py --report)
+RUN_HISTORY_DB = "quinix_runs.db"  # None = keep no history
+REGRESSION_BASELINE_RUNS = 5  # Earlier runs a run is compared against
+REGRESSION_THRESHOLD = 0.15  # Flag a run whose steady throughput per worker is this much below the baseline
+
+# Live config: pacing/batching pushed to running workers with the status poll (no re-injection)
+LIVE_CONFIG_KEYS = {  # Worker CONFIG key -> smallest allowed value (bool = on/off)
+    'delayBetweenDeletes': 0,
+    'batchSize': 1,
+    'pauseBetweenBatches': 0,
+    'denyResponseTimeout': 1000,
+    'pipeline': bool,
+    'pipelineSampleEvery': 1,
+    'liveWindow': 0,
+}
+CONFIG_WINDOW = 300  # Seconds of throughput compared before and after each change
+CONFIG_CHANGE_LOG = "quinix_config_changes.jsonl"  # One JSON line per change with its before/after throughput
 
 # Worker names mapping
 WORKER_NAMES = {
@@ -76,14 +278,784 @@ WORKER_FILES = [
     "worker-6-bottom.txt"
 ]
 
+# Driver backends: webdriver class, options class, profile folder prefix and
+# binaries to look for on PATH when BROWSER_BINARY is not set
+DRIVER_BACKENDS = {
+    'edge': {
+        'driver': webdriver.Edge,
+        'options': Options,
+        'profile_prefix': 'EdgeProfile',
+        'binaries': [],
+    },
+    'chrome': {
+        'driver': webdriver.Chrome,
+        'options': ChromeOptions,
+        'profile_prefix': 'ChromeProfile',
+        'binaries': [],
+    },
+    'chromium': {
+        'driver': webdriver.Chrome,
+        'options': ChromeOptions,
+        'profile_prefix': 'ChromiumProfile',
+        'binaries': ['chromium', 'chromium-browser'],
+    },
+}
+
+# ============================================================================
+# CONSOLE FRONTENDS
+# ============================================================================
+
+class LoginRequired(Exception):
+    """A login is needed but this frontend has nobody to do it"""
+
+
+class ConsoleFrontend:
+    """What the controller needs from a frontend - every display hook is a no-op here
+    
+    The controller only talks to this interface, so the Tk dashboard, the tab
+    manager's log window and the headless CLI all run the same engine.
+    """
+    
+    interactive = True  # Someone can click buttons / press Enter
+    
+    def __init__(self):
+        self.worker_stats = {i: self._new_stats() for i in range(1, len(WORKER_FILES) + 1)}
+        self.start_time = time.time()
+        self.total_processed = 0
+        self.total_target = WORKLOAD_ESTIMATE  # Total absence requests (replaced once discovered)
+        self.workload_source = 'estimate'
+        self.started = False
+        self.login_done = False
+        self.config_requests = []  # (worker index or None for the fleet, "key=value ...")
+    
+    @staticmethod
+    def _new_stats():
+        return {'deleted': 0, 'failed': 0, 'unconfirmed': 0, 'latency_ms': None, 'last_update': time.time()}
+    
+    def ensure_worker(self, worker_num):
+        """-> True once worker_num has its place - the autoscaler can start more workers than there are scripts"""
+        if worker_num < 1:
+            return False
+        if worker_num not in self.worker_stats:
+            self.worker_stats[worker_num] = self._new_stats()
+            self.worker_added(worker_num)
+        return True
+    
+    def worker_added(self, worker_num):
+        """A worker beyond the ones shown so far joined - frontends add its display here"""
+        pass
+    
+    def add_log(self, message, worker_id=None, log_type='info'):
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] " + (f"[{worker_id}] " if worker_id else "") + message)
+    
+    def update_worker_stats(self, worker_num, deleted, failed, unconfirmed=0, latency_ms=None):
+        if self.ensure_worker(worker_num):
+            self.worker_stats[worker_num].update(
+                deleted=deleted, failed=failed, unconfirmed=unconfirmed, latency_ms=latency_ms, last_update=time.time()
+            )
+            self.total_processed = sum(s['deleted'] + s['failed'] + s['unconfirmed'] for s in self.worker_stats.values())
+    
+    def set_workload(self, remaining, source):
+        """Progress target = what is done so far + what is still pending"""
+        self.total_target = self.total_processed + max(0, remaining)
+        self.workload_source = source
+    
+    def progress(self):
+        """Totals, throughput and ETA since the start"""
+        runtime = max(1.0, time.time() - self.start_time)
+        speed = self.total_processed / runtime * 60
+        remaining = max(0, self.total_target - self.total_processed)
+        return {
+            'processed': self.total_processed,
+            'denied': sum(s['deleted'] for s in self.worker_stats.values()),
+            'failed': sum(s['failed'] for s in self.worker_stats.values()),
+            'unconfirmed': sum(s['unconfirmed'] for s in self.worker_stats.values()),
+            'target': self.total_target,
+            'workload_source': self.workload_source,
+            'per_min': round(speed, 1),
+            'eta_min': round(remaining / speed, 1) if speed > 0 else None,
+            'runtime_s': int(runtime),
+        }
+    
+    def finish(self, summary):
+        """The run is over - show its summary"""
+        self.add_log("=" * 80, log_type='system')
+        self.add_log(
+            f">> RUN SUMMARY ({summary['reason']}): {summary['denied']:,} denied, {summary['failed']:,} failed, "
+            f"{summary['unconfirmed']:,} unconfirmed in {summary['runtime_s'] // 60} min ({summary['per_min']}/min)",
+            log_type='success' if summary['reason'] == 'done' else 'system'
+        )
+        self.add_log(
+            f">> Dead letters: {summary['dead_letters']} | retries pending: {summary['retries_pending']} | "
+            f"remaining: {summary['remaining'] if summary['remaining'] is not None else 'unknown'}",
+            log_type='system'
+        )
+    
+    def take_config_requests(self):
+        """Config changes requested since the last call"""
+        requests, self.config_requests = self.config_requests, []
+        return requests
+    
+    def wait_for_start(self):
+        self.started = True
+        self.start_time = time.time()
+    
+    def wait_for_login_done(self):
+        raise LoginRequired("this frontend cannot wait for a manual login")
+    
+    def update_worker_heartbeat(self, worker_num, alive=True):
+        pass
+    
+    def record_latency(self, worker_num, latency_ms):
+        pass
+    
+    def update_worker_resources(self, worker_num, cpu_percent, rss_mb, process_count):
+        pass
+    
+    def update_worker_memory(self, worker_num, heap_mb, nodes):
+        pass
+    
+    def update_worker_lag(self, worker_num, lag, throttled):
+        pass
+    
+    def update_worker_dom(self, worker_num, item_cost_ms, nodes, rows):
+        pass
+    
+    def update_failure_classes(self, by_reason, queued, dead):
+        pass
+    
+    def update_pipeline(self, worker_num, pipeline):
+        pass
+    
+    def update_poll_cycle(self, seconds, ok, total, parked):
+        pass
+    
+    def mark_worker_parked(self, worker_num):
+        pass
+    
+    def update_config(self, text):
+        pass
+    
+    def enable_start_button(self):
+        pass
+    
+    def enable_login_done_button(self):
+        pass
+    
+    def update(self):
+        pass
+    
+    def update_status(self, status):
+        pass
+    
+    def set_sleep_prevention(self, active):
+        pass
+
+
+class HeadlessConsole(ConsoleFrontend):
+    """No Tk at all: one JSON object per line on stdout for unattended runs
+    
+    Records are {'time', 'type': 'log' | 'progress' | 'config' | 'summary', ...}.
+    Progress (totals, rate, ETA and per-worker state) goes out every
+    progress_interval seconds from update(), which the controller calls anyway.
+    """
+    
+    interactive = False
+    
+    def __init__(self, stream=None, progress_interval=None):
+        super().__init__()
+        self.stream = stream or sys.stdout
+        self.progress_interval = progress_interval or HEADLESS_PROGRESS_INTERVAL
+        self.last_progress = 0
+        self.workers = {i: {'state': 'starting'} for i in self.worker_stats}
+        self.fleet = {}  # Poll cycle, failure classes, live config
+    
+    def _emit(self, kind, **fields):
+        record = {'time': datetime.now().isoformat(timespec='seconds'), 'type': kind}
+        record.update(fields)
+        try:
+            self.stream.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            self.stream.flush()
+        except (OSError, ValueError):
+            pass
+    
+    def add_log(self, message, worker_id=None, log_type='info'):
+        message = message.strip()
+        if not message.strip('=─'):
+            return  # Banner lines only make sense in a window
+        self._emit('log', level=log_type, worker=worker_id, message=message)
+    
+    def wait_for_start(self):
+        super().wait_for_start()
+        self.add_log("Workers started without waiting for a START click", log_type='system')
+    
+    def wait_for_login_done(self):
+        """Only a terminal can stand in for the DONE LOGGING IN button"""
+        if not (sys.stdin and sys.stdin.isatty()):
+            raise LoginRequired(
+                "a manual login is needed - run once with the dashboard (or from a terminal) "
+                "to create the golden profile"
+            )
+        self.add_log("Log in, then press Enter here", log_type='system')
+        input()
+        self.login_done = True
+    
+    def worker_added(self, worker_num):
+        self.workers[worker_num] = {'state': 'starting'}
+    
+    def update_worker_heartbeat(self, worker_num, alive=True):
+        if self.ensure_worker(worker_num):
+            self.workers[worker_num]['state'] = 'online' if alive else 'offline'
+    
+    def mark_worker_parked(self, worker_num):
+        if self.ensure_worker(worker_num):
+            self.workers[worker_num]['state'] = 'parked'
+    
+    def update_worker_resources(self, worker_num, cpu_percent, rss_mb, process_count):
+        if self.ensure_worker(worker_num):
+            self.workers[worker_num].update(cpu=round(cpu_percent, 1), rss_mb=round(rss_mb), processes=process_count)
+    
+    def update_worker_memory(self, worker_num, heap_mb, nodes):
+        if self.ensure_worker(worker_num):
+            self.workers[worker_num].update(heap_mb=heap_mb, dom_nodes=nodes)
+    
+    def update_worker_lag(self, worker_num, lag, throttled):
+        if lag and self.ensure_worker(worker_num):
+            self.workers[worker_num].update(p95_lag_ms=lag.get('p95LagMs'), throttled=throttled)
+    
+    def update_worker_dom(self, worker_num, item_cost_ms, nodes, rows):
+        if self.ensure_worker(worker_num):
+            self.workers[worker_num].update(item_cost_ms=item_cost_ms, rows=rows)
+    
+    def update_failure_classes(self, by_reason, queued, dead):
+        self.fleet.update(failures=dict(by_reason), retry_queue=queued, dead_letters=dead)
+    
+    def update_poll_cycle(self, seconds, ok, total, parked):
+        self.fleet.update(poll_ms=round(seconds * 1000), polled_ok=ok, polled=total)
+    
+    def update_config(self, text):
+        self.fleet['config'] = text
+        self._emit('config', config=text)
+    
+    def update(self):
+        now = time.time()
+        if not self.started or now - self.last_progress < self.progress_interval:
+            return
+        self.last_progress = now
+        workers = {}
+        for worker_num, state in self.workers.items():
+            stats = self.worker_stats[worker_num]
+            workers[worker_num] = dict(state, denied=stats['deleted'], failed=stats['failed'],
+                                       unconfirmed=stats['unconfirmed'], latency_ms=stats['latency_ms'])
+        self._emit('progress', **self.progress(), fleet=self.fleet, workers=workers)
+    
+    def finish(self, summary):
+        self._emit('summary', **summary)
+
+
+class TeeConsole:
+    """Forwards every frontend call to the primary console and mirrors it to the others
+    
+    Attributes and anything that waits or hands back input (start/login
+    waits, config requests) come from the primary only. A failing mirror
+    never breaks the controller.
+    """
+    
+    PRIMARY_ONLY = ('wait_for_login_done', 'take_config_requests', 'progress')
+    
+    def __init__(self, primary, *mirrors):
+        self.primary = primary
+        self.mirrors = mirrors
+    
+    def __getattr__(self, name):
+        attr = getattr(self.primary, name)
+        if not callable(attr) or name in self.PRIMARY_ONLY:
+            return attr
+        
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            for mirror in self.mirrors:
+                try:
+                    getattr(mirror, name)(*args, **kwargs)
+                except Exception:
+                    pass
+            return result
+        return call
+
+
+# ============================================================================
+# LOG PIPELINE
+# ============================================================================
+
+class LogView:
+    """Queues log lines for a Tk text widget and writes them in batches
+    
+    push() appends to a bounded queue. Every LOG_FLUSH_INTERVAL_MS the
+    queued lines go into the widget in one insert (runs of the same tag are
+    joined), the widget is trimmed to LOG_WIDGET_LINES and scrolled once.
+    The Tk timer only fires while the controller calls update(), so push()
+    also writes the batch itself once an interval has passed - long blocking
+    steps (setup, reattach) still reach the window at the same rate. If more
+    than LOG_QUEUE_MAX lines pile up between flushes the oldest are skipped -
+    the log file still has them.
+    """
+    
+    def __init__(self, widget, max_lines=None, interval_ms=None, queue_max=None):
+        self.widget = widget
+        self.max_lines = max_lines or LOG_WIDGET_LINES
+        self.interval_ms = interval_ms or LOG_FLUSH_INTERVAL_MS
+        self.queue_max = queue_max or LOG_QUEUE_MAX
+        self.pending = deque()
+        self.skipped = 0
+        self.last_write = time.monotonic()
+        self.widget.after(self.interval_ms, self.flush)
+    
+    def push(self, line, tag):
+        if len(self.pending) >= self.queue_max:
+            self.pending.popleft()
+            self.skipped += 1
+        self.pending.append((line, tag))
+        if (time.monotonic() - self.last_write) * 1000 >= self.interval_ms:
+            try:
+                self._write()
+            except tk.TclError:
+                pass  # Window is gone
+    
+    def flush(self):
+        try:
+            self._write()
+            self.widget.after(self.interval_ms, self.flush)
+        except tk.TclError:
+            pass  # Window is gone
+    
+    def _write(self):
+        """Insert everything queued in one go"""
+        self.last_write = time.monotonic()
+        if not self.pending:
+            return
+        chunks = []  # text, tag, text, tag ... as Text.insert takes them
+        if self.skipped:
+            chunks += [f"... {self.skipped} log lines skipped in the window\n", 'error']
+            self.skipped = 0
+        while self.pending:
+            line, tag = self.pending.popleft()
+            if chunks and chunks[-1] == tag:
+                chunks[-2] += line
+            else:
+                chunks += [line, tag]
+        self.widget.insert('end', *chunks)
+        lines = int(self.widget.index('end-1c').split('.')[0])
+        if lines > self.max_lines:
+            self.widget.delete('1.0', f"{lines - self.max_lines + 1}.0")
+        self.widget.see('end')
+
+
+class LogFile(ConsoleFrontend):
+    """Mirror that keeps the whole run as JSONL in a rotating, gzipped file
+    
+    Records look like the headless ones ('log', 'config', 'summary'). The
+    controller only queues them; a background thread writes in batches and
+    rotates at LOG_FILE_MAX_MB, so a slow disk never stalls the loop. Records
+    that do not fit in the queue are counted and reported on close().
+    """
+    
+    interactive = False
+    
+    def __init__(self, path=None, max_mb=None, backups=None):
+        super().__init__()
+        self.path = path or LOG_FILE
+        self.max_bytes = int((max_mb or LOG_FILE_MAX_MB) * 1024 * 1024)
+        self.backups = LOG_FILE_BACKUPS if backups is None else backups
+        self.stream = open(self.path, 'a', encoding='utf-8')
+        self.queue = queue.Queue(maxsize=LOG_QUEUE_MAX)
+        self.dropped = 0
+        self.thread = threading.Thread(target=self._run, name="log-file", daemon=True)
+        self.thread.start()
+    
+    def _emit(self, kind, **fields):
+        record = {'time': datetime.now().isoformat(timespec='milliseconds'), 'type': kind}
+        record.update(fields)
+        try:
+            self.queue.put_nowait(json.dumps(record, ensure_ascii=False, default=str))
+        except queue.Full:
+            self.dropped += 1
+    
+    def add_log(self, message, worker_id=None, log_type='info'):
+        message = message.strip()
+        if message.strip('=─'):
+            self._emit('log', level=log_type, worker=worker_id, message=message)
+    
+    def update_config(self, text):
+        self._emit('config', config=text)
+    
+    def finish(self, summary):
+        self._emit('summary', **summary)
+    
+    def _run(self):
+        running = True
+        while running:
+            batch = [self.queue.get()]
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                running = False
+                batch = [line for line in batch if line is not None]
+            try:
+                if self.stream.closed:
+                    self.stream = open(self.path, 'a', encoding='utf-8')  # A failed rotation could not reopen it
+                if batch:
+                    self.stream.write("\n".join(batch) + "\n")
+                    self.stream.flush()
+                if self.stream.tell() >= self.max_bytes:
+                    self._rotate()
+            except (OSError, ValueError) as e:
+                print(f"Log file {self.path}: {e}")
+    
+    def _rotate(self):
+        """quinix_log.jsonl -> .1.gz, .1.gz -> .2.gz ... oldest falls off
+        
+        The current file is reopened even if compressing fails: it keeps
+        growing past the limit instead of the writer dying on a closed file.
+        """
+        self.stream.close()
+        truncate = True
+        try:
+            if self.backups > 0:
+                for n in range(self.backups - 1, 0, -1):
+                    if os.path.exists(f"{self.path}.{n}.gz"):
+                        os.replace(f"{self.path}.{n}.gz", f"{self.path}.{n + 1}.gz")
+                with open(self.path, 'rb') as src, gzip.open(f"{self.path}.1.gz", 'wb') as dst:
+                    shutil.copyfileobj(src, dst)
+        except OSError:
+            truncate = False
+            raise
+        finally:
+            self.stream = open(self.path, 'w' if truncate else 'a', encoding='utf-8')
+    
+    def close(self):
+        """Flush what is queued and stop the writer - never blocks shutdown on a full queue"""
+        if self.dropped:
+            self._emit('log', level='error', worker=None,
+                       message=f"{self.dropped} log records dropped (writer queue full)")
+        try:
+            self.queue.put(None, timeout=2)
+        except queue.Full:
+            pass  # Writer is stuck - give up on the rest
+        self.thread.join(timeout=10)
+        try:
+            self.stream.close()
+        except (OSError, ValueError):
+            pass
+
+
+# ============================================================================
+# WEB DASHBOARD (SERVER-SENT EVENTS)
+# ============================================================================
+
+WEB_DASHBOARD_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>QUINIX-SYS :: WORKERS</title>
+<style>
+body { background: #0a0a1a; color: #00d4ff; font: 13px 'Courier New', monospace; margin: 16px; }
+h1 { font-size: 16px; } table { border-collapse: collapse; margin: 8px 0; }
+td, th { padding: 3px 10px; text-align: right; border-bottom: 1px solid #1a1a2e; } th { color: #4dd0e1; }
+.offline { color: #ff4444; } .parked { color: #ff8800; } .throttled { color: #ffaa00; }
+.hist { display: inline-block; vertical-align: bottom; margin-right: 16px; }
+.bar { display: inline-block; width: 14px; margin-right: 2px; background: #00d4ff; vertical-align: bottom; }
+#log { height: 260px; overflow-y: auto; white-space: pre-wrap; border: 1px solid #1a1a2e; padding: 4px; }
+.error { color: #ff4444; } .success { color: #4dd0e1; } #conn { color: #4a5f7a; }
+</style></head><body>
+<h1>QUINIX-SYS :: DISTRIBUTED WORKER CONTROL <span id="conn">[connecting]</span></h1>
+<div id="progress">--</div><div id="fleet"></div>
+<table><thead><tr><th>WORKER</th><th>STATE</th><th>DENIED</th><th>FAILED</th><th>UNCONF</th><th>RATE/MIN</th>
+<th>AVG MS</th><th>CPU</th><th>RSS MB</th><th>P95 LAG</th><th>ROWS</th></tr></thead><tbody id="workers"></tbody></table>
+<div id="hists"></div><h1>LOG</h1><div id="log"></div>
+<script>
+const state = { workers: {}, histograms: {}, buckets: [] };
+const fmt = v => v === null || v === undefined ? '-' : (typeof v === 'number' ? v.toLocaleString() : v);
+function renderWorkers() {
+  document.getElementById('workers').innerHTML = Object.entries(state.workers).map(([n, w]) =>
+    `<tr class="${w.throttled ? 'throttled' : w.state}"><td>WORKER-${n}</td><td>${fmt(w.state)}</td><td>${fmt(w.denied)}</td>` +
+    `<td>${fmt(w.failed)}</td><td>${fmt(w.unconfirmed)}</td><td>${fmt(w.per_min)}</td><td>${fmt(w.latency_ms)}</td>` +
+    `<td>${fmt(w.cpu)}</td><td>${fmt(w.rss_mb)}</td><td>${fmt(w.p95_lag_ms)}</td><td>${fmt(w.rows)}</td></tr>`).join('');
+}
+function renderHists() {
+  const labels = state.buckets.map(b => '<' + b).concat(['more']);
+  document.getElementById('hists').innerHTML = Object.entries(state.histograms).map(([n, counts]) => {
+    const top = Math.max(1, ...counts);
+    return `<div class="hist" title="${labels.map((l, i) => l + 'ms: ' + counts[i]).join('\\n')}">W${n}<br>` +
+      counts.map(c => `<span class="bar" style="height:${Math.round(60 * c / top) + 1}px"></span>`).join('') + '</div>';
+  }).join('');
+}
+function renderProgress(p) {
+  document.getElementById('progress').textContent =
+    `${fmt(p.processed)} / ${fmt(p.target)} (${p.workload_source}) :: ${p.per_min}/min :: ETA ${p.eta_min === null ? '?' : Math.round(p.eta_min) + ' min'} :: up ${Math.round(p.runtime_s / 60)} min`;
+}
+function addLog(line) {
+  const log = document.getElementById('log');
+  const div = document.createElement('div');
+  div.className = line.level;
+  div.textContent = `[${line.time}] ${line.worker ? '[' + line.worker + '] ' : ''}${line.message}`;
+  log.appendChild(div);
+  while (log.childNodes.length > 500) log.removeChild(log.firstChild);
+  log.scrollTop = log.scrollHeight;
+}
+const events = new EventSource('/events');
+events.onopen = () => document.getElementById('conn').textContent = '[live]';
+events.onerror = () => document.getElementById('conn').textContent = '[reconnecting]';
+events.addEventListener('snapshot', e => {
+  const snap = JSON.parse(e.data);
+  Object.assign(state, { workers: snap.workers, histograms: snap.histograms, buckets: snap.buckets });
+  document.getElementById('log').innerHTML = '';
+  snap.logs.forEach(addLog); renderWorkers(); renderHists(); renderProgress(snap.progress);
+  document.getElementById('fleet').textContent = JSON.stringify(snap.fleet);
+});
+events.addEventListener('worker', e => {
+  const d = JSON.parse(e.data);
+  Object.assign(state.workers[d.worker] = state.workers[d.worker] || {}, d.fields); renderWorkers();
+});
+events.addEventListener('histogram', e => { const d = JSON.parse(e.data); state.histograms[d.worker] = d.counts; renderHists(); });
+events.addEventListener('progress', e => renderProgress(JSON.parse(e.data)));
+events.addEventListener('fleet', e => document.getElementById('fleet').textContent = e.data);
+events.addEventListener('log', e => addLog(JSON.parse(e.data)));
+</script></body></html>
+"""
+
+
+class WebDashboard(ConsoleFrontend):
+    """Frontend that serves a live page on http://WEB_DASHBOARD_HOST:port
+    
+    It is fed like any other console (via TeeConsole), keeps the current state
+    and pushes only what changed to every connected page over Server-Sent
+    Events. Clients never cause extra driver polls; a client that cannot keep
+    up is dropped instead of slowing the controller down.
+    """
+    
+    def __init__(self, port, host=None):
+        super().__init__()
+        self.address = (host or WEB_DASHBOARD_HOST, port)
+        self.lock = threading.Lock()
+        self.clients = set()  # One queue of pending (event, data) per connected page
+        self.workers = {i: {'state': 'starting'} for i in self.worker_stats}
+        self.fleet = {}
+        self.histograms = {}  # worker_num -> counts per LATENCY_BUCKETS_MS bucket
+        self.logs = deque(maxlen=WEB_LOG_LINES)
+        self.rate_marks = {}  # worker_num -> (time, handled) of the previous stats update
+        self.last_progress = 0
+        self.server = None
+    
+    # ---- server
+    
+    def start(self):
+        dashboard = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split('?')[0]
+                if path == '/':
+                    self._send(200, 'text/html; charset=utf-8', WEB_DASHBOARD_PAGE.encode())
+                elif path == '/state':
+                    self._send(200, 'application/json', json.dumps(dashboard.snapshot(), default=str).encode())
+                elif path == '/events':
+                    dashboard.stream(self)
+                else:
+                    self._send(404, 'text/plain', b'not found')
+            
+            def _send(self, status, content_type, body):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass  # Requests are not worth a log line
+        
+        self.server = ThreadingHTTPServer(self.address, Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return f"http://{self.address[0]}:{self.server.server_address[1]}/"
+    
+    def stop(self):
+        with self.lock:
+            for client in self.clients:
+                try:
+                    client.put_nowait(None)
+                except queue.Full:
+                    pass
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+    
+    def stream(self, handler):
+        """Serve one /events connection: full snapshot first, then deltas until it goes away"""
+        client = queue.Queue(maxsize=WEB_CLIENT_QUEUE)
+        with self.lock:
+            snapshot = self._snapshot()
+            self.clients.add(client)
+        try:
+            handler.send_response(200)
+            handler.send_header('Content-Type', 'text/event-stream')
+            handler.send_header('Cache-Control', 'no-cache')
+            handler.end_headers()
+            handler.wfile.write(self._frame('snapshot', snapshot))
+            handler.wfile.flush()
+            while True:
+                try:
+                    item = client.get(timeout=15)
+                except queue.Empty:
+                    handler.wfile.write(b": keepalive\n\n")  # Also notices closed connections
+                    handler.wfile.flush()
+                    continue
+                if item is None:
+                    break
+                frames = [self._frame(*item)]
+                while len(frames) < 100:  # Coalesce a burst into one write
+                    try:
+                        item = client.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        break
+                    frames.append(self._frame(*item))
+                handler.wfile.write(b"".join(frames))
+                handler.wfile.flush()
+                if item is None:
+                    break
+        except (OSError, ValueError):
+            pass  # Page closed
+        finally:
+            with self.lock:
+                self.clients.discard(client)
+    
+    @staticmethod
+    def _frame(event, data):
+        return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n".encode()
+    
+    def _publish(self, event, data):
+        with self.lock:
+            for client in list(self.clients):
+                try:
+                    client.put_nowait((event, data))
+                except queue.Full:
+                    self.clients.discard(client)  # Too slow - it reconnects and gets a fresh snapshot
+                    try:
+                        client.get_nowait()
+                        client.put_nowait(None)
+                    except (queue.Empty, queue.Full):
+                        pass
+    
+    def snapshot(self):
+        with self.lock:
+            return self._snapshot()
+    
+    def _snapshot(self):
+        return {
+            'progress': self.progress(),
+            'fleet': dict(self.fleet),
+            'workers': {n: dict(fields) for n, fields in self.workers.items()},
+            'histograms': {n: list(counts) for n, counts in self.histograms.items()},
+            'buckets': list(LATENCY_BUCKETS_MS),
+            'logs': list(self.logs),
+        }
+    
+    def worker_added(self, worker_num):
+        with self.lock:  # Snapshots iterate the workers from the server threads
+            self.workers[worker_num] = {'state': 'starting'}
+    
+    def _worker(self, worker_num, **fields):
+        """Merge changed fields into a worker and push just those"""
+        if not self.ensure_worker(worker_num):
+            return
+        current = self.workers[worker_num]
+        changed = {key: value for key, value in fields.items() if current.get(key) != value}
+        if changed:
+            current.update(changed)
+            self._publish('worker', {'worker': worker_num, 'fields': changed})
+    
+    # ---- console interface
+    
+    def add_log(self, message, worker_id=None, log_type='info'):
+        message = message.strip()
+        if not message.strip('=─'):
+            return
+        line = {'time': datetime.now().strftime('%H:%M:%S'), 'level': log_type, 'worker': worker_id, 'message': message}
+        self.logs.append(line)
+        self._publish('log', line)
+    
+    def update_worker_stats(self, worker_num, deleted, failed, unconfirmed=0, latency_ms=None):
+        super().update_worker_stats(worker_num, deleted, failed, unconfirmed, latency_ms)
+        now = time.time()
+        handled = deleted + failed + unconfirmed
+        previous = self.rate_marks.get(worker_num)
+        self.rate_marks[worker_num] = (now, handled)
+        per_min = None
+        if previous and now > previous[0]:
+            per_min = round(max(0, handled - previous[1]) / (now - previous[0]) * 60, 1)
+        self._worker(worker_num, denied=deleted, failed=failed, unconfirmed=unconfirmed,
+                     latency_ms=latency_ms, per_min=per_min)
+    
+    def record_latency(self, worker_num, latency_ms):
+        counts = self.histograms.setdefault(worker_num, [0] * (len(LATENCY_BUCKETS_MS) + 1))
+        bucket = next((i for i, bound in enumerate(LATENCY_BUCKETS_MS) if latency_ms < bound), len(LATENCY_BUCKETS_MS))
+        counts[bucket] += 1
+        self._publish('histogram', {'worker': worker_num, 'counts': list(counts)})
+    
+    def update_worker_heartbeat(self, worker_num, alive=True):
+        self._worker(worker_num, state='online' if alive else 'offline')
+    
+    def mark_worker_parked(self, worker_num):
+        self._worker(worker_num, state='parked')
+    
+    def update_worker_resources(self, worker_num, cpu_percent, rss_mb, process_count):
+        self._worker(worker_num, cpu=round(cpu_percent), rss_mb=round(rss_mb))
+    
+    def update_worker_memory(self, worker_num, heap_mb, nodes):
+        self._worker(worker_num, heap_mb=heap_mb, dom_nodes=nodes)
+    
+    def update_worker_lag(self, worker_num, lag, throttled):
+        if lag:
+            self._worker(worker_num, p95_lag_ms=lag.get('p95LagMs'), throttled=throttled)
+    
+    def update_worker_dom(self, worker_num, item_cost_ms, nodes, rows):
+        self._worker(worker_num, item_cost_ms=item_cost_ms, rows=rows)
+    
+    def _fleet(self, **fields):
+        self.fleet.update(fields)
+        self._publish('fleet', dict(self.fleet))
+    
+    def update_failure_classes(self, by_reason, queued, dead):
+        failures = {'failures': dict(by_reason), 'retry_queue': queued, 'dead_letters': dead}
+        if any(self.fleet.get(key) != value for key, value in failures.items()):
+            self._fleet(**failures)
+    
+    def update_poll_cycle(self, seconds, ok, total, parked):
+        self._fleet(poll_ms=round(seconds * 1000), polled_ok=ok, polled=total, parked=parked)
+    
+    def update_config(self, text):
+        self._fleet(config=text)
+    
+    def update(self):
+        now = time.time()
+        if now - self.last_progress >= 1.0:
+            self.last_progress = now
+            self._publish('progress', self.progress())
+    
+    def finish(self, summary):
+        self._publish('summary', summary)
+
+
 # ============================================================================
 # MULTI-PANEL DASHBOARD CONSOLE
 # ============================================================================
 
-class DashboardConsole:
+class DashboardConsole(ConsoleFrontend):
     """Multi-panel dashboard console window for monitoring all workers"""
     
     def __init__(self):
+        super().__init__()
         self.root = tk.Tk()
         self.root.title("QUINIX-SYS :: WORKER CONTROL TERMINAL")
         self.root.geometry("1400x900")
@@ -93,15 +1065,10 @@ class DashboardConsole:
         self.root.attributes('-topmost', True)
         
         # Worker tracking data
-        self.worker_heartbeats = {i: {'alive': True, 'last_beat': time.time()} for i in range(1, 7)}
-        self.worker_stats = {i: {'deleted': 0, 'failed': 0, 'last_update': time.time()} for i in range(1, 7)}
+        self.worker_heartbeats = {i: {'alive': True, 'last_beat': time.time()} for i in self.worker_stats}
+        self.worker_resources = {i: {} for i in self.worker_stats}
+        self.worker_pipeline = {}  # worker_num -> latest pipeline counters from the worker
         self.hourly_data = deque(maxlen=60)  # Last 60 data points (1 per minute)
-        self.start_time = time.time()
-        self.total_processed = 0
-        self.total_target = 11903  # Total absence requests
-        
-        self.started = False
-        self.login_done = False
         
         # Create main layout
         self._create_header()
@@ -177,6 +1144,44 @@ class DashboardConsole:
             state=tk.DISABLED
         )
         self.start_button.pack(side=tk.LEFT, padx=5)
+        
+        # Live config: push pacing/batching to one worker or the whole fleet
+        self.config_scope = tk.StringVar(value='FLEET')
+        scope_menu = tk.OptionMenu(button_frame, self.config_scope, 'FLEET', *[f'WORKER-{i}' for i in self.worker_stats])
+        self.scope_menu = scope_menu
+        scope_menu.config(font=('Courier New', 9), bg='#001a33', fg='#4dd0e1', activebackground='#003366',
+                          highlightthickness=0, relief=tk.FLAT)
+        scope_menu.pack(side=tk.LEFT, padx=(20, 2))
+        
+        self.config_entry = tk.Entry(
+            button_frame,
+            width=42,
+            font=('Courier New', 9),
+            bg='#001a33',
+            fg='#00d4ff',
+            insertbackground='#00d4ff',
+            relief=tk.FLAT
+        )
+        self.config_entry.insert(0, "delayBetweenDeletes=1000 batchSize=15")
+        self.config_entry.bind('<Return>', lambda event: self.on_config_push_clicked())
+        self.config_entry.pack(side=tk.LEFT, padx=2, ipady=4)
+        
+        self.config_button = tk.Button(
+            button_frame,
+            text="[⚙] PUSH CONFIG",
+            command=self.on_config_push_clicked,
+            font=('Courier New', 10, 'bold'),
+            bg='#001a33',
+            fg='#4dd0e1',
+            activebackground='#003366',
+            activeforeground='#4dd0e1',
+            cursor='hand2',
+            relief=tk.FLAT,
+            bd=1,
+            padx=15,
+            pady=6
+        )
+        self.config_button.pack(side=tk.LEFT, padx=5)
     
     def _create_dashboard(self):
         """Create 4-panel dashboard"""
@@ -209,68 +1214,84 @@ class DashboardConsole:
             bd=2
         )
         panel.pack(fill=tk.BOTH, expand=True, side=tk.LEFT, padx=2, pady=2)
+        self.status_panel = panel
         
         self.status_labels = {}
-        for i in range(1, 7):
-            frame = tk.Frame(panel, bg='#0a0a1a')
-            frame.pack(fill=tk.X, padx=10, pady=6)
-            
-            # Worker ID
-            id_label = tk.Label(
-                frame,
-                text=f"[WORKER-{i}]",
-                font=('Courier New', 9, 'bold'),
-                bg='#0a0a1a',
-                fg='#4dd0e1',  # Light cyan
-                width=12,
-                anchor='w'
-            )
-            id_label.pack(side=tk.LEFT, padx=5)
-            
-            # Status bar (ASCII)
-            status_bar = tk.Label(
-                frame,
-                text="████████████",
-                font=('Courier New', 9),
-                bg='#0a0a1a',
-                fg='#00d4ff',  # Cyan when alive
-                width=15,
-                anchor='w'
-            )
-            status_bar.pack(side=tk.LEFT, padx=5)
-            
-            # Status text
-            status_text = tk.Label(
-                frame,
-                text="[ONLINE]",
-                font=('Courier New', 9, 'bold'),
-                bg='#0a0a1a',
-                fg='#00d4ff'
-            )
-            status_text.pack(side=tk.RIGHT, padx=5)
-            
-            self.status_labels[i] = {'bar': status_bar, 'text': status_text}
+        for i in self.worker_stats:
+            self._create_status_row(i)
         
         # Remove the heartbeat animation
         self.heartbeat_labels = self.status_labels  # Compatibility
     
-    def _create_stats_panel(self, parent):
-        """Create completion statistics panel"""
-        panel = tk.LabelFrame(
-            parent,
-            text="┌─[ TASK COMPLETION METRICS ]───────────────┐",
-            font=('Courier New', 10, 'bold'),
+    def _create_status_row(self, i):
+        """One worker's line in the status panel"""
+        frame = tk.Frame(self.status_panel, bg='#0a0a1a')
+        frame.pack(fill=tk.X, padx=10, pady=6)
+        
+        # Worker ID
+        id_label = tk.Label(
+            frame,
+            text=f"[WORKER-{i}]",
+            font=('Courier New', 9, 'bold'),
             bg='#0a0a1a',
-            fg='#00d4ff',
-            relief=tk.FLAT,
-            bd=2
+            fg='#4dd0e1',  # Light cyan
+            width=12,
+            anchor='w'
+        )
+        id_label.pack(side=tk.LEFT, padx=5)
+        
+        # Status bar (ASCII)
+        status_bar = tk.Label(
+            frame,
+            text="████████████",
+            font=('Courier New', 9),
+            bg='#0a0a1a',
+            fg='#00d4ff',  # Cyan when alive
+            width=15,
+            anchor='w'
+        )
+        status_bar.pack(side=tk.LEFT, padx=5)
+        
+        # CPU / memory of the worker's browser process tree
+        resource_text = tk.Label(
+            frame,
+            text="CPU --% | RSS ----MB",
+            font=('Courier New', 9),
+            bg='#0a0a1a',
+            fg='#4a5f7a',
+            anchor='w'
+        )
+        resource_text.pack(side=tk.LEFT, padx=5)
+        
+        # Status text
+        status_text = tk.Label(
+            frame,
+            text="[ONLINE]",
+            font=('Courier New', 9, 'bold'),
+            bg='#0a0a1a',
+            fg='#00d4ff'
+        )
+        status_text.pack(side=tk.RIGHT, padx=5)
+        
+        self.status_labels[i] = {'bar': status_bar, 'text': status_text, 'resources': resource_text}
+    
+    def _create_stats_panel(self, parent):
+        """Create completion statistics panel"""
+        panel = tk.LabelFrame(
+            parent,
+            text="┌─[ TASK COMPLETION METRICS ]───────────────┐",
+            font=('Courier New', 10, 'bold'),
+            bg='#0a0a1a',
+            fg='#00d4ff',
+            relief=tk.FLAT,
+            bd=2
         )
         panel.pack(fill=tk.BOTH, expand=True, side=tk.LEFT, padx=2, pady=2)
         
         # Create table
         self.stats_tree = ttk.Treeview(
             panel,
-            columns=('worker', 'denied', 'failed', 'total', 'rate'),
+            columns=('worker', 'denied', 'failed', 'unconfirmed', 'total', 'rate', 'latency'),
             show='headings',
             height=6
         )
@@ -278,14 +1299,18 @@ class DashboardConsole:
         self.stats_tree.heading('worker', text='NODE')
         self.stats_tree.heading('denied', text='DENIED')
         self.stats_tree.heading('failed', text='FAILED')
+        self.stats_tree.heading('unconfirmed', text='UNCONF')
         self.stats_tree.heading('total', text='TOTAL')
         self.stats_tree.heading('rate', text='RATE/MIN')
+        self.stats_tree.heading('latency', text='LAT(ms)')
         
-        self.stats_tree.column('worker', width=120, anchor='center')
-        self.stats_tree.column('denied', width=90, anchor='center')
-        self.stats_tree.column('failed', width=90, anchor='center')
-        self.stats_tree.column('total', width=90, anchor='center')
-        self.stats_tree.column('rate', width=100, anchor='center')
+        self.stats_tree.column('worker', width=110, anchor='center')
+        self.stats_tree.column('denied', width=80, anchor='center')
+        self.stats_tree.column('failed', width=70, anchor='center')
+        self.stats_tree.column('unconfirmed', width=70, anchor='center')
+        self.stats_tree.column('total', width=80, anchor='center')
+        self.stats_tree.column('rate', width=80, anchor='center')
+        self.stats_tree.column('latency', width=80, anchor='center')
         
         # Style the treeview - CYBERPUNK
         style = ttk.Style()
@@ -304,8 +1329,8 @@ class DashboardConsole:
         self.stats_tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
         # Initialize rows
-        for i in range(1, 7):
-            self.stats_tree.insert('', 'end', iid=i, values=(f'WORKER-{i}', '0', '0', '0', '0.0'))
+        for i in self.worker_stats:
+            self.stats_tree.insert('', 'end', iid=i, values=(f'WORKER-{i}', '0', '0', '0', '0', '0.0', '-'))
     
     def _create_graph_panel(self, parent):
         """Create hourly completion graph panel"""
@@ -391,6 +1416,42 @@ class DashboardConsole:
             fg='#4dd0e1'
         )
         self.runtime_label.pack(pady=5)
+        
+        self.poll_label = tk.Label(
+            stats_frame,
+            text=">> POLL CYCLE: --",
+            font=('Courier New', 10),
+            bg='#0a0a1a',
+            fg='#4dd0e1'
+        )
+        self.poll_label.pack(pady=5)
+        
+        self.failure_label = tk.Label(
+            stats_frame,
+            text=">> FAILURES: none",
+            font=('Courier New', 10),
+            bg='#0a0a1a',
+            fg='#4dd0e1'
+        )
+        self.failure_label.pack(pady=5)
+        
+        self.pipeline_label = tk.Label(
+            stats_frame,
+            text=">> PIPELINE: --",
+            font=('Courier New', 10),
+            bg='#0a0a1a',
+            fg='#4dd0e1'
+        )
+        self.pipeline_label.pack(pady=5)
+        
+        self.config_label = tk.Label(
+            stats_frame,
+            text=">> CONFIG: file defaults",
+            font=('Courier New', 10),
+            bg='#0a0a1a',
+            fg='#4dd0e1'
+        )
+        self.config_label.pack(pady=5)
     
     def _create_log_panel(self):
         """Create collapsible log panel at bottom"""
@@ -427,11 +1488,25 @@ class DashboardConsole:
         self.log_text.tag_config('error', foreground='#ff4444')     # Light Red
         self.log_text.tag_config('success', foreground='#4dd0e1')   # Light Cyan
         
-        self.log_count = 0
+        self.log_view = LogView(self.log_text)
+    
+    def worker_added(self, worker_num):
+        """Status line, table row and config scope for a worker the autoscaler started"""
+        self.worker_heartbeats[worker_num] = {'alive': True, 'last_beat': time.time()}
+        self.worker_resources[worker_num] = {}
+        try:
+            self._create_status_row(worker_num)
+            self.stats_tree.insert('', 'end', iid=worker_num,
+                                   values=(f'WORKER-{worker_num}', '0', '0', '0', '0', '0.0', '-'))
+            self.stats_tree.config(height=len(self.worker_stats))
+            self.scope_menu['menu'].add_command(label=f'WORKER-{worker_num}',
+                                                command=tk._setit(self.config_scope, f'WORKER-{worker_num}'))
+        except:
+            pass
     
     def update_worker_heartbeat(self, worker_num, alive=True):
         """Update worker status (no animation)"""
-        if 1 <= worker_num <= 6:
+        if self.ensure_worker(worker_num):
             self.worker_heartbeats[worker_num]['alive'] = alive
             self.worker_heartbeats[worker_num]['last_beat'] = time.time()
             
@@ -455,7 +1530,7 @@ class DashboardConsole:
             percentage = (self.total_processed / self.total_target) * 100 if self.total_target > 0 else 0
             filled = int((percentage / 100) * 40)  # 40 char wide bar
             bar = "█" * filled + "░" * (40 - filled)
-            self.progress_label.config(text=f"[{bar[:5]}{'>' if filled > 0 else ''}{bar[5:18]}] {self.total_processed:,} / {self.total_target:,} ({percentage:.2f}%)")
+            self.progress_label.config(text=f"[{bar[:5]}{'>' if filled > 0 else ''}{bar[5:18]}] {self.total_processed:,} / {self.total_target:,} ({percentage:.2f}%, {self.workload_source})")
             self.progress_bar_ascii.config(text=f"[{bar}]")
             
             # Calculate speed
@@ -552,22 +1627,124 @@ class DashboardConsole:
         except:
             pass
     
-    def update_worker_heartbeat(self, worker_num, alive=True):
-        """Update worker heartbeat status"""
-        if 1 <= worker_num <= 6:
-            self.worker_heartbeats[worker_num]['alive'] = alive
-            self.worker_heartbeats[worker_num]['last_beat'] = time.time()
+    def update_worker_resources(self, worker_num, cpu_percent, rss_mb, process_count):
+        """Show CPU and RSS of a worker's browser process tree"""
+        if self.ensure_worker(worker_num):
+            self.worker_resources[worker_num].update(cpu=cpu_percent, rss_mb=rss_mb, processes=process_count)
+            self._render_resources(worker_num)
+    
+    def update_worker_memory(self, worker_num, heap_mb, nodes):
+        """Show JS heap size of a worker's page"""
+        if self.ensure_worker(worker_num):
+            self.worker_resources[worker_num].update(heap_mb=heap_mb, nodes=nodes)
+            self._render_resources(worker_num)
+    
+    def _render_resources(self, worker_num):
+        res = self.worker_resources[worker_num]
+        parts = []
+        if 'cpu' in res:
+            parts.append(f"CPU {res['cpu']:3.0f}% | RSS {res['rss_mb']:4.0f}MB ({res['processes']}p)")
+        if 'heap_mb' in res:
+            parts.append(f"JS {res['heap_mb']:3.0f}MB")
+        if res.get('lag_ms') is not None:
+            parts.append(f"LAG {res['lag_ms']}ms" + (f" hidden {res['hidden_s']:.0f}s" if res.get('hidden_s') else ""))
+        if res.get('item_cost_ms') is not None:
+            parts.append(f"DOM {res['item_cost_ms']:.1f}ms/item @ {res.get('rows') or 0} rows")
+        over_limit = (res.get('heap_mb', 0) >= MEMORY_HEAP_LIMIT_MB or res.get('cpu', 0) >= 80
+                      or (res.get('lag_ms') or 0) >= THROTTLE_LAG_MS)
+        try:
+            self.status_labels[worker_num]['resources'].config(
+                text=" | ".join(parts),
+                fg='#ff8800' if over_limit else '#4dd0e1'
+            )
+        except:
+            pass
+    
+    def update_worker_lag(self, worker_num, lag, throttled):
+        """Event-loop lag per worker - a throttled worker is flagged in the status panel"""
+        if not lag or not self.ensure_worker(worker_num):
+            return
+        self.worker_resources[worker_num].update(lag_ms=lag.get('p95LagMs'), hidden_s=lag.get('hiddenMs', 0) / 1000)
+        self._render_resources(worker_num)
+        if throttled:
+            try:
+                self.status_labels[worker_num]['bar'].config(fg='#ff8800', text="▓▓▓▓▓▓░░░░░░")
+                self.status_labels[worker_num]['text'].config(text="[THROTTLED]", fg='#ff8800')
+            except:
+                pass
+    
+    def update_worker_dom(self, worker_num, item_cost_ms, nodes, rows):
+        """DOM work per handled row - should stay flat as the list shrinks"""
+        if self.ensure_worker(worker_num):
+            self.worker_resources[worker_num].update(item_cost_ms=item_cost_ms, dom_nodes=nodes, rows=rows)
+            self._render_resources(worker_num)
+    
+    def update_failure_classes(self, by_reason, queued, dead):
+        """Show failures per reason code plus the retry queue and dead letters"""
+        try:
+            parts = [f"{reason} {by_reason[reason]}" for reason in FAILURE_REASONS if by_reason.get(reason)]
+            self.failure_label.config(
+                text=f">> FAILURES: {' | '.join(parts) or 'none'} :: retry {queued} :: dead {dead}",
+                fg='#ff4444' if dead else '#ffaa00' if queued else '#4dd0e1'
+            )
+        except:
+            pass
+    
+    def update_pipeline(self, worker_num, pipeline):
+        """Pipeline depth, prefetch hit rate and per-item time vs the sequential samples"""
+        if not pipeline:
+            return
+        self.worker_pipeline[worker_num] = pipeline
+        totals = {}
+        for counters in self.worker_pipeline.values():
+            for field in ('prepared', 'used', 'pipelinedCount', 'pipelinedMs', 'sequentialCount', 'sequentialMs'):
+                totals[field] = totals.get(field, 0) + (counters.get(field) or 0)
+        depth = max(counters.get('depth', 1) for counters in self.worker_pipeline.values())
+        try:
+            text = f">> PIPELINE: depth {depth}"
+            if totals['prepared']:
+                text += f" | prefetch used {totals['used'] / totals['prepared']:.0%}"
+            if totals['pipelinedCount'] and totals['sequentialCount']:
+                pipelined = totals['pipelinedMs'] / totals['pipelinedCount'] / 1000
+                sequential = totals['sequentialMs'] / totals['sequentialCount'] / 1000
+                text += f" | {pipelined:.2f}s vs {sequential:.2f}s per item ({sequential / pipelined - 1:+.0%})"
+            self.pipeline_label.config(text=text)
+        except:
+            pass
+    
+    def update_poll_cycle(self, seconds, ok, total, parked):
+        """Show how long the last status poll over all workers took"""
+        try:
+            color = '#ff8800' if parked or seconds >= POLL_TIMEOUT else '#4dd0e1'
+            self.poll_label.config(
+                text=f">> POLL CYCLE: {seconds * 1000:.0f}ms ({ok}/{total} ok, {parked} parked)",
+                fg=color
+            )
+        except:
+            pass
+    
+    def mark_worker_parked(self, worker_num):
+        """Show that a worker's circuit breaker is open"""
+        if self.ensure_worker(worker_num):
+            try:
+                self.status_labels[worker_num]['bar'].config(fg='#ff8800', text="▒▒▒▒▒▒▒▒▒▒▒▒")
+                self.status_labels[worker_num]['text'].config(text="[PARKED]", fg='#ff8800')
+            except:
+                pass
     
-    def update_worker_stats(self, worker_num, deleted, failed):
-        """Update worker statistics"""
-        if 1 <= worker_num <= 6:
-            old_total = self.worker_stats[worker_num]['deleted'] + self.worker_stats[worker_num]['failed']
-            self.worker_stats[worker_num]['deleted'] = deleted
-            self.worker_stats[worker_num]['failed'] = failed
-            new_total = deleted + failed
+    def update_worker_stats(self, worker_num, deleted, failed, unconfirmed=0, latency_ms=None):
+        """Update worker statistics (latency_ms = avg server-confirmed deny latency)"""
+        if self.ensure_worker(worker_num):
+            stats = self.worker_stats[worker_num]
+            old_total = stats['deleted'] + stats['failed'] + stats['unconfirmed']
+            stats['deleted'] = deleted
+            stats['failed'] = failed
+            stats['unconfirmed'] = unconfirmed
+            stats['latency_ms'] = latency_ms
+            new_total = deleted + failed + unconfirmed
             
             # Update total processed
-            self.total_processed = sum(s['deleted'] + s['failed'] for s in self.worker_stats.values())
+            self.total_processed = sum(s['deleted'] + s['failed'] + s['unconfirmed'] for s in self.worker_stats.values())
             
             # Calculate rate
             time_diff = time.time() - self.worker_stats[worker_num]['last_update']
@@ -584,8 +1761,10 @@ class DashboardConsole:
                     f'WORKER-{worker_num}',
                     f'{deleted:,}',
                     f'{failed:,}',
+                    f'{unconfirmed:,}',
                     f'{new_total:,}',
-                    f'{rate:.1f}'
+                    f'{rate:.1f}',
+                    f'{latency_ms}' if latency_ms is not None else '-'
                 ))
             except:
                 pass
@@ -616,6 +1795,21 @@ class DashboardConsole:
         self.add_log(">> AUTHENTICATION COMPLETE - PROCEEDING", log_type='success')
         self.root.after(1000, lambda: self.login_done_button.pack_forget())
     
+    def on_config_push_clicked(self):
+        """Queue the config bar's settings - the monitoring loop validates and pushes them"""
+        text = self.config_entry.get().strip()
+        if not text:
+            return
+        scope = self.config_scope.get()
+        self.config_requests.append((None if scope == 'FLEET' else int(scope.split('-')[1]) - 1, text))
+    
+    def update_config(self, text):
+        """Show the overrides that are currently pushed to the workers"""
+        try:
+            self.config_label.config(text=f">> CONFIG: {text}", fg='#ffaa00' if text != 'file defaults' else '#4dd0e1')
+        except:
+            pass
+    
     def enable_start_button(self):
         """Enable the Start button"""
         try:
@@ -708,18 +1902,7 @@ class DashboardConsole:
         else:
             formatted = f"[{timestamp}] {message}\n"
         
-        try:
-            if self.root.winfo_exists():
-                self.log_text.insert('end', formatted, tag)
-                self.log_text.see('end')
-                
-                # Limit log size
-                self.log_count += 1
-                if self.log_count > 500:
-                    self.log_text.delete('1.0', '50.0')
-                    self.log_count = 450
-        except:
-            pass
+        self.log_view.push(formatted, tag)
 
 # ============================================================================
 # WINDOWS SLEEP PREVENTION
@@ -747,10 +1930,75 @@ def allow_sleep():
 # BROWSER AUTOMATION FUNCTIONS  
 # ============================================================================
 
-def setup_driver(window_position=None, window_size=None, profile_number=1):
-    """Setup Edge driver with options - each window gets its own profile"""
+relocated_profiles = {}  # profile_number -> folder used this run because the usual one was still locked
+
+
+def get_profile_dir(profile_number, backend=None):
+    """Profile folder for one worker browser (on tmpfs when PROFILE_TMPFS is set)"""
+    if profile_number in relocated_profiles and (backend or BROWSER_BACKEND) == BROWSER_BACKEND:
+        return relocated_profiles[profile_number]
+    spec = DRIVER_BACKENDS[backend or BROWSER_BACKEND]
+    root = PROFILE_TMPFS if USE_GOLDEN_PROFILE and PROFILE_TMPFS else PROFILE_ROOT
+    return os.path.join(root, f"{spec['profile_prefix']}{profile_number}")
+
+
+def find_browser_binary(backend):
+    """Locate the browser binary for a backend (None = let the driver decide)"""
+    if BROWSER_BINARY:
+        return BROWSER_BINARY
+    for name in DRIVER_BACKENDS[backend]['binaries']:
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+def grid_position(index):
+    """Screen position of window number index (0-based) in the window grid"""
+    column = index % GRID_COLUMNS
+    row = (index // GRID_COLUMNS) % GRID_ROWS
+    return (WINDOW_WIDTH * column, WINDOW_HEIGHT * row)
+
+
+def enable_focus_emulation(driver):
+    """Make the page believe it is focused and visible so it is never throttled"""
+    try:
+        driver.execute_cdp_cmd('Emulation.setFocusEmulationEnabled', {'enabled': True})
+        # Tell the worker scripts (also after reloads) that the audio keepalive is not needed
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
+            'source': 'window.__quinixFocusEmulated = true;'
+        })
+        return True
+    except Exception as e:
+        print(f"Could not enable focus emulation: {e}")
+        return False
+
+
+def restore_window(driver):
+    """Un-minimise the window that holds this page (minimised windows get throttled hardest)"""
+    try:
+        window = driver.execute_cdp_cmd('Browser.getWindowForTarget', {})
+        driver.execute_cdp_cmd('Browser.setWindowBounds', {
+            'windowId': window['windowId'],
+            'bounds': {'windowState': 'normal'},
+        })
+        return True
+    except Exception as e:
+        print(f"Could not restore window: {e}")
+        return False
+
+
+def setup_driver(window_position=None, window_size=None, profile_number=1, backend=None, headless=None,
+                 debug_port=None):
+    """Setup browser driver with options - each window gets its own profile"""
+    backend = backend or BROWSER_BACKEND
+    headless = HEADLESS if headless is None else headless
+    spec = DRIVER_BACKENDS[backend]
     
-    options = Options()
+    options = spec['options']()
+    binary = find_browser_binary(backend)
+    if binary:
+        options.binary_location = binary
     # Keep browser open after script ends
     options.add_experimental_option("detach", True)
     
@@ -760,6 +2008,16 @@ def setup_driver(window_position=None, window_size=None, profile_number=1):
     options.add_argument("--disable-gpu")
     options.add_argument("--disable-extensions")
     options.add_argument("--mute-audio")
+    # No background throttling - works for hidden, occluded and headless windows
+    for flag in ANTI_THROTTLE_FLAGS:
+        options.add_argument(flag)
+    if debug_port:
+        # Known endpoint, recorded in STATE_FILE so a restarted controller can reattach
+        options.add_argument(f"--remote-debugging-port={debug_port}")
+    if headless:
+        options.add_argument("--headless=new")
+        if window_size:
+            options.add_argument(f"--window-size={window_size[0]},{window_size[1]}")
     # Page load strategy to avoid hanging
     options.page_load_strategy = 'eager'
     
@@ -771,240 +2029,3314 @@ def setup_driver(window_position=None, window_size=None, profile_number=1):
     
     # CRITICAL: Each browser gets its own profile to avoid crashes
     # (Multiple browsers cannot share same profile simultaneously)
-    automation_profile = rf"C:\Users\MadsE\Desktop\quinix-workers\EdgeProfile{profile_number}"
+    automation_profile = get_profile_dir(profile_number, backend)
+    if not profile_in_use(automation_profile):
+        clear_stale_locks(automation_profile)  # Left by a crashed browser - would block the launch
     options.add_argument(f"user-data-dir={automation_profile}")
     options.add_argument(f"profile-directory=Profile{profile_number}")
     
-    driver = webdriver.Edge(options=options)
+    driver = spec['driver'](options=options)
+    enable_focus_emulation(driver)
     
-    # Position and size window if specified
-    if window_position and window_size:
+    # Block heavy resources before the first navigation
+    if BLOCK_RESOURCES:
+        apply_resource_blocking(driver)
+    
+    # Position and size window if specified (meaningless when headless)
+    if window_position and window_size and not headless:
         driver.set_window_position(window_position[0], window_position[1])
         driver.set_window_size(window_size[0], window_size[1])
     
     return driver
 
 
-def inject_script(driver, script, worker_name):
-    """Inject JavaScript worker script into the page"""
-    try:
-        driver.execute_script(script)
-        return True
-    except Exception as e:
-        print(f"Error injecting script for {worker_name}: {e}")
-        return False
-
-
-def get_worker_logs(driver):
-    """Get logs from worker via console"""
-    try:
-        logs = driver.execute_script("""
-            if (window.workerLogs && window.workerLogs.length > 0) {
-                const latest = window.workerLogs[window.workerLogs.length - 1];
-                return latest;
-            }
-            return null;
-        """)
-        return logs
-    except:
-        return None
+def get_landing_url(index=None, shards=None):
+    """URL the workers open - the worker's date slice, else the lean landing page if configured"""
+    if shards is not None and index is not None and shards.has(index):
+        return shards.url(index)
+    return LEAN_LANDING_URL or QUINYX_URL
 
 
 # ============================================================================
-# MAIN PROGRAM
+# AUTOSCALING
 # ============================================================================
 
-def main():
-    print("╔════════════════════════════════════════════════════════════════════════════════╗")
-    print("║   QUINIX-SYS :: DISTRIBUTED WORKER CONTROL TERMINAL v2.6.0        ║")
-    print("║   [CYBERPUNK EDITION] - MATRIX INTERFACE ACTIVE                   ║")
-    print("╚════════════════════════════════════════════════════════════════════════════════╝")
-    print()
-    
-    # Create enhanced dashboard console
-    console = DashboardConsole()
-    console.add_log(">> TERMINAL INITIALIZED - 4 PANELS ACTIVE", log_type='success')
-    console.add_log(">> [PANEL-1] WORKER NODE STATUS MONITOR", log_type='system')
-    console.add_log(">> [PANEL2] TASK COMPLETION METRICS", log_type='system')
-    console.add_log(">> [PANEL-3] THROUGHPUT ANALYSIS GRAPH", log_type='system')
-    console.add_log(">> [PANEL-4] MISSION PROGRESS TRACKER", log_type='system')
-    console.update()
+class WorkerCounters:
+    """Per-worker progress since the last update, from the counters the pages report
     
-    # Load worker scripts
-    workers = []
-    for i, filename in enumerate(WORKER_FILES):
+    A window that reloads, restarts or is reattached starts its counters at 0
+    again. A handled count that went down is treated as such a reset, so
+    everything the page shows now is new work - summing the raw counters
+    instead would hide that work until the new count passes the old one.
+    """
+    
+    def __init__(self):
+        self.last = {}  # worker_num -> (denied, handled) at the previous update
+    
+    @staticmethod
+    def _counts(stat):
+        return stat['deleted'], stat['deleted'] + stat['failed'] + stat['unconfirmed']
+    
+    def prime(self, stats):
+        """Take the current counters as the starting point without counting them"""
+        for worker_num, stat in stats.items():
+            self.last[worker_num] = self._counts(stat)
+    
+    def update(self, stats):
+        """-> {worker_num: (denied, handled)} since the previous update"""
+        deltas = {}
+        for worker_num, stat in stats.items():
+            denied, handled = self._counts(stat)
+            last_denied, last_handled = self.last.get(worker_num, (0, 0))
+            if handled < last_handled:
+                last_denied = last_handled = 0  # Counter reset - the page started over
+            deltas[worker_num] = (max(0, denied - last_denied), handled - last_handled)
+            self.last[worker_num] = (denied, handled)
+        return deltas
+
+
+class HostLoad:
+    """Host CPU % since the previous sample and available RAM (psutil, else /proc)"""
+    
+    def __init__(self):
+        self._last_cpu = None
+    
+    def _cpu_times(self):
+        if psutil is not None:
+            times = psutil.cpu_times()
+            total = sum(times)
+            return total - times.idle - getattr(times, 'iowait', 0), total
         try:
-            script_path = Path(filename)
-            if not script_path.exists():
-                console.add_log(f"ERROR: Worker script not found: {filename}", log_type='error')
-                continue
-            
-            with open(script_path, 'r', encoding='utf-8') as f:
-                script = f.read()
-            
-            worker_name = f"WORKER-{i+1}-{filename.replace('worker-', '').replace('.txt', '').replace('-', '').upper()}"
-            workers.append({'name': worker_name, 'script': script})
-            console.add_log(f"Loaded {filename}", worker_name, 'success')
-        except Exception as e:
-            console.add_log(f"ERROR loading {filename}: {e}", log_type='error')
+            with open('/proc/stat') as f:
+                values = [int(v) for v in f.readline().split()[1:]]
+        except OSError:
+            return None
+        idle = values[3] + (values[4] if len(values) > 4 else 0)
+        return sum(values) - idle, sum(values)
     
-    if len(workers) == 0:
-        console.add_log("FATAL: No worker scripts loaded!", log_type='error')
-        console.update()
-        input("\nPress Enter to exit...")
-        return
+    def _available_mb(self):
+        if psutil is not None:
+            return psutil.virtual_memory().available / (1024 * 1024)
+        try:
+            with open('/proc/meminfo') as f:
+                for line in f:
+                    if line.startswith('MemAvailable:'):
+                        return int(line.split()[1]) / 1024
+        except OSError:
+            pass
+        return None
     
-    # Setup multiple drivers (one per window)
-    console.add_log("Setting up 6 separate Edge windows...", log_type='system')
-    console.add_log("Each browser gets its own profile (no conflicts!)", log_type='success')
-    console.add_log("Windows will be arranged in a 2x3 grid on your screen", log_type='success')
-    console.update()
+    def sample(self):
+        """-> (cpu_percent or None, available_mb or None)"""
+        cpu = None
+        times = self._cpu_times()
+        if times and self._last_cpu:
+            busy = times[0] - self._last_cpu[0]
+            total = times[1] - self._last_cpu[1]
+            cpu = 100.0 * busy / total if total > 0 else None
+        self._last_cpu = times
+        return cpu, self._available_mb()
+
+
+class Autoscaler:
+    """Decides whether the fleet should grow, shrink or hold
     
-    drivers = []
+    Retire first when the host or the server is struggling. After an add,
+    keep the new worker only if fleet throughput rose by AUTOSCALE_MIN_GAIN.
+    Otherwise retire it again and do not grow past that size for
+    AUTOSCALE_CEILING_TTL. Grow while there is headroom.
+    """
     
-    try:
-        console.update()
-        console.add_log(f"Opening {len(workers)} separate browser windows...", log_type='system')
-        console.add_log("Arranging windows in 2 rows x 3 columns", log_type='system')
-        
-        # Calculate window positions for 2x3 grid
-        positions = [
-            (0, 0),                              # Top-left
-            (WINDOW_WIDTH, 0),                   # Top-center
-            (WINDOW_WIDTH * 2, 0),               # Top-right
-            (0, WINDOW_HEIGHT),                  # Bottom-left
-            (WINDOW_WIDTH, WINDOW_HEIGHT),       # Bottom-center
-            (WINDOW_WIDTH * 2, WINDOW_HEIGHT)    # Bottom-right
-        ]
-        
-        # Open each window
-        for i, worker in enumerate(workers):
-            console.add_log(f"Opening window {i+1} for {worker['name']}...", log_type='system')
-            try:
-                driver = setup_driver(
-                    window_position=positions[i],
-                    window_size=(WINDOW_WIDTH, WINDOW_HEIGHT),
-                    profile_number=i+1
-                )
-                driver.get(QUINYX_URL)
-                drivers.append(driver)
-                console.add_log(f"Window {i+1} opened and positioned", log_type='success')
-                console.update()
-                
-                # Update heartbeat - window alive
-                console.update_worker_heartbeat(i+1, alive=True)
-                
-                if i < len(workers) - 1:
-                    console.add_log(f"Waiting 5 seconds before opening next window...", log_type='system')
-                    for _ in range(5):
-                        time.sleep(1)
-                        console.update()
-                        
-            except Exception as e:
-                console.add_log(f"ERROR opening window {i+1}: {e}", log_type='error')
-                console.update_worker_heartbeat(i+1, alive=False)
-        
-        console.update()
-        
-        if len(drivers) == 0:
-            console.add_log("FATAL: No windows opened successfully!", log_type='error')
-            console.update()
-            input("\nPress Enter to exit...")
-            return
-        
-        console.add_log(f"Successfully opened {len(drivers)} out of {len(workers)} windows", log_type='success')
-        if len(drivers) < len(workers):
-            console.add_log(f"⚠️ Warning: Only {len(drivers)} windows opened (expected {len(workers)})", log_type='error')
-        
-        # First time setup - login to all windows once
-        console.add_log("=" * 80, log_type='success')
-        console.add_log("🔑 FIRST TIME SETUP: Login to ALL 6 windows", log_type='error')
-        console.add_log("=" * 80, log_type='success')
-        console.add_log("⚠️ Each profile needs login ONCE - they'll remember it forever!", log_type='system')
-        console.add_log("Login to window 1 (top-left), then 2, then 3, etc...", log_type='system')
-        console.add_log("After logging into all 6, click DONE LOGGING IN button", log_type='system')
-        console.add_log("Next time you run this script - AUTO LOGGED IN! ✅", log_type='success')
-        console.add_log("=" * 80, log_type='success')
-        console.enable_login_done_button()
-        console.update()
-        
-        print("\n🔑 Login to all 6 windows, then click DONE LOGGING IN button...")
-        
-        # Wait for user to click Done button
-        console.wait_for_login_done()
+    def __init__(self, max_workers, min_workers=None):
+        self.max_workers = max_workers
+        self.min_workers = min_workers or AUTOSCALE_MIN_WORKERS
+        self.last = None  # (time, server_errors)
+        self.last_add = None  # throughput before the last add
+        self.ceiling = max_workers
+        self.ceiling_until = 0
+    
+    def evaluate(self, active, processed, clicks, server_errors, cpu=None, free_mb=None):
+        """-> (decision, reason, throughput per minute) with decision 'add', 'retire' or 'hold'
         
-        console.add_log("=" * 80, log_type='success')
-        console.add_log("✅ Profiles saved! Next run = AUTO LOGIN!", log_type='success')
-        console.add_log("=" * 80, log_type='success')
-        console.update()
+        processed (denied) and clicks (handled) are what the fleet did since
+        the previous call, summed from WorkerCounters deltas so a relaunched
+        worker's zeroed counters do not read as lost throughput.
+        server_errors is the running total.
+        """
+        now = time.time()
+        if self.last is None:
+            self.last = (now, server_errors)
+            return 'hold', "baseline measurement", None
         
-        # Enable Start button and wait for user
-        console.add_log("All windows are ready!", log_type='success')
-        console.add_log("Click the START WORKERS button to begin", log_type='success')
-        console.enable_start_button()
-        console.update()
+        started, last_errors = self.last
+        self.last = (now, server_errors)
+        minutes = max((now - started) / 60, 1e-6)
+        throughput = processed / minutes
+        error_rate = max(0, server_errors - last_errors) / clicks if clicks > 0 else 0.0
+        if now >= self.ceiling_until:
+            self.ceiling = self.max_workers
         
-        print("\n✅ All windows opened and ready!")
-        print("➡️  Click the START WORKERS button in the dashboard to begin...")
+        load = (f"{throughput:.1f}/min with {active} workers, server errors {error_rate:.1%}"
+                + (f", CPU {cpu:.0f}%" if cpu is not None else "")
+                + (f", {free_mb:.0f}MB free" if free_mb is not None else ""))
+        gained = self.last_add
+        self.last_add = None
         
-        # Wait for user to click Start
-        console.wait_for_start()
+        if active > self.min_workers:
+            if cpu is not None and cpu > AUTOSCALE_MAX_CPU:
+                return 'retire', f"host CPU above {AUTOSCALE_MAX_CPU}% ({load})", throughput
+            if free_mb is not None and free_mb < AUTOSCALE_MIN_FREE_MB:
+                return 'retire', f"less than {AUTOSCALE_MIN_FREE_MB}MB RAM available ({load})", throughput
+            if error_rate > AUTOSCALE_MAX_ERROR_RATE:
+                return 'retire', f"server pushes back, error rate above {AUTOSCALE_MAX_ERROR_RATE:.0%} ({load})", throughput
+            if gained is not None and gained > 0:
+                gain = throughput / gained - 1
+                if gain < AUTOSCALE_MIN_GAIN:
+                    self.ceiling = active - 1
+                    self.ceiling_until = now + AUTOSCALE_CEILING_TTL
+                    return 'retire', (f"last added worker only gained {gain:+.0%} "
+                                      f"(< {AUTOSCALE_MIN_GAIN:.0%}), capping at {self.ceiling} ({load})"), throughput
         
-        # Prevent computer from sleeping
-        console.add_log(">> ACTIVATING SLEEP PREVENTION...", log_type='system')
-        if prevent_sleep():
-            console.add_log(">> [OK] SLEEP MODE DISABLED - PC WILL STAY AWAKE", log_type='success')
-            console.set_sleep_prevention(True)
-        else:
-            console.add_log(">> [WARN] Could not disable sleep mode", log_type='error')
-        console.update()
+        if active >= min(self.max_workers, self.ceiling):
+            return 'hold', f"at the {'ceiling' if self.ceiling < self.max_workers else 'maximum'} ({load})", throughput
+        if cpu is not None and cpu >= AUTOSCALE_ADD_CPU:
+            return 'hold', f"no CPU headroom to add ({load})", throughput
+        if error_rate > AUTOSCALE_MAX_ERROR_RATE / 2:
+            return 'hold', f"server error rate too close to the limit to add ({load})", throughput
+        return 'add', f"headroom available ({load})", throughput
+    
+    def added(self, throughput):
+        """A worker really joined - the next evaluate() judges its gain against this throughput
         
-        # Inject scripts into each window
-        console.add_log(">> INJECTING WORKER SCRIPTS INTO NODES...", log_type='system')
-        for i, driver in enumerate(drivers):
-            if i < len(workers):
-                if inject_script(driver, workers[i]['script'], workers[i]['name']):
-                    console.add_log(f"Script injected successfully", workers[i]['name'], 'success')
-                else:
-                    console.add_log(f"Failed to inject script", workers[i]['name'], 'error')
-                time.sleep(1)
+        Only call it once the add succeeded. A skipped or failed add must not
+        be measured, or the unchanged fleet reads as a worker that gained nothing.
+        """
+        self.last_add = throughput
+
+
+# ============================================================================
+# THROTTLE DETECTION
+# ============================================================================
+
+class ThrottleDetector:
+    """Decides per worker whether it is throttled and which corrective step is next
+    
+    Steps escalate up to THROTTLE_ACTION: 'focus' (focus emulation +
+    un-minimise) first, then 'restart'. A worker that recovers starts over.
+    """
+    
+    LADDER = ('focus', 'restart')
+    
+    def __init__(self):
+        self.strikes = {}  # index -> throttled polls in a row
+        self.steps = {}  # index -> corrective steps already taken in this episode
+    
+    @staticmethod
+    def is_throttled(lag):
+        return bool(lag) and (lag.get('p95LagMs') or 0) >= THROTTLE_LAG_MS
+    
+    def check(self, index, lag):
+        """-> (throttled, action or None)"""
+        if not lag:
+            return False, None
+        if not self.is_throttled(lag):
+            self.strikes.pop(index, None)
+            self.steps.pop(index, None)
+            return False, None
+        self.strikes[index] = self.strikes.get(index, 0) + 1
+        if not THROTTLE_ACTION or self.strikes[index] < THROTTLE_STRIKES:
+            return True, None
+        allowed = self.LADDER[:self.LADDER.index(THROTTLE_ACTION) + 1]
+        step = self.steps.get(index, 0)
+        action = allowed[min(step, len(allowed) - 1)]
+        self.steps[index] = step + 1
+        self.strikes[index] = 0
+        return True, action
+    
+    def forget(self, index):
+        self.strikes.pop(index, None)
+        self.steps.pop(index, None)
+
+
+# ============================================================================
+# RETRY QUEUE / DEAD LETTERS
+# ============================================================================
+
+class RetryQueue:
+    """Failed rows wait with exponential backoff and are handed back to their worker
+    
+    The worker skips a failed row until the controller sends its key back as
+    due. After RETRY_MAX_ATTEMPTS (or a non-retryable reason) the key becomes
+    a dead letter: the worker ignores it for good and it is written to
+    DEAD_LETTER_FILE.
+    """
+    
+    def __init__(self, dead_letter_file=None):
+        self.dead_letter_file = dead_letter_file or DEAD_LETTER_FILE
+        self.items = {}  # key -> {'worker', 'reason', 'attempts', 'due_at', 'delivered'}
+        self.dead = {}  # key -> last item
+        self.by_reason = {}
+        self.unsent_dead = {}  # worker index -> keys the worker has not been told about
+        self.in_flight = {}  # worker index -> (retry keys, dead keys) of the last script
+    
+    def record(self, index, event):
+        """Feed one worker event -> 'queued', 'dead', 'resolved' or None"""
+        key = event.get('key')
+        kind = event.get('type')
+        if not key:
+            return None
+        if kind in ('denied', 'retry-missing'):
+            return 'resolved' if self.items.pop(key, None) else None
+        if kind not in ('failed', 'unconfirmed'):
+            return None
         
-        console.add_log("=" * 80, log_type='success')
-        console.add_log(f"{len(drivers)} WORKERS STARTED! 🎉", log_type='success')
-        console.add_log("=" * 80, log_type='success')
-        console.add_log("Dashboard showing live stats from all workers!", log_type='success')
-        console.update()
+        reason = event.get('reason') or 'EXCEPTION'
+        self.by_reason[reason] = self.by_reason.get(reason, 0) + 1
+        item = self.items.setdefault(key, {'worker': index, 'attempts': 0})
+        item.update(worker=index, reason=reason, attempts=item['attempts'] + 1, delivered=False)
         
-        print("\n✅ Multi-panel dashboard is running!")
-        print(f"   {len(drivers)} browser windows with workers active")
-        print("   💓 Heartbeat monitor shows browser status")
-        print("   📊 Stats table shows completion progress")
-        print("   📈 Graph tracks completions per hour")
-        print("   🎯 Progress panel shows ETA and speed")
-        print("   Press Ctrl+C here to stop (workers continue in browser)")
+        if reason in NON_RETRYABLE_REASONS or item['attempts'] >= RETRY_MAX_ATTEMPTS:
+            del self.items[key]
+            self.dead[key] = item
+            self.unsent_dead.setdefault(index, []).append(key)
+            self._write_dead_letter(key, item, event)
+            return 'dead'
         
-        # Main monitoring loop
+        delay = min(RETRY_BASE_DELAY * 2 ** (item['attempts'] - 1), RETRY_MAX_DELAY)
+        item['due_at'] = time.time() + delay
+        return 'queued'
+    
+    def script(self, index):
+        """JS that hands due retries and new dead letters to worker index ('' if nothing to send)"""
+        now = time.time()
+        due = [
+            key for key, item in self.items.items()
+            if item['worker'] == index and not item['delivered'] and item['due_at'] <= now
+        ]
+        dead = self.unsent_dead.pop(index, [])
+        if not due and not dead:
+            return ""
+        for key in due:
+            self.items[key]['delivered'] = True
+        self.in_flight[index] = (due, dead)
+        state = json.dumps({'retry': due, 'dead': dead})
+        return f"if (window.quinixSetRetryState) window.quinixSetRetryState({state});\n"
+    
+    def ack(self, index, delivered):
+        """The poll carrying the last script failed -> send it again next time"""
+        due, dead = self.in_flight.pop(index, ([], []))
+        if delivered:
+            return
+        for key in due:
+            if key in self.items:
+                self.items[key]['delivered'] = False
+        if dead:
+            self.unsent_dead.setdefault(index, []).extend(dead)
+    
+    def _write_dead_letter(self, key, item, event):
+        try:
+            with open(self.dead_letter_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({
+                    'time': datetime.now().isoformat(timespec='seconds'),
+                    'worker': item['worker'] + 1,
+                    'key': key,
+                    'reason': item['reason'],
+                    'attempts': item['attempts'],
+                    'status': event.get('status'),
+                    'message': event.get('message'),
+                }, ensure_ascii=False) + "\n")
+        except OSError:
+            pass
+
+
+# ============================================================================
+# LIVE CONFIG
+# ============================================================================
+
+class LiveConfig:
+    """Pacing/batching overrides pushed to running workers without re-injection
+    
+    Overrides are fleet-wide or per worker (per worker wins). Every change
+    bumps a version that goes out with the next status poll, like the retry
+    queue; a reloaded page is simply sent the current version again. The
+    fleet's throughput over CONFIG_WINDOW seconds before and after each
+    change is written to CONFIG_CHANGE_LOG.
+    """
+    
+    def __init__(self, log_file=None):
+        self.log_file = log_file or CONFIG_CHANGE_LOG
+        self.fleet = {}
+        self.per_worker = {}  # worker index -> overrides on top of the fleet's
+        self.version = 0
+        self.pushed = {}  # worker index -> version the worker has been sent
+        self.in_flight = {}  # worker index -> version carried by the last script
+        self.samples = {}  # worker index -> [(time, denied count)]
+        self.changes = []  # Changes still waiting for their "after" measurement
+    
+    @staticmethod
+    def parse(text):
+        """'delayBetweenDeletes=500 pipeline=off' -> {key: value} (ValueError on anything unknown)"""
+        patch = {}
+        for part in re.split(r'[,;\s]+', text.strip()):
+            if not part:
+                continue
+            key, _, value = part.partition('=')
+            if key not in LIVE_CONFIG_KEYS:
+                raise ValueError(f"unknown setting '{key}' (one of {', '.join(LIVE_CONFIG_KEYS)})")
+            if LIVE_CONFIG_KEYS[key] is bool:
+                if value.lower() not in ('on', 'off', 'true', 'false', '1', '0'):
+                    raise ValueError(f"{key} must be on or off")
+                patch[key] = value.lower() in ('on', 'true', '1')
+            else:
+                try:
+                    number = int(value)
+                except ValueError:
+                    raise ValueError(f"{key} must be a whole number, not '{value}'")
+                if number < LIVE_CONFIG_KEYS[key]:
+                    raise ValueError(f"{key} must be at least {LIVE_CONFIG_KEYS[key]}")
+                patch[key] = number
+        if not patch:
+            raise ValueError("nothing to change")
+        return patch
+    
+    def set(self, patch, index=None, targets=()):
+        """New overrides for worker index (None = the fleet, measured over targets) -> change record"""
+        (self.fleet if index is None else self.per_worker.setdefault(index, {})).update(patch)
+        self.version += 1
+        now = time.time()
+        workers = list(targets) if index is None else [index]
+        change = {
+            'version': self.version,
+            'time': now,
+            'scope': 'fleet' if index is None else f'worker {index + 1}',
+            'patch': dict(patch),
+            'workers': workers,
+            'before': self.rate(workers, now - CONFIG_WINDOW, now),
+            'applied_at': None,
+            'after': None,
+        }
+        self.changes.append(change)
+        return change
+    
+    def desired(self, index):
+        return {**self.fleet, **self.per_worker.get(index, {})}
+    
+    def script(self, index):
+        """JS that hands worker index its current overrides ('' if it already has them)"""
+        values = self.desired(index)
+        if not values or self.pushed.get(index, 0) >= self.version:
+            return ""
+        self.in_flight[index] = self.version
+        return f"if (window.quinixSetConfig) window.quinixSetConfig({json.dumps(values)}, {self.version});\n"
+    
+    def ack(self, index, delivered):
+        """The poll carrying the last script came back (or not -> send it again next time)"""
+        version = self.in_flight.pop(index, None)
+        if version is None or not delivered:
+            return
+        self.pushed[index] = version
+        now = time.time()
+        for change in self.changes:
+            if change['applied_at'] is None and change['version'] <= version and index in change['workers']:
+                change['applied_at'] = now
+    
+    def forget(self, index):
+        """Window index got a fresh page - resend its overrides, restart its throughput samples"""
+        self.pushed.pop(index, None)
+        self.in_flight.pop(index, None)
+        self.samples.pop(index, None)
+    
+    def sample(self, index, denied, now=None):
+        now = now or time.time()
+        history = self.samples.setdefault(index, [])
+        history.append((now, denied))
+        # Keep enough for one before- and one after-window of the oldest open change
+        horizon = min([change['time'] for change in self.changes] + [now]) - CONFIG_WINDOW
+        while len(history) > 1 and history[1][0] <= horizon:
+            history.pop(0)
+    
+    def rate(self, workers, start, end):
+        """Denied per minute summed over workers between two moments (None before any samples)"""
+        total = None
+        for index in workers:
+            history = [point for point in self.samples.get(index, []) if point[0] <= end]
+            if len(history) < 2:
+                continue
+            before = [point for point in history if point[0] <= start]
+            first = before[-1] if before else history[0]
+            last = history[-1]
+            if last[0] <= first[0]:
+                continue
+            total = (total or 0) + max(0, last[1] - first[1]) / (end - max(first[0], start)) * 60
+        return total
+    
+    def settle(self, now=None):
+        """Changes whose after-window is over -> list of finished change records (also logged)"""
+        now = now or time.time()
+        done = []
+        for change in list(self.changes):
+            start = change['applied_at']
+            if start is None or now < start + CONFIG_WINDOW:
+                continue
+            change['after'] = self.rate(change['workers'], start, start + CONFIG_WINDOW)
+            self.changes.remove(change)
+            done.append(change)
+            self._write_change(change)
+        return done
+    
+    def describe(self):
+        """Current overrides for the dashboard"""
+        parts = [f"{key}={value}" for key, value in self.fleet.items()]
+        parts += [
+            f"W{index + 1}: " + " ".join(f"{key}={value}" for key, value in overrides.items())
+            for index, overrides in sorted(self.per_worker.items())
+        ]
+        return f"v{self.version} " + " | ".join(parts) if parts else "file defaults"
+    
+    @staticmethod
+    def format_change(change):
+        before, after = change['before'], change['after']
+        patch = " ".join(f"{key}={value}" for key, value in change['patch'].items())
+        text = f"Config v{change['version']} ({change['scope']}: {patch}): "
+        text += f"{before:.1f}/min" if before is not None else "?/min"
+        text += f" -> {after:.1f}/min" if after is not None else " -> ?/min"
+        if before and after is not None:
+            text += f" ({after / before - 1:+.0%})"
+        return text
+    
+    def _write_change(self, change):
+        try:
+            with open(self.log_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({
+                    'time': datetime.fromtimestamp(change['time']).isoformat(timespec='seconds'),
+                    'version': change['version'],
+                    'scope': change['scope'],
+                    'patch': change['patch'],
+                    'workers': [index + 1 for index in change['workers']],
+                    'window_seconds': CONFIG_WINDOW,
+                    'before_per_min': round(change['before'], 2) if change['before'] is not None else None,
+                    'after_per_min': round(change['after'], 2) if change['after'] is not None else None,
+                }, ensure_ascii=False) + "\n")
+        except OSError:
+            pass
+
+
+# ============================================================================
+# ENDGAME / RUN PHASES
+# ============================================================================
+
+def endgame_active_workers(remaining, count):
+    """Indexes that keep working for this many remaining rows
+    
+    Worker 1 always takes rows[0] and the last worker rows[length-1], so those
+    two can never pick the same row while at least two are left.
+    """
+    if remaining is None or remaining > ENDGAME_THRESHOLD:
+        return set(range(count))
+    if remaining > ENDGAME_SOLO_THRESHOLD and count > 1:
+        return {0, count - 1}
+    return {0}
+
+
+class PhaseStats:
+    """Outcome counters per run phase ('bulk', 'endgame') to compare collision rates
+    
+    A failure without a Deny button usually means another worker got the row
+    first, so it is counted as a probable collision.
+    """
+    
+    def __init__(self):
+        self.phase = 'bulk'
+        self.started = {'bulk': time.time()}
+        self.stats = {}
+        self.latencies = {}  # phase -> server-confirmed deny latencies (ms)
+    
+    def switch(self, phase):
+        if phase != self.phase:
+            self.phase = phase
+            self.started.setdefault(phase, time.time())
+    
+    def record(self, event):
+        kind = event.get('type')
+        if kind not in ('denied', 'failed', 'unconfirmed'):
+            return
+        counters = self.stats.setdefault(self.phase, {'denied': 0, 'failed': 0, 'unconfirmed': 0, 'collisions': 0})
+        counters[kind] += 1
+        if kind == 'failed' and event.get('reason') == 'NO_DENY_BUTTON':
+            counters['collisions'] += 1
+        if kind == 'denied' and event.get('latencyMs') is not None:
+            self.latencies.setdefault(self.phase, []).append(event['latencyMs'])
+    
+    def latency_summary(self, phase):
+        """-> {'count', 'avg_ms', 'p50_ms', 'p95_ms'} of the phase's confirmed denies"""
+        values = sorted(self.latencies.get(phase, []))
+        if not values:
+            return {'count': 0, 'avg_ms': None, 'p50_ms': None, 'p95_ms': None}
+        return {
+            'count': len(values),
+            'avg_ms': round(sum(values) / len(values)),
+            'p50_ms': values[len(values) // 2],
+            'p95_ms': values[min(len(values) - 1, int(len(values) * 0.95))],
+        }
+    
+    def report(self):
+        lines = []
+        for phase, counters in self.stats.items():
+            clicks = counters['denied'] + counters['failed'] + counters['unconfirmed']
+            if not clicks:
+                continue
+            lines.append(
+                f"{phase}: {clicks} clicks, {counters['failed'] / clicks:.1%} failed, "
+                f"{counters['collisions'] / clicks:.1%} probable collisions"
+            )
+        return lines
+
+
+# ============================================================================
+# RUN HISTORY
+# ============================================================================
+
+def config_snapshot():
+    """JSON-safe copy of every config constant, stored with each run"""
+    snapshot = {}
+    for name, value in sorted(globals().items()):
+        if not name.isupper() or callable(value):
+            continue
+        if isinstance(value, re.Pattern):
+            value = value.pattern
+        try:
+            snapshot[name] = json.loads(json.dumps(value))
+        except (TypeError, ValueError):
+            pass  # e.g. DRIVER_BACKENDS holds classes
+    return snapshot
+
+
+class RunHistory:
+    """Every run in a local SQLite file, so settings and worker scripts can be compared
+    
+    A run row is written when the workers start and the per-minute series as
+    it goes, so a crashed run still leaves its throughput behind. finish()
+    adds totals, per-phase latencies, failure classes and restarts.
+    """
+    
+    def __init__(self, path=None):
+        self.db = sqlite3.connect(path or RUN_HISTORY_DB or ":memory:")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                started REAL NOT NULL,
+                ended REAL,
+                reason TEXT,
+                workers INTEGER,
+                fleet_mode TEXT,
+                script_hash TEXT,
+                config TEXT,
+                denied INTEGER,
+                failed INTEGER,
+                unconfirmed INTEGER,
+                dead_letters INTEGER,
+                restarts INTEGER,
+                per_min REAL
+            );
+            CREATE TABLE IF NOT EXISTS run_minutes (
+                run_id INTEGER NOT NULL,
+                minute INTEGER NOT NULL,
+                processed INTEGER NOT NULL,
+                PRIMARY KEY (run_id, minute)
+            );
+            CREATE TABLE IF NOT EXISTS run_phases (
+                run_id INTEGER NOT NULL,
+                phase TEXT NOT NULL,
+                denied INTEGER, failed INTEGER, unconfirmed INTEGER, collisions INTEGER,
+                latency_count INTEGER, latency_avg_ms INTEGER, latency_p50_ms INTEGER, latency_p95_ms INTEGER,
+                PRIMARY KEY (run_id, phase)
+            );
+            CREATE TABLE IF NOT EXISTS run_failures (
+                run_id INTEGER NOT NULL,
+                reason TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (run_id, reason)
+            );
+        """)
+        self.db.commit()
+        self.run_id = None
+        self.started = None
+        self.counters = WorkerCounters()
+        self.handled = 0  # Handled in this run, counter resets included
+        self.restarts = 0
+    
+    def begin(self, workers, scripts, stats=None):
+        """A new run with this many windows and these worker scripts
+        
+        stats are the page counters at the start (non-zero after a reattach);
+        only what is handled from here on belongs to this run.
+        """
+        self.started = time.time()
+        self.counters = WorkerCounters()
+        self.handled = 0
+        if stats:
+            self.counters.prime(stats)
+        script_hash = hashlib.sha256("\n".join(scripts).encode('utf-8')).hexdigest()[:12]
+        cursor = self.db.execute(
+            "INSERT INTO runs (started, workers, fleet_mode, script_hash, config) VALUES (?, ?, ?, ?, ?)",
+            (self.started, workers, FLEET_MODE, script_hash, json.dumps(config_snapshot()))
+        )
+        self.db.commit()
+        self.run_id = cursor.lastrowid
+        return self.run_id
+    
+    def sample(self, stats):
+        """Record how much was handled in the current minute (called every status check)"""
+        if self.run_id is None:
+            return
+        minute = int((time.time() - self.started) // 60)
+        delta = sum(handled for _, handled in self.counters.update(stats).values())
+        self.handled += delta
+        self.db.execute("""
+            INSERT INTO run_minutes (run_id, minute, processed) VALUES (?, ?, ?)
+            ON CONFLICT(run_id, minute) DO UPDATE SET processed = run_minutes.processed + excluded.processed
+        """, (self.run_id, minute, delta))
+        self.db.commit()
+    
+    def finish(self, summary, phases):
+        if self.run_id is None:
+            return
+        ended = time.time()
+        minutes = max(1 / 60, (ended - self.started) / 60)
+        self.db.execute("""
+            UPDATE runs SET ended = ?, reason = ?, denied = ?, failed = ?, unconfirmed = ?,
+                            dead_letters = ?, restarts = ?, per_min = ?
+            WHERE id = ?
+        """, (ended, summary['reason'], summary['denied'], summary['failed'], summary['unconfirmed'],
+              summary['dead_letters'], self.restarts,
+              round(self.handled / minutes, 2), self.run_id))
+        for phase, counters in phases.stats.items():
+            latency = phases.latency_summary(phase)
+            self.db.execute("INSERT OR REPLACE INTO run_phases VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", (
+                self.run_id, phase, counters['denied'], counters['failed'], counters['unconfirmed'],
+                counters['collisions'], latency['count'], latency['avg_ms'], latency['p50_ms'], latency['p95_ms']
+            ))
+        self.db.executemany(
+            "INSERT OR REPLACE INTO run_failures VALUES (?, ?, ?)",
+            [(self.run_id, reason, count) for reason, count in summary.get('failure_reasons', {}).items()]
+        )
+        self.db.commit()
+    
+    def close(self):
+        try:
+            self.db.close()
+        except Exception:
+            pass
+    
+    def steady_rate(self, run_id):
+        """Median handled per minute, leaving out the ramp-up minute and the unfinished last one"""
+        series = [row[0] for row in self.db.execute(
+            "SELECT processed FROM run_minutes WHERE run_id = ? ORDER BY minute", (run_id,)
+        )][1:-1]
+        if not series:
+            return None
+        series.sort()
+        return series[len(series) // 2]
+    
+    def runs(self, limit=20):
+        """Latest runs, oldest first"""
+        columns = ('id', 'started', 'ended', 'reason', 'workers', 'fleet_mode', 'script_hash', 'config',
+                   'denied', 'failed', 'unconfirmed', 'dead_letters', 'restarts', 'per_min')
+        rows = self.db.execute(
+            f"SELECT {', '.join(columns)} FROM runs ORDER BY id DESC LIMIT ?", (limit,)
+        ).fetchall()
+        runs = [dict(zip(columns, row)) for row in reversed(rows)]
+        for run in runs:
+            run['steady'] = self.steady_rate(run['id'])
+            run['per_worker'] = run['steady'] / run['workers'] if run['steady'] is not None and run['workers'] else None
+            run['phases'] = {
+                phase: {'p50_ms': p50, 'p95_ms': p95, 'collisions': collisions}
+                for phase, p50, p95, collisions in self.db.execute(
+                    "SELECT phase, latency_p50_ms, latency_p95_ms, collisions FROM run_phases WHERE run_id = ?", (run['id'],)
+                )
+            }
+        return runs
+    
+    def regression(self, run, earlier):
+        """-> (baseline per worker, drop) if run is REGRESSION_THRESHOLD below the median of earlier runs"""
+        baseline = sorted(r['per_worker'] for r in earlier[-REGRESSION_BASELINE_RUNS:] if r['per_worker'])
+        if not baseline or run['per_worker'] is None:
+            return None
+        median = baseline[len(baseline) // 2]
+        drop = 1 - run['per_worker'] / median
+        return (median, drop) if drop >= REGRESSION_THRESHOLD else None
+    
+    @staticmethod
+    def config_changes(before, after):
+        """'NAME old -> new' for every constant that differs between two runs"""
+        old, new = json.loads(before['config'] or '{}'), json.loads(after['config'] or '{}')
+        changes = [f"{name} {old.get(name)!r} -> {new.get(name)!r}"
+                   for name in sorted(set(old) | set(new)) if old.get(name) != new.get(name)]
+        if before['script_hash'] != after['script_hash']:
+            changes.append(f"worker scripts {before['script_hash']} -> {after['script_hash']}")
+        return changes
+    
+    def report(self, limit=20):
+        """Text table of the latest runs with config changes and throughput regressions"""
+        runs = self.runs(limit + REGRESSION_BASELINE_RUNS)
+        shown = runs[-limit:]
+        if not shown:
+            return "No runs recorded yet"
+        lines = [
+            f"{'RUN':>4}  {'STARTED':16}  {'MIN':>4}  {'WRK':>3}  {'/MIN':>6}  {'STEADY':>6}  {'/WRK':>5}  "
+            f"{'DENIED':>7}  {'FAILED':>6}  {'DEAD':>4}  {'RESTART':>7}  {'P95 MS':>6}  REASON"
+        ]
+        for run in shown:
+            index = runs.index(run)
+            minutes = ((run['ended'] or run['started']) - run['started']) / 60
+            p95 = max((phase['p95_ms'] or 0 for phase in run['phases'].values()), default=0) or '-'
+            steady = run['steady'] if run['steady'] is not None else '-'
+            per_worker = f"{run['per_worker']:.1f}" if run['per_worker'] else '-'
+            lines.append(
+                f"{run['id']:>4}  {datetime.fromtimestamp(run['started']).strftime('%Y-%m-%d %H:%M'):16}  "
+                f"{minutes:>4.0f}  {run['workers'] or 0:>3}  {run['per_min'] or 0:>6.1f}  "
+                f"{steady:>6}  {per_worker:>5}  "
+                f"{run['denied'] or 0:>7,}  {run['failed'] or 0:>6,}  {run['dead_letters'] or 0:>4}  "
+                f"{run['restarts'] or 0:>7}  {p95:>6}  {run['reason'] or 'running/crashed'}"
+            )
+            if index > 0:
+                changes = self.config_changes(runs[index - 1], run)
+                if changes:
+                    lines.append(f"      changed: {'; '.join(changes[:6])}" + (" ..." if len(changes) > 6 else ""))
+            flagged = self.regression(run, runs[:index])
+            if flagged:
+                lines.append(
+                    f"      ⚠️ REGRESSION: {run['per_worker']:.1f}/min per worker is {flagged[1]:.0%} below "
+                    f"the median of the previous runs ({flagged[0]:.1f})"
+                )
+        return "\n".join(lines)
+
+
+# ============================================================================
+# DATE-RANGE SHARDING
+# ============================================================================
+
+class ShardPlanner:
+    """Splits the schedule's start..end dates into one contiguous slice per worker
+    
+    Slices never overlap, so two workers can never pick the same request.
+    When a worker drains its slice it takes over the upper half of the slice
+    that still has the most rows (the donor keeps the lower half).
+    """
+    
+    def __init__(self, base_url=None):
+        self.base_url = base_url or QUINYX_URL
+        parts = urllib.parse.urlsplit(self.base_url)
+        self.query = urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        params = dict(self.query)
+        self.start = date.fromisoformat(params['start'])
+        self.end = date.fromisoformat(params['end'])
+        self.ranges = {}  # index -> (start, end), both inclusive
+    
+    def assign(self, count):
+        """Even split of the whole range -> {index: (start, end)}"""
+        days = (self.end - self.start).days + 1
+        count = max(1, min(count, days))
+        self.ranges = {}
+        first = self.start
+        for index in range(count):
+            size = days // count + (1 if index < days % count else 0)
+            last = first + timedelta(days=size - 1)
+            self.ranges[index] = (first, last)
+            first = last + timedelta(days=1)
+        return dict(self.ranges)
+    
+    def has(self, index):
+        return index in self.ranges
+    
+    def url(self, index):
+        start, end = self.ranges[index]
+        query = [
+            (key, end.isoformat() if key == 'end' else start.isoformat() if key == 'start' else value)
+            for key, value in self.query
+        ]
+        parts = urllib.parse.urlsplit(self.base_url)
+        return urllib.parse.urlunsplit(parts._replace(query=urllib.parse.urlencode(query)))
+    
+    def script(self, index, base_script):
+        """Worker script with its shard marker in front (selectRow then always takes the top row)"""
+        if index not in self.ranges:
+            return base_script
+        start, end = self.ranges[index]
+        marker = json.dumps({'start': start.isoformat(), 'end': end.isoformat()})
+        return f"window.__quinixShard = {marker};\n{base_script}"
+    
+    def describe(self, index):
+        if index not in self.ranges:
+            return "idle"
+        start, end = self.ranges[index]
+        return f"{start.isoformat()}..{end.isoformat()} ({(end - start).days + 1}d)"
+    
+    def release(self, index):
+        """Hand a retiring worker's slice to the nearest other slice -> that worker or None
+        
+        Anything between the two slices was already drained, so covering it is harmless.
+        """
+        released = self.ranges.pop(index, None)
+        if released is None or not self.ranges:
+            return None
+        start, end = released
+        
+        def gap(other):
+            other_start, other_end = self.ranges[other]
+            return max((start - other_end).days, (other_start - end).days)
+        
+        neighbour = min(self.ranges, key=gap)
+        other_start, other_end = self.ranges[neighbour]
+        self.ranges[neighbour] = (min(start, other_start), max(end, other_end))
+        return neighbour
+    
+    @staticmethod
+    def overlap(top_keys):
+        """Two workers whose top rows share SHARD_OVERLAP_KEYS keys -> (index, index, shared) or None
+        
+        Disjoint date slices cannot show the same requests, apart from the odd
+        request spanning a slice boundary. If they do, the panel ignored the
+        date filter and every worker is taking the same top row.
+        """
+        indexes = sorted(top_keys)
+        for n, first in enumerate(indexes):
+            for second in indexes[n + 1:]:
+                shared = set(top_keys[first] or ()) & set(top_keys[second] or ())
+                if len(shared) >= SHARD_OVERLAP_KEYS:
+                    return first, second, shared
+        return None
+    
+    def rebalance(self, idle_index, visible_rows=None):
+        """Give the drained worker half of the fullest slice -> donor index or None"""
+        visible_rows = visible_rows or {}
+        self.ranges.pop(idle_index, None)
+        candidates = [
+            index for index, (start, end) in self.ranges.items()
+            if (end - start).days + 1 >= 2 * SHARD_MIN_DAYS and visible_rows.get(index) != 0
+        ]
+        if not candidates:
+            return None
+        donor = max(candidates, key=lambda index: (
+            visible_rows.get(index) or 0, (self.ranges[index][1] - self.ranges[index][0]).days
+        ))
+        start, end = self.ranges[donor]
+        middle = start + timedelta(days=((end - start).days + 1) // 2)
+        self.ranges[donor] = (start, middle - timedelta(days=1))
+        self.ranges[idle_index] = (middle, end)
+        return donor
+
+
+def apply_resource_blocking(driver, patterns=None):
+    """Block images, fonts and analytics for this window via CDP.
+    
+    The block list stays active for the page target, so it also covers
+    later refreshes. Pass an empty list to remove blocking again.
+    """
+    if patterns is None:
+        patterns = BLOCKED_URL_PATTERNS
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(patterns)})
+        return True
+    except Exception as e:
+        print(f"Could not apply resource blocking: {e}")
+        return False
+
+
+def measure_page_profile(driver):
+    """Measure page-load time and renderer memory of the current page"""
+    profile = {}
+    try:
+        timing = driver.execute_script("""
+            const nav = performance.getEntriesByType('navigation')[0];
+            const resources = performance.getEntriesByType('resource');
+            return {
+                domMs: nav ? Math.round(nav.domContentLoadedEventEnd) : null,
+                loadMs: nav && nav.loadEventEnd > 0 ? Math.round(nav.loadEventEnd) : null,
+                resources: resources.length,
+                transferKb: Math.round(resources.reduce((sum, r) => sum + (r.transferSize || 0), 0) / 1024)
+            };
+        """)
+        profile.update(timing or {})
+    except Exception:
+        pass
+    try:
+        driver.execute_cdp_cmd('Performance.enable', {})
+        metrics = driver.execute_cdp_cmd('Performance.getMetrics', {})
+        values = {m['name']: m['value'] for m in metrics.get('metrics', [])}
+        profile['heapMb'] = round(values.get('JSHeapUsedSize', 0) / (1024 * 1024), 1)
+        profile['nodes'] = int(values.get('Nodes', 0))
+    except Exception:
+        pass
+    return profile
+
+
+def format_page_profile(profile):
+    """One-line summary of a measure_page_profile() result"""
+    if not profile:
+        return "no data"
+    load = profile.get('loadMs') or profile.get('domMs')
+    return (f"load {load if load is not None else '?'}ms, "
+            f"{profile.get('resources', '?')} resources / {profile.get('transferKb', '?')}KB, "
+            f"heap {profile.get('heapMb', '?')}MB, {profile.get('nodes', '?')} DOM nodes")
+
+
+def benchmark_page_profile(driver, url, settle_seconds=10):
+    """Load url once without and once with resource blocking and measure both"""
+    results = {}
+    for label, patterns in (('before', []), ('after', BLOCKED_URL_PATTERNS)):
+        apply_resource_blocking(driver, patterns)
+        driver.get(url)
+        time.sleep(settle_seconds)
+        results[label] = measure_page_profile(driver)
+    return results
+
+
+# ============================================================================
+# PROCESS TREE MONITORING
+# ============================================================================
+
+def read_process_table():
+    """Return {pid: (ppid, cpu_seconds, rss_bytes)} for all processes"""
+    table = {}
+    if psutil is not None:
+        for proc in psutil.process_iter(['ppid']):
+            try:
+                cpu = proc.cpu_times()
+                table[proc.pid] = (proc.info['ppid'], cpu.user + cpu.system, proc.memory_info().rss)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return table
+    
+    if not os.path.isdir('/proc'):
+        return table
+    ticks = os.sysconf('SC_CLK_TCK')
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'rb') as f:
+                stat = f.read().decode('utf-8', 'replace')
+        except OSError:
+            continue
+        # Fields after "pid (comm)" - comm may contain spaces/parentheses
+        fields = stat[stat.rfind(')') + 2:].split()
+        ppid = int(fields[1])
+        cpu_seconds = (int(fields[11]) + int(fields[12])) / ticks
+        rss_bytes = int(fields[21]) * page_size
+        table[int(entry)] = (ppid, cpu_seconds, rss_bytes)
+    return table
+
+
+def process_tree(root_pid, table):
+    """List root_pid and all of its descendants (parents before children)"""
+    if root_pid not in table:
+        return []
+    children = {}
+    for pid, (ppid, _, _) in table.items():
+        children.setdefault(ppid, []).append(pid)
+    tree = [root_pid]
+    for pid in tree:
+        tree.extend(children.get(pid, []))
+    return tree
+
+
+def kill_process_tree(root_pid):
+    """Kill one process tree (never touches other browsers on the machine)"""
+    if not root_pid:
+        return False
+    if os.name == 'nt':
+        try:
+            result = subprocess.run(['taskkill', '/F', '/T', '/PID', str(root_pid)],
+                                    capture_output=True, timeout=10)
+            return result.returncode == 0
+        except Exception:
+            return False
+    
+    # Kill children first so nothing gets re-parented and survives
+    killed = False
+    for pid in reversed(process_tree(root_pid, read_process_table())):
+        try:
+            os.kill(pid, signal.SIGKILL)
+            killed = True
+        except OSError:
+            pass
+    return killed
+
+
+class ProcessTreeMonitor:
+    """Tracks the browser + driver PIDs of each worker and samples CPU/RSS"""
+    
+    def __init__(self):
+        self.workers = {}  # worker_num -> {'driver_pid': int, 'browser_pid': int}
+        self._last_cpu = {}  # worker_num -> (cpu_seconds, timestamp)
+    
+    def register(self, worker_num, driver, browser_pid=None):
+        """Record the driver PID and the browser it launched (or a known one when reattaching)"""
+        driver_pid = None
+        try:
+            driver_pid = driver.service.process.pid
+        except Exception:
+            pass
+        
+        table = read_process_table()
+        if browser_pid not in table:
+            browser_pid = self._find_browser_pid(driver_pid, table)
+        self.workers[worker_num] = {
+            'driver_pid': driver_pid,
+            'browser_pid': browser_pid,
+        }
+        self._last_cpu.pop(worker_num, None)
+        return self.workers[worker_num]
+    
+    @staticmethod
+    def _find_browser_pid(driver_pid, table):
+        """The driver launches exactly one browser process"""
+        children = [pid for pid, (ppid, _, _) in table.items() if ppid == driver_pid]
+        return min(children) if driver_pid and children else None
+    
+    def unregister(self, worker_num):
+        self.workers.pop(worker_num, None)
+        self._last_cpu.pop(worker_num, None)
+    
+    def sample(self):
+        """Return {worker_num: {'cpu': percent, 'rss_mb': MB, 'processes': n}}"""
+        table = read_process_table()
+        now = time.time()
+        samples = {}
+        for worker_num, pids in self.workers.items():
+            if not pids['browser_pid']:
+                pids['browser_pid'] = self._find_browser_pid(pids['driver_pid'], table)
+            # The browser outlives the driver (detach=True), so track both trees
+            tree = set(process_tree(pids['browser_pid'], table))
+            tree.update(process_tree(pids['driver_pid'], table))
+            if not tree:
+                continue
+            
+            cpu_seconds = sum(table[pid][1] for pid in tree)
+            rss_bytes = sum(table[pid][2] for pid in tree)
+            cpu_percent = 0.0
+            if worker_num in self._last_cpu:
+                last_cpu, last_time = self._last_cpu[worker_num]
+                if now > last_time:
+                    cpu_percent = max(0.0, (cpu_seconds - last_cpu) / (now - last_time) * 100)
+            self._last_cpu[worker_num] = (cpu_seconds, now)
+            
+            samples[worker_num] = {
+                'cpu': cpu_percent,
+                'rss_mb': rss_bytes / (1024 * 1024),
+                'processes': len(tree),
+            }
+        return samples
+    
+    def kill(self, worker_num):
+        """Kill only this worker's browser tree and its driver"""
+        pids = self.workers.get(worker_num)
+        if not pids:
+            return False
+        killed = kill_process_tree(pids['browser_pid'])
+        killed = kill_process_tree(pids['driver_pid']) or killed
+        self.unregister(worker_num)
+        return killed
+
+
+# ============================================================================
+# IN-PLACE MEMORY TRIMMING
+# ============================================================================
+
+def read_memory_metrics(driver):
+    """JS heap (MB) and DOM node count of a page via CDP Performance.getMetrics"""
+    driver.execute_cdp_cmd('Performance.enable', {})
+    metrics = driver.execute_cdp_cmd('Performance.getMetrics', {})
+    values = {m['name']: m['value'] for m in metrics.get('metrics', [])}
+    return {
+        'heap_mb': values.get('JSHeapUsedSize', 0) / (1024 * 1024),
+        'nodes': int(values.get('Nodes', 0)),
+    }
+
+
+class MemoryTrimmer:
+    """Keeps each worker's heap and DOM below the limits without reloading
+    
+    Every check over a limit applies the next, heavier step; a check under
+    the limits resets the escalation. Reload is only ever the last step.
+    """
+    
+    STEPS = ('gc', 'prune', 'pressure', 'reload')
+    
+    def __init__(self):
+        self.history = {}  # worker_num -> deque of (timestamp, heap_mb, nodes)
+        self.escalation = {}  # worker_num -> index into STEPS
+    
+    def check(self, worker_num, driver):
+        """Sample memory and trim if needed. Returns (metrics, action or None)"""
+        metrics = read_memory_metrics(driver)
+        history = self.history.setdefault(worker_num, deque(maxlen=MEMORY_HISTORY_POINTS))
+        history.append((time.time(), metrics['heap_mb'], metrics['nodes']))
+        
+        if metrics['heap_mb'] < MEMORY_HEAP_LIMIT_MB and metrics['nodes'] < MEMORY_NODE_LIMIT:
+            self.escalation[worker_num] = 0
+            return metrics, None
+        
+        step = self.escalation.get(worker_num, 0)
+        action = self.STEPS[min(step, len(self.STEPS) - 1)]
+        self.escalation[worker_num] = step + 1
+        
+        if action == 'gc':
+            driver.execute_cdp_cmd('HeapProfiler.collectGarbage', {})
+        elif action == 'prune':
+            pruned = driver.execute_script(
+                "return window.quinixPruneHandledRows ? window.quinixPruneHandledRows() : 0;"
+            )
+            driver.execute_cdp_cmd('HeapProfiler.collectGarbage', {})
+            action = f"prune ({pruned} rows)"
+        elif action == 'pressure':
+            driver.execute_cdp_cmd('Memory.simulatePressureNotification', {'level': 'critical'})
+        else:
+            # Caller reloads + re-injects; start over afterwards
+            self.escalation[worker_num] = 0
+        return metrics, action
+    
+    def trend(self, worker_num):
+        """Heap growth in MB over the recorded history"""
+        history = self.history.get(worker_num)
+        if not history or len(history) < 2:
+            return 0.0
+        return history[-1][1] - history[0][1]
+
+
+# ============================================================================
+# GOLDEN PROFILE MANAGER
+# ============================================================================
+
+def profile_in_use(path, browser_pid=None):
+    """Is a browser still running on this profile folder?
+    
+    The PID recorded in STATE_FILE is checked first, then Chromium's own lock:
+    SingletonLock (a symlink to "host-pid") on Linux/macOS, and on Windows a
+    'lockfile' the running browser holds open for writing. Only looks - stale
+    locks are removed by clear_stale_locks() once this has returned False.
+    """
+    if browser_pid and browser_pid in read_process_table():
+        return True
+    singleton = os.path.join(path, 'SingletonLock')
+    if os.path.lexists(singleton):
+        try:
+            host, _, pid = os.readlink(singleton).rpartition('-')
+            pid = int(pid)
+        except (OSError, ValueError):
+            return True  # Unreadable lock - assume the browser is there
+        if host != socket.gethostname():
+            return True
+        try:
+            os.kill(pid, 0)
+            return True
+        except ProcessLookupError:
+            return False
+        except OSError:
+            return True
+    lockfile = os.path.join(path, 'lockfile')
+    if os.path.exists(lockfile):
+        try:
+            # The browser shares it for reading only; appending nothing leaves it untouched
+            with open(lockfile, 'a'):
+                pass
+        except PermissionError:
+            return True
+        except OSError:
+            pass
+    return False
+
+
+# Chromium's single-instance locks in a profile folder
+PROFILE_LOCK_FILES = ('SingletonLock', 'SingletonCookie', 'SingletonSocket', 'lockfile')
+
+
+def clear_stale_locks(path):
+    """Remove lock files a crashed browser left behind (only call once profile_in_use() said no)"""
+    for name in PROFILE_LOCK_FILES:
+        lock = os.path.join(path, name)
+        if os.path.lexists(lock):
+            try:
+                os.remove(lock)
+            except OSError:
+                pass
+
+
+def dir_size_mb(path):
+    """Total size of a directory tree in MB (0 if missing)"""
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, name))
+            except OSError:
+                pass
+    return total / (1024 * 1024)
+
+
+class ProfileManager:
+    """Keeps one authenticated golden profile and clones it for every worker"""
+    
+    def __init__(self, golden_dir=None):
+        self.golden_dir = golden_dir or GOLDEN_PROFILE_DIR
+        self._ignore = shutil.ignore_patterns(*PROFILE_TRIM_PATTERNS)
+    
+    def has_golden(self):
+        return os.path.isdir(os.path.join(self.golden_dir, GOLDEN_INNER_PROFILE))
+    
+    def trim(self, path):
+        """Delete cache/history bloat below path. Returns MB freed"""
+        before = dir_size_mb(path)
+        for dirpath, dirnames, filenames in os.walk(path):
+            ignored = self._ignore(dirpath, dirnames + filenames)
+            for name in ignored:
+                target = os.path.join(dirpath, name)
+                if os.path.isdir(target) and not os.path.islink(target):
+                    shutil.rmtree(target, ignore_errors=True)
+                else:
+                    try:
+                        os.remove(target)
+                    except OSError:
+                        pass
+            dirnames[:] = [d for d in dirnames if d not in ignored]
+        return before - dir_size_mb(path)
+    
+    def save_golden(self, profile_number):
+        """Turn a logged-in worker profile (browser closed!) into the golden profile"""
+        source = get_profile_dir(profile_number)
+        if os.path.isdir(self.golden_dir):
+            shutil.rmtree(self.golden_dir, ignore_errors=True)
+        shutil.copytree(source, self.golden_dir, ignore=self._ignore, symlinks=True)
+        inner = os.path.join(self.golden_dir, f"Profile{profile_number}")
+        if os.path.isdir(inner):
+            os.rename(inner, os.path.join(self.golden_dir, GOLDEN_INNER_PROFILE))
+        self.trim(self.golden_dir)
+        return dir_size_mb(self.golden_dir)
+    
+    def clone(self, profile_number, browser_pid=None):
+        """Replace a worker profile with a fresh copy of the golden profile
+        
+        A profile a browser still runs on (one that survived the last run but
+        could not be reattached) is never deleted: the clone goes to a new
+        folder for this run instead. Returns (size_before_mb, size_after_mb, seconds).
+        """
+        target = get_profile_dir(profile_number)
+        if profile_in_use(target, browser_pid):
+            target = f"{target}-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+            relocated_profiles[profile_number] = target
+        else:
+            clear_stale_locks(target)
+        size_before = dir_size_mb(target)
+        started = time.time()
+        if os.path.isdir(target):
+            shutil.rmtree(target, ignore_errors=True)
+        shutil.copytree(self.golden_dir, target, ignore=self._ignore, symlinks=True)
+        os.rename(os.path.join(target, GOLDEN_INNER_PROFILE), os.path.join(target, f"Profile{profile_number}"))
+        return size_before, dir_size_mb(target), time.time() - started
+
+
+def bootstrap_golden_profile(profiles, console):
+    """First run: log in once in a single window and save it as the golden profile"""
+    # The login window is always visible - without a display or anyone to answer, stop before launching it
+    if not console.interactive and (HEADLESS or not (sys.stdin and sys.stdin.isatty())):
+        raise LoginRequired(
+            "no golden profile yet - run once with the dashboard (or --headless --set HEADLESS=false "
+            "from a terminal) to log in and create it"
+        )
+    console.add_log("=" * 80, log_type='success')
+    console.add_log("🔑 FIRST TIME SETUP: Login ONCE in the window that opens", log_type='error')
+    console.add_log("That login becomes the golden profile every worker is cloned from", log_type='system')
+    console.add_log("After logging in, click DONE LOGGING IN button", log_type='system')
+    console.add_log("=" * 80, log_type='success')
+    console.update()
+    
+    driver = setup_driver(window_position=grid_position(0), window_size=(WINDOW_WIDTH, WINDOW_HEIGHT),
+                          profile_number=1, headless=False)
+    driver.get(get_landing_url())
+    console.enable_login_done_button()
+    console.update()
+    print("\n🔑 Login in the window, then click DONE LOGGING IN button...")
+    console.wait_for_login_done()
+    
+    # Close the browser so cookies are flushed and no files are locked
+    try:
+        driver.quit()
+    except Exception:
+        pass
+    size_mb = profiles.save_golden(1)
+    console.add_log(f"✅ Golden profile saved ({size_mb:.1f}MB after trimming)", log_type='success')
+    console.update()
+
+
+def login_all_windows(console):
+    """Without a golden profile every window needs its own login"""
+    console.add_log("=" * 80, log_type='success')
+    console.add_log("🔑 FIRST TIME SETUP: Login to ALL 6 windows", log_type='error')
+    console.add_log("=" * 80, log_type='success')
+    console.add_log("⚠️ Each profile needs login ONCE - they'll remember it forever!", log_type='system')
+    console.add_log("Login to window 1 (top-left), then 2, then 3, etc...", log_type='system')
+    console.add_log("After logging into all 6, click DONE LOGGING IN button", log_type='system')
+    console.add_log("Next time you run this script - AUTO LOGGED IN! ✅", log_type='success')
+    console.add_log("=" * 80, log_type='success')
+    console.enable_login_done_button()
+    console.update()
+    
+    print("\n🔑 Login to all 6 windows, then click DONE LOGGING IN button...")
+    
+    # Wait for user to click Done button
+    console.wait_for_login_done()
+    
+    console.add_log("=" * 80, log_type='success')
+    console.add_log("✅ Profiles saved! Next run = AUTO LOGIN!", log_type='success')
+    console.add_log("=" * 80, log_type='success')
+    console.update()
+
+
+# ============================================================================
+# SHARED SESSION
+# ============================================================================
+
+# Fields of a CDP Network.Cookie that Network.setCookies accepts back
+COOKIE_PARAM_FIELDS = ('name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'sameSite', 'priority')
+
+
+class SessionManager:
+    """Exports the login of one window and injects it into every other browser"""
+    
+    def __init__(self):
+        self.session = None  # {'cookies': [...], 'storage': {...}, 'captured_at': ts}
+        self._storage_scripts = {}  # id(driver) -> addScriptToEvaluateOnNewDocument identifier
+    
+    def capture(self, driver):
+        """Export all cookies (incl. HttpOnly) and local/sessionStorage of a logged-in window"""
+        cookies = driver.execute_cdp_cmd('Network.getAllCookies', {}).get('cookies', [])
+        storage = driver.execute_script("""
+            const dump = store => {
+                const items = {};
+                for (let i = 0; i < store.length; i++) {
+                    const key = store.key(i);
+                    items[key] = store.getItem(key);
+                }
+                return items;
+            };
+            return { origin: location.origin, local: dump(localStorage), session: dump(sessionStorage) };
+        """)
+        self.session = {'cookies': cookies, 'storage': storage, 'captured_at': time.time()}
+        return self.session
+    
+    def apply(self, driver):
+        """Inject the shared session - call before navigating (or reload afterwards)"""
+        if not self.session:
+            return False
+        cookies = []
+        for cookie in self.session['cookies']:
+            param = {key: cookie[key] for key in COOKIE_PARAM_FIELDS if key in cookie}
+            if cookie.get('expires', -1) > 0:
+                param['expires'] = cookie['expires']
+            cookies.append(param)
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setCookies', {'cookies': cookies})
+        
+        # Storage is per origin, so seed it on every new document of that origin
+        old_script = self._storage_scripts.pop(id(driver), None)
+        if old_script:
+            try:
+                driver.execute_cdp_cmd('Page.removeScriptToEvaluateOnNewDocument', {'identifier': old_script})
+            except Exception:
+                pass
+        storage = self.session['storage'] or {}
+        if storage.get('origin'):
+            source = (
+                "(function(s) { if (location.origin !== s.origin) return;"
+                " for (const k in s.local) { if (localStorage.getItem(k) === null) localStorage.setItem(k, s.local[k]); }"
+                " for (const k in s.session) { if (sessionStorage.getItem(k) === null) sessionStorage.setItem(k, s.session[k]); }"
+                f" }})({json.dumps(storage)});"
+            )
+            result = driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': source})
+            self._storage_scripts[id(driver)] = result.get('identifier')
+        return True
+    
+    def forget(self, driver):
+        self._storage_scripts.pop(id(driver), None)
+    
+    @staticmethod
+    def is_logged_out(driver):
+        """A window that was bounced to a login page has lost its session"""
+        url = (driver.current_url or '').lower()
+        return any(marker in url for marker in LOGIN_URL_MARKERS)
+
+
+def login_first_window(console):
+    """With session sharing only window 1 needs a login"""
+    console.add_log("=" * 80, log_type='success')
+    console.add_log("🔑 LOGIN: Login to window 1 (top-left) ONLY", log_type='error')
+    console.add_log("The session is copied to every other window automatically", log_type='system')
+    console.add_log("After logging in, click DONE LOGGING IN button", log_type='system')
+    console.add_log("=" * 80, log_type='success')
+    console.enable_login_done_button()
+    console.update()
+    
+    print("\n🔑 Login to window 1, then click DONE LOGGING IN button...")
+    console.wait_for_login_done()
+
+
+def worker_debug_port(index):
+    return DEBUG_PORT_BASE + index + 1 if DEBUG_PORT_BASE else None
+
+
+def launch_worker_browser(index, sessions=None, shards=None):
+    """Open the browser for worker number index (0-based) on the landing page"""
+    debug_port = worker_debug_port(index)
+    if debug_port and devtools_alive(debug_port):
+        debug_port = None  # A browser we could not reattach still holds it - let the driver pick one
+    driver = setup_driver(
+        window_position=grid_position(index),
+        window_size=(WINDOW_WIDTH, WINDOW_HEIGHT),
+        profile_number=index + 1,
+        debug_port=debug_port
+    )
+    # Shared login goes in before the first navigation
+    if sessions is not None and sessions.session:
+        sessions.apply(driver)
+    driver.get(get_landing_url(index, shards))
+    return driver
+
+
+# ============================================================================
+# REATTACH AFTER A CONTROLLER RESTART
+# ============================================================================
+
+def save_fleet_state(drivers, monitor, shards=None, retired=(), path=None):
+    """Write ports, PIDs and shards of the running fleet to STATE_FILE"""
+    state = {
+        'saved_at': datetime.now().isoformat(timespec='seconds'),
+        'backend': BROWSER_BACKEND,
+        'fleet_mode': FLEET_MODE,
+        'workers': [
+            {
+                'index': i,
+                'port': worker_debug_port(i),
+                'browser_pid': (monitor.workers.get(i + 1) or {}).get('browser_pid'),
+            }
+            for i in range(len(drivers)) if i not in retired
+        ],
+        'shards': {
+            str(i): [start.isoformat(), end.isoformat()] for i, (start, end) in shards.ranges.items()
+        } if shards is not None else None,
+    }
+    path = path or STATE_FILE
+    try:
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        os.replace(path + '.tmp', path)
+    except OSError as e:
+        print(f"Could not save fleet state: {e}")
+
+
+def load_fleet_state(path=None):
+    try:
+        with open(path or STATE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def devtools_alive(port):
+    """Is a browser listening on this DevTools port?"""
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/json/version", timeout=2) as response:
+            return response.status == 200
+    except Exception:
+        return False
+
+
+def attach_driver(port, backend=None):
+    """New Selenium session on a browser that is already running on this DevTools port"""
+    spec = DRIVER_BACKENDS[backend or BROWSER_BACKEND]
+    options = spec['options']()
+    options.debugger_address = f"127.0.0.1:{port}"
+    driver = spec['driver'](options=options)
+    # Pick the worker's page, not a DevTools or blank tab
+    for handle in driver.window_handles:
+        driver.switch_to.window(handle)
+        if driver.current_url.startswith('http'):
+            break
+    return driver
+
+
+def reattach_fleet(state, monitor, console):
+    """Reconnect to every still-running browser in the state file -> {index: driver}"""
+    reattached = {}
+    if not state or state.get('fleet_mode', 'windows') != 'windows':
+        return reattached
+    for entry in state.get('workers', []):
+        index, port = entry['index'], entry.get('port')
+        if not port or not devtools_alive(port):
+            continue
+        try:
+            driver = attach_driver(port, state.get('backend'))
+            monitor.register(index + 1, driver, browser_pid=entry.get('browser_pid'))
+            reattached[index] = driver
+            console.add_log(f"🔌 Window {index+1} reattached on port {port}", log_type='success')
+        except Exception as e:
+            console.add_log(f"Window {index+1} is alive on port {port} but could not be reattached: {e}", log_type='error')
+    return reattached
+
+
+def worker_running(driver):
+    """Is the worker script already running in this page?"""
+    try:
+        return bool(driver.execute_script("return !!(window.workerLogs && window.workerLogs.entries);"))
+    except Exception:
+        return False
+
+
+# ============================================================================
+# SINGLE-BROWSER FLEET (ONE BROWSER CONTEXT PER WORKER)
+# ============================================================================
+
+class TargetSessions:
+    """One DevTools websocket to the shared browser with a flat session per tab
+    
+    Target.attachToTarget (flatten) gives every tab its own sessionId on this
+    connection. Calls for different tabs are multiplexed over it and run side
+    by side from any thread; each waits at most its own timeout.
+    """
+    
+    def __init__(self, ws_url):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.connection = CdpConnection(ws_url)
+        # The browser went away - let pending calls fail, then end the loop thread
+        self.connection.on('__closed__', lambda params: self.loop.call_later(1, self.loop.stop))
+    
+    @classmethod
+    def open(cls, browser):
+        """-> TargetSessions on the browser's DevTools endpoint, or None when there is none"""
+        address = devtools_address(browser)
+        if not address:
+            return None
+        targets = None
+        try:
+            with urllib.request.urlopen(f"http://{address}/json/version", timeout=5) as response:
+                ws_url = json.loads(response.read().decode('utf-8'))['webSocketDebuggerUrl']
+            targets = cls(ws_url)
+            targets._run(targets.connection.connect(), CDP_CALL_TIMEOUT)
+            return targets
+        except Exception:
+            if targets is not None:
+                targets.close()
+            return None
+    
+    def _run(self, coroutine, timeout):
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise TimeoutError(f"no DevTools answer within {timeout}s")
+    
+    def attach(self, target_id):
+        """-> sessionId of a new flat session on this tab"""
+        result = self.send(None, 'Target.attachToTarget', {'targetId': target_id, 'flatten': True})
+        return result['sessionId']
+    
+    def send(self, session_id, method, params=None, timeout=None):
+        """One CDP command to a tab's session (None = the browser itself)"""
+        timeout = timeout or CDP_CALL_TIMEOUT
+        return self._run(self.connection.send(method, params, timeout, session_id), timeout + 1)
+    
+    def evaluate(self, session_id, function_body, args=(), timeout=None):
+        timeout = timeout or CDP_CALL_TIMEOUT
+        return self._run(self.connection.evaluate(function_body, timeout=timeout, session_id=session_id, args=args),
+                         timeout + 1)
+    
+    def close(self):
+        try:
+            self._run(self.connection.close(), CDP_CALL_TIMEOUT)
+        except Exception:
+            pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+class ContextDriver:
+    """One worker tab inside a shared browser, used like a normal driver
+    
+    With the browser's DevTools endpoint every tab has its own flat target
+    session (TargetSessions), so scripts, CDP commands and navigation go
+    straight to this tab without switching windows or waiting for other tabs.
+    Without one it falls back to Selenium, which drives one tab at a time:
+    those calls switch to this tab under the fleet lock first.
+    """
+    
+    def __init__(self, browser, handle, context_id, lock, targets=None):
+        self.browser = browser
+        self.handle = handle
+        self.context_id = context_id
+        self.lock = lock
+        self.targets = targets
+        self.session_id = None
+        if targets is not None:
+            try:
+                self.session_id = targets.attach(handle)
+            except Exception:
+                pass  # This tab goes through Selenium
+    
+    @property
+    def service(self):
+        return self.browser.service
+    
+    @property
+    def current_url(self):
+        if self.session_id:
+            return self.execute_script("return location.href;")
+        with self.lock:
+            self._activate()
+            return self.browser.current_url
+    
+    def _activate(self):
+        if self.browser.current_window_handle != self.handle:
+            self.browser.switch_to.window(self.handle)
+    
+    def _navigate(self, method, params):
+        """Page.navigate / Page.reload on this tab's session, then wait for the new document like get() does"""
+        try:
+            self.execute_script("window.__quinixLeaving = true;")
+        except Exception:
+            pass  # Nothing loaded yet
+        result = self.targets.send(self.session_id, method, params)
+        if result.get('errorText'):
+            raise RuntimeError(f"{method}: {result['errorText']}")
+        deadline = time.monotonic() + CDP_CALL_TIMEOUT * 4
+        while time.monotonic() < deadline:
+            time.sleep(0.25)
+            try:
+                if self.execute_script("return !window.__quinixLeaving && document.readyState === 'complete';"):
+                    return
+            except (RuntimeError, TimeoutError):
+                continue  # Context destroyed mid-navigation
+        raise TimeoutError(f"page did not load within {CDP_CALL_TIMEOUT * 4}s")
+    
+    def execute_script(self, script, *args):
+        if self.session_id:
+            return self.targets.evaluate(self.session_id, script, args)
+        with self.lock:
+            self._activate()
+            return self.browser.execute_script(script, *args)
+    
+    def execute_cdp_cmd(self, cmd, params):
+        if self.session_id:
+            return self.targets.send(self.session_id, cmd, params)
+        with self.lock:
+            self._activate()
+            return self.browser.execute_cdp_cmd(cmd, params)
+    
+    def get(self, url):
+        if self.session_id:
+            return self._navigate('Page.navigate', {'url': url})
+        with self.lock:
+            self._activate()
+            self.browser.get(url)
+    
+    def refresh(self):
+        if self.session_id:
+            return self._navigate('Page.reload', {})
+        with self.lock:
+            self._activate()
+            self.browser.refresh()
+    
+    def close(self):
+        """Close this tab and dispose its browser context"""
+        if self.session_id:
+            self.targets.send(None, 'Target.closeTarget', {'targetId': self.handle})
+        else:
+            with self.lock:
+                self._activate()
+                self.browser.close()
+                self.browser.switch_to.window(self.browser.window_handles[0])
+        if self.context_id:
+            try:
+                if self.targets is not None:
+                    self.targets.send(None, 'Target.disposeBrowserContext', {'browserContextId': self.context_id})
+                else:
+                    self.browser.execute_cdp_cmd('Target.disposeBrowserContext', {'browserContextId': self.context_id})
+            except Exception:
+                pass
+
+
+def protect_target(driver):
+    """Per-target anti-throttling + blocking (each tab is its own CDP target)"""
+    enable_focus_emulation(driver)
+    try:
+        driver.execute_cdp_cmd('Page.enable', {})
+        driver.execute_cdp_cmd('Page.setWebLifecycleState', {'state': 'active'})
+    except Exception:
+        pass
+    if BLOCK_RESOURCES:
+        apply_resource_blocking(driver)
+
+
+def open_context_tab(browser, lock, targets=None):
+    """Create a new isolated browser context with one tab in it"""
+    if targets is not None:
+        try:
+            context_id = targets.send(None, 'Target.createBrowserContext', {}).get('browserContextId')
+            target_id = targets.send(None, 'Target.createTarget', {
+                'url': 'about:blank',
+                'browserContextId': context_id,
+            })['targetId']
+            return ContextDriver(browser, target_id, context_id, lock, targets)
+        except Exception:
+            pass  # Create it through Selenium below
+    with lock:
+        try:
+            context_id = browser.execute_cdp_cmd('Target.createBrowserContext', {}).get('browserContextId')
+            target_id = browser.execute_cdp_cmd('Target.createTarget', {
+                'url': 'about:blank',
+                'browserContextId': context_id,
+            })['targetId']
+        except Exception:
+            # No context support - fall back to a plain tab in the default context
+            context_id = None
+            browser.switch_to.new_window('tab')
+            target_id = browser.current_window_handle
+        
+        # chromedriver uses the target id as window handle; it can take a moment to show up
+        for _ in range(20):
+            if target_id in browser.window_handles:
+                break
+            time.sleep(0.1)
+    return ContextDriver(browser, target_id, context_id, lock, targets)
+
+
+def launch_context_fleet(count, sessions, shards=None):
+    """Open ONE browser and one isolated context per worker (worker 1 = default context)
+    
+    Contexts start without cookies, so the login of the default context
+    (profile 1) is shared into each of them before navigation.
+    """
+    browser = setup_driver(window_position=grid_position(0), window_size=(WINDOW_WIDTH, WINDOW_HEIGHT), profile_number=1)
+    lock = threading.RLock()  # Only for tabs without a DevTools session
+    targets = TargetSessions.open(browser)
+    browser.get(get_landing_url(0, shards))
+    first = ContextDriver(browser, browser.current_window_handle, None, lock, targets)
+    if sessions.session is None and not SessionManager.is_logged_out(first):
+        sessions.capture(first)
+    
+    tabs = [first]
+    for index in range(1, count):
+        tab = open_context_tab(browser, lock, targets)
+        protect_target(tab)
+        if sessions.session:
+            sessions.apply(tab)
+        tab.get(get_landing_url(index, shards))
+        tabs.append(tab)
+    return browser, tabs
+
+
+def benchmark_fleet_modes(count, sessions, settle_seconds=15):
+    """Start the fleet both ways and compare startup time and memory
+    
+    Returns {'windows': {...}, 'contexts': {...}} with seconds, rss_mb and processes.
+    """
+    results = {}
+    monitor = ProcessTreeMonitor()
+    
+    started = time.time()
+    browsers = []
+    for i in range(count):
+        browsers.append(launch_worker_browser(i, sessions))
+        monitor.register(i + 1, browsers[-1])
+    startup = time.time() - started
+    time.sleep(settle_seconds)
+    samples = monitor.sample().values()
+    results['windows'] = {
+        'seconds': startup,
+        'rss_mb': sum(sample['rss_mb'] for sample in samples),
+        'processes': sum(sample['processes'] for sample in samples),
+    }
+    for worker_num in list(monitor.workers):
+        monitor.kill(worker_num)
+    
+    started = time.time()
+    browser, _ = launch_context_fleet(count, sessions)
+    monitor.register(1, browser)
+    startup = time.time() - started
+    time.sleep(settle_seconds)
+    sample = monitor.sample().get(1, {'rss_mb': 0, 'processes': 0})
+    results['contexts'] = {'seconds': startup, 'rss_mb': sample['rss_mb'], 'processes': sample['processes']}
+    monitor.kill(1)
+    return results
+
+
+def restart_worker(index, worker, monitor, settle_seconds=10, sessions=None, shards=None):
+    """Kill this worker's process tree, relaunch its browser and re-inject the script"""
+    monitor.kill(index + 1)
+    driver = launch_worker_browser(index, sessions, shards)
+    monitor.register(index + 1, driver)
+    time.sleep(settle_seconds)
+    inject_script(driver, worker['script'], worker['name'])
+    return driver
+
+
+def inject_script(driver, script, worker_name):
+    """Inject JavaScript worker script into the page"""
+    try:
+        driver.execute_script(script)
+        return True
+    except Exception as e:
+        print(f"Error injecting script for {worker_name}: {e}")
+        return False
+
+
+# Function body shared by the Selenium and CDP polling paths
+WORKER_LOGS_JS = """
+    const ring = window.workerLogs;
+    if (ring && ring.entries && ring.seq > 0) {
+        return ring.entries[(ring.seq - 1) % ring.capacity];
+    }
+    return null;
+"""
+
+
+def get_worker_logs(driver):
+    """Get the newest log entry from a worker"""
+    try:
+        logs = driver.execute_script(WORKER_LOGS_JS)
+        return logs
+    except:
+        return None
+
+
+class WorkerLogDrain:
+    """Per-worker cursor into the in-page log ring buffer
+    
+    Each poll drains every entry since the last cursor in one round trip.
+    Entries that were overwritten before we got to them are reported as lost,
+    and a new epoch (page reload) restarts the cursor from zero.
+    """
+    
+    def __init__(self):
+        self.cursors = {}  # index -> (epoch, seq)
+        self.lost = {}  # index -> entries overwritten before they were drained
+        self.seen = set()
+        self.discovered = []  # Listing items the workers captured, picked up by the workload index
+    
+    def script(self, index):
+        epoch, cursor = self.cursors.get(index, (None, 0))
+        return f"""
+            if (typeof window.quinixDrainLogs !== 'function') return null;
+            return window.quinixDrainLogs({int(cursor)}, {json.dumps(epoch)});
+        """
+    
+    def consume(self, index, batch):
+        """Advance the cursor -> (entries, dropped, reset)"""
+        if not batch:
+            return [], 0, False
+        self.discovered.extend(batch.get('discovered') or [])
+        self.cursors[index] = (batch['epoch'], batch['seq'])
+        dropped = batch.get('dropped', 0)
+        if dropped:
+            self.lost[index] = self.lost.get(index, 0) + dropped
+        # A first drain always reports a reset - only a real reload is interesting
+        reset = bool(batch.get('reset')) and index in self.seen
+        self.seen.add(index)
+        return batch.get('entries') or [], dropped, reset
+    
+    def forget(self, index):
+        self.cursors.pop(index, None)
+        self.seen.discard(index)
+
+
+# ============================================================================
+# WORKLOAD DISCOVERY
+# ============================================================================
+
+class WorkloadIndex:
+    """Local index of the pending absence requests
+    
+    The workers capture the listing XHR responses and hand the request IDs to
+    the controller with every log drain. Denials are matched back by the ID in
+    the deny request's URL. Until any IDs show up, the remaining count falls
+    back to the longest list a worker currently sees in its panel.
+    """
+    
+    def __init__(self, path=None):
+        self.db = sqlite3.connect(path or ":memory:")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS requests (
+                id TEXT PRIMARY KEY,
+                status TEXT,
+                done INTEGER NOT NULL DEFAULT 0,
+                first_seen REAL,
+                last_seen REAL,
+                handled_by TEXT
+            )
+        """)
+        self.db.commit()
+        self.visible_rows = {}  # index -> rows in that worker's panel at its last scan
+    
+    def add(self, items):
+        """Upsert discovered {id, status} items -> number of new IDs"""
+        if not items:
+            return 0
+        now = time.time()
+        before = self.known()
+        self.db.executemany("""
+            INSERT INTO requests (id, status, done, first_seen, last_seen) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                status = excluded.status,
+                done = MAX(requests.done, excluded.done),
+                last_seen = excluded.last_seen
+        """, [
+            (str(item['id']), item.get('status'),
+             1 if item.get('status') and DONE_STATUS_PATTERN.search(str(item['status'])) else 0,
+             now, now)
+            for item in items if item.get('id') is not None
+        ])
+        self.db.commit()
+        return self.known() - before
+    
+    def mark_handled(self, url, worker):
+        """Mark the request whose ID appears in a deny URL as done -> matched ID or None"""
+        if not url:
+            return None
+        tokens = [token for token in re.split(r'[/?&=#]', url) if token]
+        if not tokens:
+            return None
+        placeholders = ','.join('?' * len(tokens))
+        row = self.db.execute(
+            f"SELECT id FROM requests WHERE done = 0 AND id IN ({placeholders}) LIMIT 1", tokens
+        ).fetchone()
+        if row is None:
+            return None
+        self.db.execute("UPDATE requests SET done = 1, handled_by = ? WHERE id = ?", (worker, row[0]))
+        self.db.commit()
+        return row[0]
+    
+    def known(self):
+        return self.db.execute("SELECT COUNT(*) FROM requests").fetchone()[0]
+    
+    def pending(self):
+        return self.db.execute("SELECT COUNT(*) FROM requests WHERE done = 0").fetchone()[0]
+    
+    def remaining(self):
+        """-> (remaining, source) or (None, None) while nothing is known yet"""
+        if self.known():
+            return self.pending(), 'discovered'
+        rows = [count for count in self.visible_rows.values() if count is not None]
+        if rows:
+            return max(rows), 'visible rows'
+        return None, None
+    
+    def close(self):
+        try:
+            self.db.close()
+        except Exception:
+            pass
+
+
+# ============================================================================
+# CONCURRENT POLLING WITH CIRCUIT BREAKERS
+# ============================================================================
+
+class CircuitOpen(Exception):
+    """Raised instead of calling a driver whose circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """closed -> (N failures) -> open -> (cooldown) -> half-open -> one trial call"""
+    
+    def __init__(self, threshold=None, cooldown=None):
+        self.threshold = threshold or BREAKER_FAILURE_THRESHOLD
+        self.cooldown = cooldown or BREAKER_COOLDOWN
+        self.failures = 0
+        self.opened_at = None
+    
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if time.time() - self.opened_at >= self.cooldown:
+            return 'half-open'
+        return 'open'
+    
+    def allow(self):
+        return self.state != 'open'
+    
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+    
+    def record_failure(self):
+        """Returns True when this failure (re)opens the breaker"""
+        was_half_open = self.state == 'half-open'
+        self.failures += 1
+        if was_half_open or self.failures >= self.threshold:
+            self.opened_at = time.time()
+            return True
+        return False
+
+
+class ConcurrentPoller:
+    """Fans driver calls out over a thread pool with a hard deadline per call
+    
+    A call that misses the deadline is abandoned (the thread finishes in the
+    background) and counts as a failure for that driver's breaker.
+    """
+    
+    def __init__(self, max_workers=None):
+        self.executor = ThreadPoolExecutor(max_workers or POLL_POOL_SIZE, thread_name_prefix='quinix-poll')
+        self.breakers = {}  # index -> CircuitBreaker
+    
+    def breaker(self, index):
+        return self.breakers.setdefault(index, CircuitBreaker())
+    
+    def allowed(self, indexes):
+        return [i for i in indexes if self.breaker(i).allow()]
+    
+    def parked(self):
+        return [i for i, breaker in self.breakers.items() if breaker.state == 'open']
+    
+    def run(self, calls, timeout=None):
+        """Run {index: callable} concurrently -> {index: result or Exception}"""
+        timeout = timeout or POLL_TIMEOUT
+        results = {}
+        futures = {}
+        for index, call in calls.items():
+            if self.breaker(index).allow():
+                futures[self.executor.submit(call)] = index
+            else:
+                results[index] = CircuitOpen(f"window {index+1} parked")
+        
+        done, not_done = wait_futures(futures, timeout=timeout)
+        for future in done:
+            try:
+                results[futures[future]] = future.result()
+            except Exception as e:
+                results[futures[future]] = e
+        for future in not_done:
+            results[futures[future]] = TimeoutError(f"no answer within {timeout}s")
+        return results
+    
+    def record(self, results):
+        """Feed results into the breakers. Returns indexes whose breaker just opened"""
+        tripped = []
+        for index, result in results.items():
+            if isinstance(result, CircuitOpen):
+                continue
+            if isinstance(result, Exception):
+                if self.breaker(index).record_failure():
+                    tripped.append(index)
+            else:
+                self.breaker(index).record_success()
+        return tripped
+    
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
+
+
+# ============================================================================
+# ASYNC CDP CONTROLLER ENGINE
+# ============================================================================
+
+class CdpConnection:
+    """Minimal asyncio DevTools client over a raw websocket (RFC 6455 text frames)"""
+    
+    WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+    
+    def __init__(self, ws_url):
+        self.ws_url = ws_url
+        self.reader = None
+        self.writer = None
+        self.listeners = {}  # CDP event name -> [callback(params)]
+        self.closed = False
+        self._next_id = 0
+        self._pending = {}
+        self._reader_task = None
+    
+    async def connect(self):
+        url = urllib.parse.urlparse(self.ws_url)
+        port = url.port or 80
+        self.reader, self.writer = await asyncio.open_connection(url.hostname, port)
+        key = base64.b64encode(os.urandom(16)).decode()
+        self.writer.write((
+            f"GET {url.path} HTTP/1.1\r\n"
+            f"Host: {url.hostname}:{port}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n\r\n"
+        ).encode())
+        await self.writer.drain()
+        response = await self.reader.readuntil(b"\r\n\r\n")
+        status, *headers = response.decode('latin-1').split("\r\n")
+        if " 101 " not in status:
+            raise ConnectionError(f"DevTools handshake failed: {response[:80]!r}")
+        accept = base64.b64encode(hashlib.sha1((key + self.WEBSOCKET_GUID).encode()).digest()).decode()
+        fields = {name.strip().lower(): value.strip() for name, _, value in (h.partition(':') for h in headers)}
+        if fields.get('sec-websocket-accept') != accept:
+            raise ConnectionError("DevTools handshake failed: wrong Sec-WebSocket-Accept")
+        self._reader_task = asyncio.ensure_future(self._read_loop())
+    
+    def on(self, method, callback):
+        self.listeners.setdefault(method, []).append(callback)
+    
+    async def send(self, method, params=None, timeout=None, session_id=None):
+        """Send one CDP command and wait for its result (session_id = a flat target session)"""
+        if self.closed:
+            raise ConnectionError("DevTools connection closed")
+        self._next_id += 1
+        message_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message_id] = future
+        message = {'id': message_id, 'method': method, 'params': params or {}}
+        if session_id:
+            message['sessionId'] = session_id
+        await self._send_frame(json.dumps(message).encode())
+        try:
+            message = await asyncio.wait_for(future, timeout or CDP_CALL_TIMEOUT)
+        finally:
+            self._pending.pop(message_id, None)
+        if 'error' in message:
+            raise RuntimeError(f"{method}: {message['error'].get('message')}")
+        return message.get('result', {})
+    
+    async def evaluate(self, function_body, await_promise=False, timeout=None, session_id=None, args=()):
+        """Run a Selenium-style function body (may 'return', reads arguments) in the page"""
+        call = f".apply(null, {json.dumps(list(args))})" if args else "()"
+        result = await self.send('Runtime.evaluate', {
+            'expression': f"(function() {{{function_body}\n}}){call}",
+            'returnByValue': True,
+            'awaitPromise': await_promise,
+        }, timeout, session_id)
+        if 'exceptionDetails' in result:
+            details = result['exceptionDetails']
+            raise RuntimeError(details.get('exception', {}).get('description') or details.get('text'))
+        return result.get('result', {}).get('value')
+    
+    async def close(self):
+        self.closed = True
+        if self._reader_task:
+            self._reader_task.cancel()
+        if self.writer:
+            self.writer.close()
+    
+    async def _send_frame(self, payload, opcode=0x1):
+        header = bytearray([0x80 | opcode])
+        length = len(payload)
+        if length < 126:
+            header.append(0x80 | length)
+        elif length < 65536:
+            header.append(0x80 | 126)
+            header += struct.pack('>H', length)
+        else:
+            header.append(0x80 | 127)
+            header += struct.pack('>Q', length)
+        # Client frames must be masked
+        mask = os.urandom(4)
+        self.writer.write(bytes(header) + mask + self.apply_mask(payload, mask))
+        await self.writer.drain()
+    
+    @staticmethod
+    def apply_mask(payload, mask):
+        """XOR payload with the 4-byte mask (masking and unmasking are the same)"""
+        if not payload:
+            return b''
+        repeated = (mask * (len(payload) // 4 + 1))[:len(payload)]
+        return (int.from_bytes(payload, 'big') ^ int.from_bytes(repeated, 'big')).to_bytes(len(payload), 'big')
+    
+    async def _read_frame(self):
+        first, second = await self.reader.readexactly(2)
+        opcode = first & 0x0F
+        length = second & 0x7F
+        if length == 126:
+            length = struct.unpack('>H', await self.reader.readexactly(2))[0]
+        elif length == 127:
+            length = struct.unpack('>Q', await self.reader.readexactly(8))[0]
+        mask = await self.reader.readexactly(4) if second & 0x80 else None
+        payload = await self.reader.readexactly(length)
+        if mask:
+            payload = self.apply_mask(payload, mask)
+        return bool(first & 0x80), opcode, payload
+    
+    async def _read_loop(self):
+        buffer = b''
+        try:
+            while True:
+                fin, opcode, payload = await self._read_frame()
+                if opcode == 0x8:  # close - echo the status code back, then stop
+                    try:
+                        await self._send_frame(payload[:2], opcode=0x8)
+                    except (ConnectionError, OSError):
+                        pass
+                    break
+                if opcode == 0x9:  # ping
+                    await self._send_frame(payload, opcode=0xA)
+                    continue
+                if opcode in (0x0, 0x1, 0x2):
+                    buffer += payload
+                    if not fin:
+                        continue
+                    message, buffer = json.loads(buffer.decode('utf-8')), b''
+                    self._dispatch(message)
+        except (asyncio.IncompleteReadError, ConnectionError, OSError):
+            pass
+        finally:
+            self.closed = True
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("DevTools connection closed"))
+            for callback in self.listeners.get('__closed__', []):
+                callback({})
+    
+    def _dispatch(self, message):
+        if 'id' in message:
+            future = self._pending.get(message['id'])
+            if future and not future.done():
+                future.set_result(message)
+        else:
+            for callback in self.listeners.get(message.get('method'), []):
+                callback(message.get('params', {}))
+
+
+def devtools_address(driver):
+    """host:port of the DevTools endpoint of a driver's browser, or None"""
+    browser = getattr(driver, 'browser', driver)  # ContextDriver -> shared browser
+    capabilities = browser.capabilities or {}
+    address = None
+    for key in ('ms:edgeOptions', 'goog:chromeOptions'):
+        address = (capabilities.get(key) or {}).get('debuggerAddress') or address
+    return address
+
+
+def devtools_endpoint(driver):
+    """(host:port, target id) of the page a driver controls, or (None, None)"""
+    address = devtools_address(driver)
+    if not address:
+        return None, None
+    target_id = driver.handle if hasattr(driver, 'handle') else driver.current_window_handle
+    return address, target_id
+
+
+class AsyncCdpController:
+    """Drives every worker concurrently from one asyncio event loop
+    
+    The loop runs in a background thread; the monitor loop calls the
+    blocking wrappers, which fan out over all DevTools websockets at once.
+    Workers that could not be attached are served through Selenium in a
+    thread so they do not hold up the others.
+    """
+    
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.connections = {}  # worker index -> CdpConnection
+        self.drivers = {}  # worker index -> Selenium driver (fallback path)
+        self.crashed = set()  # worker indexes reported crashed/detached by CDP events
+        self.crashed_lock = threading.Lock()  # Events arrive on the loop thread, pop_crashed() runs on the monitor loop
+    
+    def _run(self, coroutine, timeout=None):
+        """Run a coroutine on the loop and wait for it; on a timeout it is cancelled there too"""
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+    
+    def _mark_crashed(self, index):
+        with self.crashed_lock:
+            self.crashed.add(index)
+    
+    def _close_quietly(self, connection):
+        try:
+            self._run(connection.close(), CDP_CALL_TIMEOUT)
+        except Exception:
+            pass
+    
+    def attach(self, index, driver):
+        """Connect to a worker's page target. Returns True on CDP, False on Selenium fallback"""
+        self.drivers[index] = driver
+        with self.crashed_lock:
+            self.crashed.discard(index)
+        old = self.connections.pop(index, None)
+        if old:
+            self._close_quietly(old)
+        try:
+            address, target_id = devtools_endpoint(driver)
+            if not address:
+                return False
+            with urllib.request.urlopen(f"http://{address}/json/list", timeout=5) as response:
+                targets = json.loads(response.read().decode('utf-8'))
+            ws_url = next(t['webSocketDebuggerUrl'] for t in targets
+                          if t.get('id') == target_id and 'webSocketDebuggerUrl' in t)
+            connection = CdpConnection(ws_url)
+            self._run(connection.connect(), CDP_CALL_TIMEOUT)
+            for event in ('Inspector.targetCrashed', 'Inspector.detached', '__closed__'):
+                connection.on(event, lambda params, i=index: self._mark_crashed(i))
+            self._run(connection.send('Inspector.enable'), CDP_CALL_TIMEOUT)
+            self.connections[index] = connection
+            return True
+        except Exception:
+            return False
+    
+    def detach(self, index):
+        connection = self.connections.pop(index, None)
+        self.drivers.pop(index, None)
+        if connection:
+            self._close_quietly(connection)
+    
+    async def _call(self, index, cdp_call, selenium_call, timeout=None):
+        """Run one operation for one worker; exceptions are returned, not raised
+        
+        The Selenium fallback gets the caller's deadline (default CDP_CALL_TIMEOUT),
+        so a slow operation like refresh_and_inject is not cut short on windows
+        without a DevTools websocket.
+        """
+        try:
+            connection = self.connections.get(index)
+            if connection is not None and not connection.closed:
+                return await cdp_call(connection)
+            driver = self.drivers[index]
+            return await asyncio.wait_for(
+                self.loop.run_in_executor(None, selenium_call, driver), timeout or CDP_CALL_TIMEOUT
+            )
+        except Exception as e:
+            return e
+    
+    def _gather(self, calls, timeout):
+        """Run {index: (cdp_call, selenium_call)} concurrently -> {index: result or Exception}
+        
+        Every call has its own deadline, so one slow window only fails its own
+        poll (and feeds its breaker). If the loop itself does not answer in
+        time the whole tick counts as failed for these windows instead of
+        raising into the monitor loop.
+        """
+        async def one(index, cdp_call, selenium_call):
+            try:
+                return await asyncio.wait_for(self._call(index, cdp_call, selenium_call, timeout), timeout)
+            except asyncio.TimeoutError:
+                return TimeoutError(f"no answer within {timeout}s")
+        
+        async def gather():
+            results = await asyncio.gather(*(one(i, *pair) for i, pair in calls.items()))
+            return dict(zip(calls, results))
+        try:
+            return self._run(gather(), timeout + CDP_CALL_TIMEOUT)
+        except FutureTimeoutError:
+            return {index: TimeoutError(f"CDP loop did not answer within {timeout}s") for index in calls}
+    
+    def poll_all(self, function_body, indexes=None):
+        """Evaluate a function body in every worker at once -> {index: value or Exception}"""
+        return self._gather({
+            i: (lambda connection: connection.evaluate(function_body),
+                lambda driver: driver.execute_script(function_body))
+            for i in (list(self.drivers) if indexes is None else list(indexes))
+        }, CDP_CALL_TIMEOUT)
+    
+    def poll_each(self, bodies):
+        """Evaluate a different function body per worker -> {index: value or Exception}"""
+        return self._gather({
+            i: (lambda connection, body=body: connection.evaluate(body),
+                lambda driver, body=body: driver.execute_script(body))
+            for i, body in bodies.items()
+        }, CDP_CALL_TIMEOUT)
+    
+    def inject(self, scripts):
+        """Inject {index: script} concurrently -> {index: True or Exception}"""
+        results = self._gather({
+            i: (lambda connection, script=script: connection.evaluate(script),
+                lambda driver, script=script: driver.execute_script(script))
+            for i, script in scripts.items()
+        }, CDP_CALL_TIMEOUT)
+        return {i: result if isinstance(result, Exception) else True for i, result in results.items()}
+    
+    def refresh_and_inject(self, scripts):
+        """Reload workers and re-inject {index: script} concurrently -> {index: True or Exception}"""
+        async def cdp_refresh(connection, script):
+            await connection.send('Page.reload', {'ignoreCache': False})
+            # The old document still has workerLogs until the new one has loaded
+            for _ in range(CDP_CALL_TIMEOUT * 4):
+                await asyncio.sleep(0.25)
+                try:
+                    if await connection.evaluate("return !window.workerLogs && document.readyState !== 'loading';"):
+                        break
+                except RuntimeError:
+                    continue  # Context destroyed mid-navigation
+            await connection.evaluate(script)
+            return True
+        
+        def selenium_refresh(driver, script):
+            driver.refresh()
+            driver.execute_script(script)
+            return True
+        
+        return self._gather({
+            i: (lambda connection, script=script: cdp_refresh(connection, script),
+                lambda driver, script=script: selenium_refresh(driver, script))
+            for i, script in scripts.items()
+        }, CDP_CALL_TIMEOUT * 4)
+    
+    def pop_crashed(self):
+        with self.crashed_lock:
+            crashed, self.crashed = self.crashed, set()
+        return crashed
+    
+    def close(self):
+        for index in list(self.connections):
+            self.detach(index)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+# ============================================================================
+# COMMAND LINE / SETTINGS
+# ============================================================================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Quinix worker controller")
+    parser.add_argument('--headless', action='store_true',
+                        help="no Tk window and no button clicks: JSON lines on stdout, exit with a summary "
+                             "(also runs the browsers headless unless HEADLESS is set explicitly)")
+    parser.add_argument('--config', metavar='FILE',
+                        help='JSON file overriding config constants, e.g. {"QUINYX_URL": "...", "FLEET_MODE": "contexts"}')
+    parser.add_argument('--set', action='append', default=[], metavar='NAME=VALUE',
+                        help="override one config constant (VALUE is JSON, or a plain string); may be repeated")
+    parser.add_argument('--max-runtime', type=float, metavar='MINUTES', help="stop after this many minutes")
+    parser.add_argument('--exit-when-done', action=argparse.BooleanOptionalAction, default=None,
+                        help="stop once every running worker has drained its list (default: on with --headless)")
+    parser.add_argument('--report', nargs='?', const=20, type=int, metavar='RUNS',
+                        help="print the last RUNS runs from RUN_HISTORY_DB with config changes and regressions, then exit")
+    parser.add_argument('--web', type=int, default=None, metavar='PORT',
+                        help="serve the live web dashboard on this port (overrides WEB_DASHBOARD_PORT)")
+    parser.add_argument('--progress-interval', type=float, default=None, metavar='SECONDS',
+                        help=f"seconds between headless progress records (default {HEADLESS_PROGRESS_INTERVAL})")
+    return parser.parse_args(argv)
+
+
+def load_settings(args):
+    """Config overrides from --config and --set (later wins) -> {NAME: value}"""
+    settings = {}
+    if args.config:
+        with open(args.config, 'r', encoding='utf-8') as f:
+            settings.update(json.load(f))
+    for item in args.set:
+        name, sep, value = item.partition('=')
+        if not sep:
+            raise ValueError(f"--set needs NAME=VALUE, got '{item}'")
+        try:
+            settings[name.strip()] = json.loads(value)
+        except json.JSONDecodeError:
+            settings[name.strip()] = value
+    if args.headless:
+        settings.setdefault('HEADLESS', True)
+    if args.web is not None:
+        settings['WEB_DASHBOARD_PORT'] = args.web
+    return settings
+
+
+# Constants whose default is None, and the type a value for them must have
+NULLABLE_SETTING_TYPES = {
+    'LEAN_LANDING_URL': str,
+    'BROWSER_BINARY': str,
+    'PROFILE_TMPFS': str,
+    'WEB_DASHBOARD_PORT': int,
+}
+
+
+def apply_settings(settings):
+    """Override the module-level config constants -> names that were changed
+    
+    Only existing UPPER_CASE constants can be set, and the value must have the
+    same type as the default (for None defaults the type in
+    NULLABLE_SETTING_TYPES). None is always accepted. Constants that are
+    derived from others at import time (e.g. GOLDEN_PROFILE_DIR) have to be
+    set themselves.
+    """
+    module = globals()
+    converted = {}
+    for name, value in settings.items():
+        if not name.isupper() or name not in module or callable(module[name]):
+            raise ValueError(f"unknown setting '{name}'")
+        current = module[name]
+        if isinstance(current, tuple) and isinstance(value, list):
+            value = tuple(value)
+        elif isinstance(current, re.Pattern) and isinstance(value, str):
+            value = re.compile(value, current.flags)
+        elif isinstance(current, float) and isinstance(value, int) and not isinstance(value, bool):
+            value = float(value)
+        expected = type(current) if current is not None else NULLABLE_SETTING_TYPES.get(name)
+        if expected is None:
+            raise ValueError(f"{name} has no known type - add it to NULLABLE_SETTING_TYPES")
+        if value is not None and type(value) is not expected:
+            raise ValueError(f"{name} must be {expected.__name__}, not {value!r}")
+        converted[name] = value
+    module.update(converted)
+    return sorted(converted)
+
+
+# ============================================================================
+# MAIN PROGRAM
+# ============================================================================
+
+def main(argv=None, console_factory=None):
+    """Run the controller -> exit code (0 = every worker drained its list)
+    
+    console_factory builds the frontend for interactive runs (the Tk
+    dashboard by default); --headless always uses HeadlessConsole.
+    """
+    args = parse_args(argv)
+    try:
+        applied = apply_settings(load_settings(args))
+    except (OSError, ValueError) as e:
+        print(f"Invalid configuration: {e}", file=sys.stderr)
+        return 2
+    if args.report:
+        history = RunHistory()
+        print(history.report(args.report))
+        history.close()
+        return 0
+    exit_when_done = args.headless if args.exit_when_done is None else args.exit_when_done
+    max_runtime = args.max_runtime * 60 if args.max_runtime else None
+    
+    if args.headless:
+        console = HeadlessConsole(progress_interval=args.progress_interval)
+    else:
+        if tk is None:
+            print("Tkinter is not available - run with --headless", file=sys.stderr)
+            return 2
+        if console_factory is None:
+            print("╔════════════════════════════════════════════════════════════════════════════════╗")
+            print("║   QUINIX-SYS :: DISTRIBUTED WORKER CONTROL TERMINAL v2.6.0        ║")
+            print("║   [CYBERPUNK EDITION] - MATRIX INTERFACE ACTIVE                   ║")
+            print("╚════════════════════════════════════════════════════════════════════════════════╝")
+            print()
+        console = (console_factory or DashboardConsole)()
+    
+    if isinstance(console, DashboardConsole):
+        console.add_log(">> TERMINAL INITIALIZED - 4 PANELS ACTIVE", log_type='success')
+        console.add_log(">> [PANEL-1] WORKER NODE STATUS MONITOR", log_type='system')
+        console.add_log(">> [PANEL2] TASK COMPLETION METRICS", log_type='system')
+        console.add_log(">> [PANEL-3] THROUGHPUT ANALYSIS GRAPH", log_type='system')
+        console.add_log(">> [PANEL-4] MISSION PROGRESS TRACKER", log_type='system')
+    if applied:
+        console.add_log(f"Config overrides: {', '.join(applied)}", log_type='system')
+    
+    # Web dashboard mirrors everything the console gets
+    web = None
+    if WEB_DASHBOARD_PORT:
+        try:
+            web = WebDashboard(WEB_DASHBOARD_PORT)
+            url = web.start()
+            console = TeeConsole(console, web)
+            console.add_log(f"🌐 Web dashboard: {url}", log_type='success')
+        except OSError as e:
+            web = None
+            console.add_log(f"Web dashboard could not start on port {WEB_DASHBOARD_PORT}: {e}", log_type='error')
+    
+    # ... and so does the log file
+    log_file = None
+    if LOG_FILE:
+        try:
+            log_file = LogFile()
+            console = TeeConsole(console, log_file)
+            console.add_log(f"📝 Logging to {os.path.abspath(LOG_FILE)}", log_type='system')
+        except OSError as e:
+            console.add_log(f"Log file {LOG_FILE} could not be opened: {e}", log_type='error')
+    console.update()
+    
+    # Load worker scripts (next to this file when not found in the working directory)
+    workers = []
+    for i, filename in enumerate(WORKER_FILES):
+        try:
+            script_path = Path(filename)
+            if not script_path.exists():
+                script_path = Path(__file__).parent / filename
+            if not script_path.exists():
+                console.add_log(f"ERROR: Worker script not found: {filename}", log_type='error')
+                continue
+            
+            with open(script_path, 'r', encoding='utf-8') as f:
+                script = f.read()
+            
+            worker_name = f"WORKER-{i+1}-{filename.replace('worker-', '').replace('.txt', '').replace('-', '').upper()}"
+            workers.append({'name': worker_name, 'script': script, 'base_script': script})
+            console.add_log(f"Loaded {filename}", worker_name, 'success')
+        except Exception as e:
+            console.add_log(f"ERROR loading {filename}: {e}", log_type='error')
+    
+    if len(workers) == 0:
+        console.add_log("FATAL: No worker scripts loaded!", log_type='error')
+        console.update()
+        if web is not None:
+            web.stop()
+        if log_file is not None:
+            log_file.close()
+        if console.interactive:
+            input("\nPress Enter to exit...")
+        return 1
+    
+    # Setup multiple drivers (one per window)
+    mode = "headless" if HEADLESS else "visible"
+    console.add_log(f"Setting up {len(workers)} separate {BROWSER_BACKEND} browsers ({mode})...", log_type='system')
+    console.add_log("Each browser gets its own profile (no conflicts!)", log_type='success')
+    if not HEADLESS:
+        console.add_log(f"Windows will be arranged in a {GRID_ROWS}x{GRID_COLUMNS} grid on your screen", log_type='success')
+    console.update()
+    
+    drivers = []
+    cdp_engine = None
+    poller = ConcurrentPoller()
+    log_drain = WorkerLogDrain()
+    workload = WorkloadIndex(WORKLOAD_INDEX_DB)
+    process_monitor = ProcessTreeMonitor()
+    profiles = ProfileManager()
+    sessions = SessionManager()
+    cloned_from_golden = False
+    shards = None
+    phases = PhaseStats()
+    history = RunHistory()
+    retries = RetryQueue()
+    live_config = LiveConfig()
+    throttle = ThrottleDetector()
+    parked_windows = set()  # Windows released by the endgame or by a drained, unsplittable shard
+    retired_windows = set()  # Parked windows whose browser the autoscaler closed completely
+    reattached = {}  # index -> driver of a browser that survived the last controller run
+    running = set()  # reattached windows whose worker script is still going
+    state = None
+    finished = {}  # worker index -> its loop ended with a 'drained' event
+    shard_top_keys = {}  # worker index -> keys of the top rows in its slice (overlap check)
+    stop_reason = 'stopped'
+    
+    try:
+        # Still-running browsers from the last run - pick them up instead of relaunching
+        if REATTACH_ON_START and FLEET_MODE == 'windows':
+            state = load_fleet_state()
+            reattached = reattach_fleet(state, process_monitor, console)
+            for i, driver in reattached.items():
+                if worker_running(driver):
+                    running.add(i)
+                    latest = get_worker_logs(driver)
+                    if latest and i < len(workers):
+                        console.update_worker_stats(i+1, latest.get('deleted', 0), latest.get('failed', 0),
+                                                    latest.get('unconfirmed', 0), latest.get('avgLatencyMs'))
+                        console.add_log(f"Resumed at {latest.get('deleted', 0)} denied", workers[i]['name'], 'success')
+            if reattached:
+                console.add_log(f"{len(reattached)} windows reattached, {len(running)} still running their worker", log_type='success')
+            console.update()
+        
+        # Date-range shards - each worker gets its own slice of the schedule
+        if DATE_SHARDING:
+            try:
+                shards = ShardPlanner()
+                shards.assign(len(workers))
+                if reattached and state.get('shards'):
+                    # Keep the slices the reattached windows are already working on
+                    shards.ranges = {
+                        int(i): (date.fromisoformat(start), date.fromisoformat(end))
+                        for i, (start, end) in state['shards'].items()
+                    }
+                for i, worker in enumerate(workers):
+                    worker['script'] = shards.script(i, worker['base_script'])
+                    console.add_log(f"Shard {shards.describe(i)}", worker['name'], 'system')
+            except (KeyError, ValueError) as e:
+                shards = None
+                console.add_log(f"Date sharding disabled - no start/end dates in QUINYX_URL ({e})", log_type='error')
+        
+        # Golden profile - every worker starts from the same logged-in, trimmed profile
+        if USE_GOLDEN_PROFILE:
+            if not profiles.has_golden() and not reattached:
+                bootstrap_golden_profile(profiles, console)
+            else:
+                freed = profiles.trim(profiles.golden_dir)
+                console.add_log(f"Golden profile trimmed ({freed:.1f}MB cache/history removed)", log_type='system')
+            # In contexts mode only profile 1 is ever opened
+            last_pids = {entry['index']: entry.get('browser_pid') for entry in (state or {}).get('workers', [])}
+            for i in range(len(workers) if FLEET_MODE == 'windows' else 1):
+                if i in reattached:
+                    continue  # Profile is in use by a running browser
+                size_before, size_after, seconds = profiles.clone(i+1, last_pids.get(i))
+                if i + 1 in relocated_profiles:
+                    console.add_log(
+                        f"Profile {i+1} is still held by a browser from the last run - "
+                        f"using {relocated_profiles[i+1]} instead", log_type='error'
+                    )
+                console.add_log(
+                    f"Profile {i+1} cloned from golden in {seconds:.2f}s "
+                    f"({size_before:.1f}MB -> {size_after:.1f}MB)", log_type='success'
+                )
+                console.update()
+            cloned_from_golden = True
+        
+        console.update()
+        console.add_log(f"Opening {len(workers)} separate browser windows...", log_type='system')
+        if not HEADLESS:
+            console.add_log(f"Arranging windows in {GRID_ROWS} rows x {GRID_COLUMNS} columns", log_type='system')
+        
+        if FLEET_BENCHMARK:
+            console.add_log(f">> BENCHMARKING FLEET MODES WITH {len(workers)} WORKERS...", log_type='system')
+            console.update()
+            bench = benchmark_fleet_modes(len(workers), sessions)
+            for mode_name, result in bench.items():
+                console.add_log(
+                    f"{mode_name:>8}: startup {result['seconds']:.1f}s, RSS {result['rss_mb']:.0f}MB, "
+                    f"{result['processes']} processes", log_type='success'
+                )
+            console.update()
+        
+        if FLEET_MODE == 'contexts':
+            # One browser, one isolated context per worker
+            console.add_log(f"Opening ONE browser with {len(workers)} isolated contexts...", log_type='system')
+            console.update()
+            try:
+                launch_started = time.time()
+                shared_browser, drivers[:] = launch_context_fleet(len(workers), sessions, shards)
+                console.add_log(f"{len(drivers)} contexts launched in {time.time() - launch_started:.1f}s", log_type='success')
+                pids = process_monitor.register(1, shared_browser)
+                console.add_log(f"Shared browser PID {pids['browser_pid']} (row 1 shows the whole fleet)", log_type='system')
+                for i in range(len(drivers)):
+                    console.update_worker_heartbeat(i+1, alive=True)
+            except Exception as e:
+                console.add_log(f"ERROR opening context fleet: {e}", log_type='error')
+        else:
+            # Open each window
+            for i, worker in enumerate(workers):
+                if i in reattached:
+                    drivers.append(reattached[i])
+                    console.update_worker_heartbeat(i+1, alive=True)
+                    continue
+                console.add_log(f"Opening window {i+1} for {worker['name']}...", log_type='system')
+                try:
+                    launch_started = time.time()
+                    driver = launch_worker_browser(i, shards=shards)
+                    drivers.append(driver)
+                    console.add_log(
+                        f"Window {i+1} launched in {time.time() - launch_started:.1f}s "
+                        f"(profile {dir_size_mb(get_profile_dir(i+1)):.1f}MB)", log_type='system'
+                    )
+                    pids = process_monitor.register(i+1, driver)
+                    console.add_log(f"Window {i+1} PIDs: browser {pids['browser_pid']}, driver {pids['driver_pid']}", log_type='system')
+                    console.add_log(f"Window {i+1} opened and positioned", log_type='success')
+                    console.update()
+                
+                    # Update heartbeat - window alive
+                    console.update_worker_heartbeat(i+1, alive=True)
+                
+                    if i < len(workers) - 1:
+                        console.add_log(f"Waiting 5 seconds before opening next window...", log_type='system')
+                        for _ in range(5):
+                            time.sleep(1)
+                            console.update()
+                        
+                except Exception as e:
+                    console.add_log(f"ERROR opening window {i+1}: {e}", log_type='error')
+                    console.update_worker_heartbeat(i+1, alive=False)
+        
+        console.update()
+        
+        if len(drivers) == 0:
+            console.add_log("FATAL: No windows opened successfully!", log_type='error')
+            console.update()
+            stop_reason = 'no windows'
+            return 1
+        
+        console.add_log(f"Successfully opened {len(drivers)} out of {len(workers)} windows", log_type='success')
+        if len(drivers) < len(workers):
+            console.add_log(f"⚠️ Warning: Only {len(drivers)} windows opened (expected {len(workers)})", log_type='error')
+        
+        # First time setup - login to all windows once (not needed with golden clones)
+        all_reattached = bool(reattached) and len(reattached) == len(drivers)
+        if all_reattached:
+            console.add_log("✅ Every window was reattached - sessions are still live", log_type='success')
+        elif cloned_from_golden:
+            console.add_log("✅ All profiles cloned from the golden profile - already logged in", log_type='success')
+        elif SHARE_SESSION:
+            login_first_window(console)
+        else:
+            login_all_windows(console)
+        console.update()
+        
+        # Share the login of window 1 with every other window (contexts always need it)
+        if (SHARE_SESSION or FLEET_MODE == 'contexts') and not all_reattached:
+            try:
+                session = sessions.capture(drivers[0])
+                console.add_log(f"🍪 Session exported from window 1 ({len(session['cookies'])} cookies)", log_type='success')
+                for i, driver in enumerate(drivers[1:], start=1):
+                    if (cloned_from_golden or i in reattached) and not SessionManager.is_logged_out(driver):
+                        continue
+                    sessions.apply(driver)
+                    driver.get(get_landing_url(i, shards))
+                    console.add_log(f"Session injected into window {i+1}", log_type='success')
+            except Exception as e:
+                console.add_log(f"Session sharing failed: {e}", log_type='error')
+            console.update()
+        
+        # Page profile per window (load time + renderer memory)
+        blocking = f"{len(BLOCKED_URL_PATTERNS)} patterns blocked" if BLOCK_RESOURCES else "no blocking"
+        console.add_log(f">> PAGE PROFILE ({blocking}, landing: {'lean' if LEAN_LANDING_URL else 'full month'})", log_type='system')
+        for i, driver in enumerate(drivers):
+            console.add_log(f"Window {i+1}: {format_page_profile(measure_page_profile(driver))}", log_type='system')
+        console.update()
+        
+        if PAGE_PROFILE_BENCHMARK and drivers:
+            console.add_log(">> BENCHMARKING PAGE PROFILE PER WINDOW (unblocked vs blocked)...", log_type='system')
+            console.update()
+            for i, driver in enumerate(drivers):
+                try:
+                    results = benchmark_page_profile(driver, get_landing_url(i, shards))
+                    console.add_log(f"Window {i+1} before: {format_page_profile(results['before'])}", log_type='system')
+                    console.add_log(f"Window {i+1} after:  {format_page_profile(results['after'])}", log_type='success')
+                    if not BLOCK_RESOURCES:
+                        # Benchmark left blocking on - remove it and reload the page unblocked
+                        apply_resource_blocking(driver, [])
+                        driver.get(get_landing_url(i, shards))
+                except Exception as e:
+                    console.add_log(f"Window {i+1}: page profile benchmark failed: {e}", log_type='error')
+                console.update()
+        
+        # Enable Start button and wait for user
+        console.add_log("All windows are ready!", log_type='success')
+        console.add_log("Click the START WORKERS button to begin", log_type='success')
+        console.enable_start_button()
+        console.update()
+        
+        if console.interactive:
+            print("\n✅ All windows opened and ready!")
+            print("➡️  Click the START WORKERS button in the dashboard to begin...")
+        
+        # Wait for user to click Start (a fully reattached fleet just carries on)
+        if all_reattached and len(running) == len(drivers):
+            console.add_log(">> Fleet reattached mid-run - resuming monitoring", log_type='success')
+        else:
+            console.wait_for_start()
+        
+        # Prevent computer from sleeping
+        console.add_log(">> ACTIVATING SLEEP PREVENTION...", log_type='system')
+        if prevent_sleep():
+            console.add_log(">> [OK] SLEEP MODE DISABLED - PC WILL STAY AWAKE", log_type='success')
+            console.set_sleep_prevention(True)
+        else:
+            console.add_log(">> [WARN] Could not disable sleep mode", log_type='error')
+        console.update()
+        
+        # Inject scripts into each window
+        console.add_log(">> INJECTING WORKER SCRIPTS INTO NODES...", log_type='system')
+        if CONTROLLER_BACKEND == 'cdp':
+            cdp_engine = AsyncCdpController()
+            for i, driver in enumerate(drivers):
+                attached = cdp_engine.attach(i, driver)
+                console.add_log(f"Window {i+1}: {'DevTools websocket attached' if attached else 'Selenium fallback'}",
+                                log_type='system')
+            results = cdp_engine.inject({
+                i: workers[i]['script'] for i in range(min(len(drivers), len(workers))) if i not in running
+            })
+            for i, result in results.items():
+                if result is True:
+                    console.add_log(f"Script injected successfully", workers[i]['name'], 'success')
+                else:
+                    console.add_log(f"Failed to inject script: {result}", workers[i]['name'], 'error')
+        else:
+            for i, driver in enumerate(drivers):
+                if i < len(workers) and i not in running:
+                    if inject_script(driver, workers[i]['script'], workers[i]['name']):
+                        console.add_log(f"Script injected successfully", workers[i]['name'], 'success')
+                    else:
+                        console.add_log(f"Failed to inject script", workers[i]['name'], 'error')
+                    time.sleep(1)
+        
+        save_fleet_state(drivers, process_monitor, shards)
+        run_id = history.begin(len(drivers), [worker['base_script'] for worker in workers], console.worker_stats)
+        console.add_log(f"📚 Recording as run #{run_id}", log_type='system')
+        console.add_log("=" * 80, log_type='success')
+        console.add_log(f"{len(drivers)} WORKERS STARTED! 🎉", log_type='success')
+        console.add_log("=" * 80, log_type='success')
+        console.add_log("Dashboard showing live stats from all workers!", log_type='success')
+        console.update()
+        
+        if console.interactive:
+            print("\n✅ Multi-panel dashboard is running!")
+            print(f"   {len(drivers)} browser windows with workers active")
+            print("   💓 Heartbeat monitor shows browser status")
+            print("   📊 Stats table shows completion progress")
+            print("   📈 Graph tracks completions per hour")
+            print("   🎯 Progress panel shows ETA and speed")
+            print("   Press Ctrl+C here to stop (workers continue in browser)")
+        
+        # Main monitoring loop
+        run_started = time.time()
         last_status_check = time.time()
         last_refresh = time.time()
         last_update = time.time()
+        last_resource_sample = 0
+        last_session_check = time.time()
+        last_memory_check = time.time()
+        memory_trimmer = MemoryTrimmer()
+        last_autoscale = time.time()
+        # Extra windows need a slice of their own, so only a sharded window fleet can grow past the scripts
+        can_grow = shards is not None and FLEET_MODE == 'windows'
+        autoscaler = Autoscaler(max(AUTOSCALE_MAX_WORKERS, len(drivers)) if can_grow else min(len(drivers), len(workers)))
+        scale_counters = WorkerCounters()
+        scale_counters.prime(console.worker_stats)
+        host_load = HostLoad()
+        host_load.sample()
+        memory_checks = 0
         worker_stats = {}
         cycle_count = 0
         
         console.update()
         
+        def restart_dead_worker(i):
+            """Relaunch window i+1 without touching any other browser"""
+            if FLEET_MODE == 'contexts':
+                restart_context_fleet()
+                return
+            console.add_log(f"♻️ Restarting window {i+1} (only its own process tree)...", workers[i]['name'], 'system')
+            console.update()
+            try:
+                drivers[i] = restart_worker(i, workers[i], process_monitor,
+                                            sessions=sessions if SHARE_SESSION else None, shards=shards)
+                poller.breaker(i).record_success()
+                log_drain.forget(i)
+                live_config.forget(i)
+                finished.pop(i, None)
+                history.restarts += 1
+                if cdp_engine is not None:
+                    cdp_engine.attach(i, drivers[i])
+                console.update_worker_heartbeat(i+1, alive=True)
+                console.add_log("Window restarted and script re-injected", workers[i]['name'], 'success')
+            except Exception as restart_error:
+                process_monitor.unregister(i+1)
+                console.add_log(f"Restart failed: {restart_error}", workers[i]['name'], 'error')
+        
+        def park_window(i, reason):
+            """Stop window i+1 and drop its page to free memory"""
+            try:
+                drivers[i].get(ENDGAME_PARK_URL)
+            except Exception as e:
+                console.add_log(f"Park failed: {e}", workers[i]['name'], 'error')
+                return
+            parked_windows.add(i)
+            workload.visible_rows.pop(i, None)
+            console.mark_worker_parked(i+1)
+            console.add_log(f"💤 Parked ({reason})", workers[i]['name'], 'system')
+        
+        def unpark_window(i, reason="backlog grew again"):
+            """Bring window i+1 back - relaunch its browser if the autoscaler closed it"""
+            try:
+                if i in retired_windows:
+                    drivers[i] = launch_worker_browser(i, sessions if SHARE_SESSION else None, shards)
+                    process_monitor.register(i+1, drivers[i])
+                    retired_windows.discard(i)
+                    poller.breaker(i).record_success()
+                    log_drain.forget(i)
+                    live_config.forget(i)
+                    throttle.forget(i)
+                    if cdp_engine is not None:
+                        cdp_engine.attach(i, drivers[i])
+                    time.sleep(10)
+                else:
+                    drivers[i].get(get_landing_url(i, shards))
+                    time.sleep(2)
+                inject_script(drivers[i], workers[i]['script'], workers[i]['name'])
+                parked_windows.discard(i)
+                finished.pop(i, None)
+                console.update_worker_heartbeat(i+1, alive=True)
+                console.add_log(f"▶️ Unparked - {reason}", workers[i]['name'], 'success')
+                return True
+            except Exception as e:
+                console.add_log(f"Unpark failed: {e}", workers[i]['name'], 'error')
+                return False
+        
+        def reload_shard(index):
+            workload.visible_rows.pop(index, None)
+            shard_top_keys.pop(index, None)
+            workers[index]['script'] = shards.script(index, workers[index]['base_script'])
+            try:
+                drivers[index].get(shards.url(index))
+                time.sleep(2)
+                inject_script(drivers[index], workers[index]['script'], workers[index]['name'])
+            except Exception as e:
+                console.add_log(f"Shard reload failed: {e}", workers[index]['name'], 'error')
+        
+        def add_worker(i, reason, throughput):
+            """Autoscaler: start window i+1 again (with sharding it takes half of the fullest slice)"""
+            if shards is not None:
+                donor = shards.rebalance(i, workload.visible_rows)
+                if donor is None:
+                    console.add_log("Scale-up skipped - no slice left to split", workers[i]['name'], 'system')
+                    return False
+                reload_shard(donor)
+                workers[i]['script'] = shards.script(i, workers[i]['base_script'])
+            console.add_log(f"📈 Scaling up: {reason}", workers[i]['name'], 'success')
+            if not unpark_window(i, "added by autoscaler"):
+                return False
+            autoscaler.added(throughput)
+            return True
+        
+        def grow_fleet(reason, throughput):
+            """Autoscaler: open one window more than the fleet has - the first script on half of the fullest slice"""
+            i = len(drivers)
+            worker = {'name': f"WORKER-{i+1}-EXTRA", 'base_script': workers[0]['base_script']}
+            donor = shards.rebalance(i, workload.visible_rows)
+            if donor is None:
+                console.add_log("Scale-up skipped - no slice left to split", worker['name'], 'system')
+                return False
+            reload_shard(donor)
+            worker['script'] = shards.script(i, worker['base_script'])
+            console.add_log(f"📈 Scaling up with a new window: {reason}", worker['name'], 'success')
+            try:
+                if USE_GOLDEN_PROFILE and profiles.has_golden():
+                    profiles.clone(i+1)
+                driver = launch_worker_browser(i, sessions if SHARE_SESSION else None, shards)
+            except Exception as e:
+                console.add_log(f"New window failed: {e}", worker['name'], 'error')
+                neighbour = shards.release(i)
+                if neighbour is not None:
+                    reload_shard(neighbour)
+                return False
+            drivers.append(driver)
+            workers.append(worker)
+            process_monitor.register(i+1, driver)
+            poller.breaker(i).record_success()
+            if cdp_engine is not None:
+                cdp_engine.attach(i, driver)
+            time.sleep(10)
+            if not inject_script(driver, worker['script'], worker['name']):
+                console.add_log("Script injection failed - the refresh cycle retries it", worker['name'], 'error')
+            console.update_worker_heartbeat(i+1, alive=True)
+            console.add_log(f"Shard {shards.describe(i)}", worker['name'], 'system')
+            save_fleet_state(drivers, process_monitor, shards, retired_windows)
+            autoscaler.added(throughput)
+            return True
+        
+        def retire_worker(i, reason):
+            """Autoscaler: stop window i+1 and free its resources (its slice goes to a neighbour)"""
+            console.add_log(f"📉 Scaling down: {reason}", workers[i]['name'], 'system')
+            if FLEET_MODE == 'windows':
+                if cdp_engine is not None:
+                    cdp_engine.detach(i)
+                process_monitor.kill(i+1)
+                retired_windows.add(i)
+                parked_windows.add(i)
+                workload.visible_rows.pop(i, None)
+                console.mark_worker_parked(i+1)
+            else:
+                park_window(i, "retired by autoscaler")
+            if shards is not None:
+                neighbour = shards.release(i)
+                if neighbour is not None:
+                    console.add_log(f"Takes over the retired slice: {shards.describe(neighbour)}", workers[neighbour]['name'], 'system')
+                    reload_shard(neighbour)
+        
+        def drop_sharding(clash):
+            """The panel ignores the date filter - clear every worker's shard marker
+            
+            selectRow then falls back to each worker's own list position, as
+            without sharding. Pages stay where they are: they show the full list anyway.
+            """
+            first, second, shared = clash
+            console.add_log(
+                f"⚠️ Windows {first+1} and {second+1} see the same requests at the top of their slices "
+                f"({len(shared)} shared) - the panel ignores the date filter. Date sharding disabled, "
+                f"workers fall back to their list positions", log_type='error'
+            )
+            for worker in workers:
+                worker['script'] = worker['base_script']
+            unshard = "window.__quinixShard = null; return true;"
+            targets = [i for i in range(min(len(drivers), len(workers))) if i not in retired_windows]
+            if cdp_engine is not None:
+                results = cdp_engine.poll_all(unshard, targets)
+            else:
+                results = poller.run({i: (lambda driver=drivers[i]: driver.execute_script(unshard)) for i in targets})
+            for i, result in sorted(results.items()):
+                if isinstance(result, Exception):
+                    console.add_log(f"Could not clear the shard marker ({result}) - it goes on the next reload",
+                                    workers[i]['name'], 'error')
+        
+        def rebalance_shard(i):
+            """Window i+1 drained its slice - hand it half of the fullest remaining slice"""
+            donor = shards.rebalance(i, workload.visible_rows)
+            if donor is None:
+                park_window(i, "slice drained, nothing left to split")
+                return
+            console.add_log(
+                f"⚖️ Rebalanced: takes {shards.describe(i)} from window {donor+1} "
+                f"(now {shards.describe(donor)})", workers[i]['name'], 'system'
+            )
+            # Donor first, so the two slices never overlap while both pages load
+            for index in (donor, i):
+                reload_shard(index)
+        
+        def restart_context_fleet():
+            """The shared browser died - every context goes with it"""
+            console.add_log("♻️ Shared browser is gone - relaunching the context fleet...", log_type='error')
+            console.update()
+            try:
+                process_monitor.kill(1)
+                shared_browser, drivers[:] = launch_context_fleet(len(workers), sessions, shards)
+                process_monitor.register(1, shared_browser)
+                time.sleep(10)
+                for i, driver in enumerate(drivers):
+                    if cdp_engine is not None:
+                        cdp_engine.attach(i, driver)
+                    inject_script(driver, workers[i]['script'], workers[i]['name'])
+                    console.update_worker_heartbeat(i+1, alive=True)
+                finished.clear()
+                history.restarts += 1
+                console.add_log("Context fleet relaunched and scripts re-injected", log_type='success')
+            except Exception as restart_error:
+                process_monitor.unregister(1)
+                console.add_log(f"Fleet restart failed: {restart_error}", log_type='error')
+        
         while True:
             now = time.time()
+            if max_runtime and now - run_started >= max_runtime:
+                console.add_log(f"⏱️ Max runtime of {max_runtime / 60:.0f} min reached", log_type='system')
+                stop_reason = 'max runtime'
+                break
             if now - last_update >= 2.0:
                 console.update()
                 last_update = now
                 cycle_count += 1
             
+            # Config changes from the dashboard - pushed with the next status poll
+            for index, text in console.take_config_requests():
+                try:
+                    patch = LiveConfig.parse(text)
+                    if index is not None and (index >= len(drivers) or index in retired_windows):
+                        raise ValueError(f"window {index + 1} is not running")
+                except ValueError as e:
+                    console.add_log(f"⚙️ Config not pushed: {e}", log_type='error')
+                    continue
+                change = live_config.set(patch, index, [i for i in range(len(drivers)) if i not in retired_windows])
+                before = f"{change['before']:.1f}/min" if change['before'] is not None else "not measured yet"
+                console.add_log(
+                    f"⚙️ Config v{change['version']} for {change['scope']}: {text} (throughput before: {before})",
+                    log_type='system'
+                )
+                console.update_config(live_config.describe())
+            
+            # Crash/detach events pushed by the CDP engine
+            if cdp_engine is not None:
+                for i in sorted(cdp_engine.pop_crashed()):
+                    if i < len(drivers):
+                        console.update_worker_heartbeat(i+1, alive=False)
+                        console.add_log(f"⚠️ DevTools reports window {i+1} crashed/detached", log_type='error')
+                        if AUTO_RESTART_DEAD_WORKERS and i < len(workers):
+                            restart_dead_worker(i)
+            
+            # CPU/RSS of each worker's process tree
+            if now - last_resource_sample >= RESOURCE_SAMPLE_INTERVAL:
+                samples = process_monitor.sample()
+                for worker_num, sample in samples.items():
+                    console.update_worker_resources(worker_num, sample['cpu'], sample['rss_mb'], sample['processes'])
+                # A registered worker without any live process has crashed
+                for worker_num in list(process_monitor.workers):
+                    if worker_num not in samples:
+                        console.update_worker_heartbeat(worker_num, alive=False)
+                        console.add_log(f"⚠️ Browser process tree of window {worker_num} is gone", log_type='error')
+                        if AUTO_RESTART_DEAD_WORKERS and worker_num - 1 < min(len(drivers), len(workers)):
+                            restart_dead_worker(worker_num - 1)
+                last_resource_sample = now
+            
             # Status check for all workers
             if now - last_status_check >= STATUS_CHECK_INTERVAL:
-                # Check all windows
-                for i, driver in enumerate(drivers):
+                # Poll all windows concurrently (CDP engine or thread pool), parked ones are skipped
+                poll_started = time.time()
+                if cdp_engine is not None:
+                    allowed = [i for i in poller.allowed(range(len(drivers))) if i not in retired_windows]
+                    poll_results = cdp_engine.poll_each({
+                        i: retries.script(i) + live_config.script(i) + log_drain.script(i) for i in allowed
+                    })
+                    for i in range(len(drivers)):
+                        poll_results.setdefault(i, CircuitOpen(f"window {i+1} parked"))
+                else:
+                    poll_results = poller.run({
+                        i: (lambda driver=driver, body=retries.script(i) + live_config.script(i) + log_drain.script(i):
+                            driver.execute_script(body))
+                        for i, driver in enumerate(drivers) if i not in retired_windows
+                    })
+                tripped = poller.record(poll_results)
+                parked = poller.parked()
+                drained = []
+                for i, result in poll_results.items():
+                    retries.ack(i, not isinstance(result, Exception))
+                    live_config.ack(i, not isinstance(result, Exception))
+                ok = sum(1 for result in poll_results.values() if not isinstance(result, Exception))
+                console.update_poll_cycle(time.time() - poll_started, ok, len(drivers) - len(retired_windows), len(parked))
+                
+                if log_drain.discovered:
+                    new_ids = workload.add(log_drain.discovered)
+                    log_drain.discovered.clear()
+                    if new_ids:
+                        console.add_log(
+                            f"🔎 Discovered {new_ids} new requests ({workload.known():,} known, "
+                            f"{workload.pending():,} pending)", log_type='system'
+                        )
+                
+                for i in range(len(drivers)):
+                    if i in retired_windows:
+                        continue
+                    log_data = poll_results.get(i)
+                    if isinstance(log_data, CircuitOpen):
+                        console.mark_worker_parked(i+1)
+                        continue
                     try:
-                        log_data = get_worker_logs(driver)
+                        if isinstance(log_data, Exception):
+                            raise log_data
+                        entries, dropped, reset = log_drain.consume(i, log_data)
+                        name = workers[i]['name'] if i < len(workers) else f"Window {i+1}"
+                        if reset:
+                            console.add_log("↺ Page reloaded - log cursor restarted", name, 'system')
+                            live_config.forget(i)
+                            finished.pop(i, None)
+                            shard_top_keys.pop(i, None)
+                        if dropped:
+                            console.add_log(
+                                f"⚠️ Log gap: {dropped} entries overwritten before they were read "
+                                f"({log_drain.lost[i]} lost in total)", name, 'error'
+                            )
+                        for entry in entries:
+                            event = entry.get('event')
+                            if event:
+                                phases.record(event)
+                                outcome = retries.record(i, event)
+                                if outcome == 'dead':
+                                    console.add_log(
+                                        f"☠️ Dead letter after {retries.dead[event['key']]['attempts']} attempts "
+                                        f"({event.get('reason')}): {event['key'][:60]}", name, 'error'
+                                    )
+                            if event and event.get('type') != 'config':
+                                finished[i] = event.get('type') == 'drained'
+                            if event and event.get('type') == 'denied':
+                                workload.mark_handled(event.get('url'), name)
+                                if event.get('latencyMs') is not None:
+                                    console.record_latency(i + 1, event['latencyMs'])
+                            if entry.get('visibleRows') is not None:
+                                workload.visible_rows[i] = entry['visibleRows']
+                            if shards is not None and entry.get('topKeys'):
+                                shard_top_keys[i] = entry['topKeys']
+                            if event and event.get('type') == 'config':
+                                if event.get('rejected'):
+                                    console.add_log(f"⚙️ Config v{event.get('version')} rejected: {event['rejected']}", name, 'error')
+                                else:
+                                    console.add_log(f"⚙️ Config v{event.get('version')} active", name, 'success')
+                            elif event and event.get('type') == 'drained':
+                                console.add_log("✓ Slice drained", name, 'success')
+                                if shards is not None and i < len(workers):
+                                    drained.append(i)
+                            elif event and event.get('type') != 'denied':
+                                detail = event.get('reason') or (f"HTTP {event['status']}" if event.get('status') else '')
+                                console.add_log(f"✗ Row {event.get('row', 0) + 1} {event['type']} {detail}".rstrip(), name, 'error')
+                        if log_data is not None and not entries:
+                            # Nothing new since the last cursor, but the page answered
+                            console.update_worker_heartbeat(i + 1, alive=True)
+                        log_data = entries[-1] if entries else None
                         if log_data:
                             worker_num = i + 1
                             
@@ -1015,42 +5347,271 @@ def main():
                             console.update_worker_stats(
                                 worker_num,
                                 log_data.get('deleted', 0),
-                                log_data.get('failed', 0)
+                                log_data.get('failed', 0),
+                                log_data.get('unconfirmed', 0),
+                                log_data.get('avgLatencyMs')
+                            )
+                            live_config.sample(i, log_data.get('deleted', 0))
+                            console.update_pipeline(worker_num, log_data.get('pipeline'))
+                            console.update_worker_dom(
+                                worker_num, log_data.get('itemCostMs'), log_data.get('itemNodes'), log_data.get('visibleRows')
                             )
                             
+                            lag = log_data.get('lag')
+                            throttled, action = throttle.check(i, lag)
+                            console.update_worker_lag(worker_num, lag, throttled)
+                            if action:
+                                console.add_log(
+                                    f"🐢 Throttled (p95 lag {lag['p95LagMs']}ms, hidden {lag.get('hiddenMs', 0) / 1000:.0f}s, "
+                                    f"{lag.get('longTasks', 0)} long tasks) -> {action}", name, 'error'
+                                )
+                                if action == 'focus':
+                                    restore_window(drivers[i])
+                                    enable_focus_emulation(drivers[i])
+                                elif action == 'restart' and i < len(workers):
+                                    throttle.forget(i)
+                                    restart_dead_worker(i)
+                            
                             key = log_data['worker']
-                            if key not in worker_stats or worker_stats[key] != (log_data['deleted'], log_data['failed']):
-                                worker_stats[key] = (log_data['deleted'], log_data['failed'])
+                            counts = (log_data['deleted'], log_data['failed'], log_data.get('unconfirmed', 0))
+                            if key not in worker_stats or worker_stats[key] != counts:
+                                worker_stats[key] = counts
+                                latency = log_data.get('avgLatencyMs')
                                 console.add_log(
-                                    f"✓ {log_data['deleted']} denied, {log_data['failed']} failed",
+                                    f"✓ {counts[0]} denied, {counts[1]} failed, {counts[2]} unconfirmed"
+                                    + (f" (avg {latency}ms server-confirmed)" if latency is not None else ""),
                                     log_data['worker'],
                                     'success'
                                 )
                     except Exception as e:
-                        # Worker might be dead
+                        # Worker might be dead - park it once the breaker trips
                         console.update_worker_heartbeat(i+1, alive=False)
                         console.add_log(f"⚠️ Error checking window {i+1}: {e}", log_type='error')
+                        if i in tripped:
+                            console.mark_worker_parked(i+1)
+                            console.add_log(
+                                f"⛔ Window {i+1} parked for {BREAKER_COOLDOWN}s after "
+                                f"{poller.breaker(i).failures} failed polls", log_type='error'
+                            )
+                            # A failed trial after the cooldown means it will not recover by itself
+                            if poller.breaker(i).failures > BREAKER_FAILURE_THRESHOLD and AUTO_RESTART_DEAD_WORKERS and i < len(workers):
+                                restart_dead_worker(i)
+                
+                # Disjoint slices only hold if the panel honours the date filter - check it did
+                if shards is not None:
+                    clash = ShardPlanner.overlap(shard_top_keys)
+                    if clash:
+                        drop_sharding(clash)
+                        shards = None
+                        shard_top_keys.clear()
+                        drained = []
+                
+                for i in drained:
+                    rebalance_shard(i)
+                    finished.pop(i, None)  # Reloaded with a new slice, or parked
                 
+                console.update_failure_classes(retries.by_reason, len(retries.items), len(retries.dead))
+                
+                for change in live_config.settle():
+                    console.add_log(f"⚙️ {LiveConfig.format_change(change)}", log_type='success')
+                
+                remaining, source = workload.remaining()
+                if remaining is not None:
+                    console.set_workload(remaining, source)
+                history.sample(console.worker_stats)
+                
+                # Endgame - collapse onto fewer workers (shards never collide, so they only park when drained)
+                if shards is None and remaining is not None and ENDGAME_THRESHOLD:
+                    count = min(len(drivers), len(workers))
+                    if phases.phase == 'bulk' and remaining <= ENDGAME_THRESHOLD:
+                        phases.switch('endgame')
+                        console.add_log(f"🏁 ENDGAME: {remaining} rows left - collapsing onto fewer workers", log_type='system')
+                        for line in phases.report():
+                            console.add_log(f"   {line}", log_type='system')
+                    elif phases.phase == 'endgame' and remaining > 2 * ENDGAME_THRESHOLD:
+                        phases.switch('bulk')
+                        console.add_log(f"Backlog grew to {remaining} rows - leaving endgame", log_type='system')
+                    active = endgame_active_workers(remaining, count) if phases.phase == 'endgame' else set(range(count))
+                    for i in range(count):
+                        if i not in active and i not in parked_windows:
+                            park_window(i, f"endgame, {remaining} rows left")
+                        elif i in active and i in parked_windows:
+                            unpark_window(i)
+                
+                save_fleet_state(drivers, process_monitor, shards, retired_windows)
                 last_status_check = now
-            
-            # Refresh all windows periodically
-            if now - last_refresh >= REFRESH_INTERVAL:
-                console.add_log("🔄 REFRESHING ALL WINDOWS to keep them active...", log_type='system')
                 
-                for i, driver in enumerate(drivers):
-                    try:
-                        driver.refresh()
-                        worker_name = workers[i]['name'] if i < len(workers) else f"Worker {i+1}"
-                        console.add_log(f"Window {i+1} refreshed", worker_name, 'success')
+                # Unattended runs end once every window that is still working has drained its list
+                if exit_when_done:
+                    count = min(len(drivers), len(workers))
+                    if all(finished.get(i) for i in range(count) if i not in parked_windows and i not in retired_windows):
+                        console.add_log("🏁 Every worker has drained its list", log_type='success')
+                        stop_reason = 'done'
+                        break
+            
+            # Session expiry - re-spread fresh credentials from a window that is still logged in
+            # (every driver call runs in the poller with its own deadline, parked breakers are skipped)
+            if SHARE_SESSION and now - last_session_check >= SESSION_CHECK_INTERVAL:
+                def restore_session(i, reload):
+                    sessions.apply(drivers[i])  # Healthy windows only get fresh cookies, no reload needed
+                    if reload:
+                        drivers[i].get(get_landing_url(i, shards))
                         time.sleep(1)
-                        
                         if i < len(workers):
-                            inject_script(driver, workers[i]['script'], worker_name)
-                            console.add_log(f"Script re-injected after refresh", worker_name, 'success')
-                    except Exception as e:
-                        console.add_log(f"Refresh error: {e}", f"Window {i+1}", 'error')
+                            inject_script(drivers[i], workers[i]['script'], workers[i]['name'])
+                    return True
+                
+                try:
+                    live = [i for i in range(len(drivers)) if i not in retired_windows]
+                    checks = poller.run({
+                        i: (lambda driver=drivers[i]: SessionManager.is_logged_out(driver)) for i in live
+                    }, timeout=POLL_TIMEOUT)
+                    poller.record(checks)
+                    logged_out = [i for i, result in sorted(checks.items()) if result is True]
+                    healthy = [i for i, result in sorted(checks.items()) if result is False]
+                    for i, result in sorted(checks.items()):
+                        if isinstance(result, Exception) and not isinstance(result, CircuitOpen):
+                            worker_name = workers[i]['name'] if i < len(workers) else f"Worker {i+1}"
+                            console.add_log(f"Session check error: {result}", worker_name, 'error')
+                    if logged_out and not healthy:
+                        console.add_log("🔑 Session expired in ALL windows - log in again in window 1", log_type='error')
+                    elif healthy:
+                        source = healthy[0]
+                        captured = poller.run({source: lambda driver=drivers[source]: sessions.capture(driver)},
+                                              timeout=POLL_TIMEOUT)
+                        poller.record(captured)
+                        if isinstance(captured[source], Exception):
+                            console.add_log(f"Session capture from window {source+1} failed: {captured[source]}", log_type='error')
+                        else:
+                            for i in logged_out:
+                                worker_name = workers[i]['name'] if i < len(workers) else f"Worker {i+1}"
+                                console.add_log(f"🔑 Session expired - re-injecting session from window {source+1}", worker_name, 'system')
+                            results = poller.run({
+                                i: (lambda i=i: restore_session(i, i in logged_out)) for i in healthy[1:] + logged_out
+                            }, timeout=POLL_TIMEOUT * 3)
+                            poller.record(results)
+                            for i, result in sorted(results.items()):
+                                if isinstance(result, Exception) and not isinstance(result, CircuitOpen):
+                                    worker_name = workers[i]['name'] if i < len(workers) else f"Worker {i+1}"
+                                    console.add_log(f"Session restore failed: {result}", worker_name, 'error')
+                except Exception as e:
+                    console.add_log(f"Session check error: {e}", log_type='error')
+                last_session_check = now
+            
+            # Autoscaling - grow or shrink the fleet from measured throughput and headroom
+            if AUTOSCALE and now - last_autoscale >= AUTOSCALE_INTERVAL:
+                count = min(len(drivers), len(workers))
+                active = [i for i in range(count) if i not in parked_windows]
+                server_errors = retries.by_reason.get('SERVER_ERROR', 0) + retries.by_reason.get('NO_RESPONSE', 0)
+                cpu, free_mb = host_load.sample()
+                if phases.phase == 'endgame':
+                    decision, reason, throughput = 'hold', "endgame decides the fleet size", None
+                else:
+                    deltas = scale_counters.update(console.worker_stats).values()
+                    processed = sum(denied for denied, _ in deltas)
+                    clicks = sum(handled for _, handled in deltas)
+                    decision, reason, throughput = autoscaler.evaluate(len(active), processed, clicks, server_errors, cpu, free_mb)
+                console.add_log(f"⚖️ Autoscale: {decision} - {reason}", log_type='system')
+                if decision == 'add':
+                    candidates = sorted(i for i in range(count) if i in parked_windows)
+                    if candidates:
+                        add_worker(candidates[0], reason, throughput)
+                    elif can_grow:
+                        grow_fleet(reason, throughput)
+                elif decision == 'retire':
+                    candidates = [i for i in active if i != 0]
+                    if candidates:
+                        retire_worker(max(candidates), reason)
+                last_autoscale = now
+            
+            # Memory per worker - trim in place, reload only as the last resort
+            # (all windows at once, each with its own deadline; parked breakers are skipped)
+            if now - last_memory_check >= MEMORY_CHECK_INTERVAL:
+                results = poller.run({
+                    i: (lambda i=i, driver=driver: memory_trimmer.check(i+1, driver))
+                    for i, driver in enumerate(drivers) if i not in parked_windows
+                }, timeout=POLL_TIMEOUT)
+                poller.record(results)
+                reloads = {}
+                for i, result in sorted(results.items()):
+                    worker_name = workers[i]['name'] if i < len(workers) else f"Worker {i+1}"
+                    if isinstance(result, CircuitOpen):
+                        continue
+                    if isinstance(result, Exception):
+                        console.add_log(f"Memory check error: {result}", worker_name, 'error')
+                        continue
+                    metrics, action = result
+                    console.update_worker_memory(i+1, metrics['heap_mb'], metrics['nodes'])
+                    if action is None:
+                        continue
+                    console.add_log(
+                        f"🧹 Heap {metrics['heap_mb']:.0f}MB / {metrics['nodes']:,} nodes "
+                        f"({memory_trimmer.trend(i+1):+.0f}MB over window) -> {action}",
+                        worker_name, 'system'
+                    )
+                    if action == 'reload' and i < len(workers):
+                        reloads[i] = workers[i]['script']
+                if reloads:
+                    if cdp_engine is not None:
+                        reloaded = cdp_engine.refresh_and_inject(reloads)
+                    else:
+                        def reload_page(driver, script):
+                            driver.refresh()
+                            time.sleep(1)
+                            driver.execute_script(script)
+                            return True
+                        
+                        reloaded = poller.run({
+                            i: (lambda driver=drivers[i], script=script: reload_page(driver, script))
+                            for i, script in reloads.items()
+                        }, timeout=POLL_TIMEOUT * 3)
+                    poller.record(reloaded)
+                    for i, result in sorted(reloaded.items()):
+                        if result is True:
+                            console.add_log("Script re-injected after memory reload", workers[i]['name'], 'success')
+                        else:
+                            console.add_log(f"Memory reload failed: {result}", workers[i]['name'], 'error')
+                memory_checks += 1
+                if memory_checks % 10 == 0:
+                    console.add_log("📈 Memory over time: " + ", ".join(
+                        f"W{num} {history[-1][1]:.0f}MB ({memory_trimmer.trend(num):+.0f})"
+                        for num, history in sorted(memory_trimmer.history.items()) if history
+                    ), log_type='system')
+                last_memory_check = now
+            
+            # Refresh all windows periodically (legacy keep-alive, off by default)
+            if PERIODIC_REFRESH and now - last_refresh >= REFRESH_INTERVAL and cdp_engine is not None:
+                console.add_log("🔄 REFRESHING ALL WINDOWS concurrently...", log_type='system')
+                results = cdp_engine.refresh_and_inject(
+                    {i: workers[i]['script'] for i in range(min(len(drivers), len(workers))) if i not in parked_windows}
+                )
+                for i, result in results.items():
+                    if result is True:
+                        console.add_log("Window refreshed and script re-injected", workers[i]['name'], 'success')
+                    else:
+                        console.add_log(f"Refresh error: {result}", workers[i]['name'], 'error')
                         console.update_worker_heartbeat(i+1, alive=False)
+                last_refresh = now
+            elif PERIODIC_REFRESH and now - last_refresh >= REFRESH_INTERVAL:
+                console.add_log("🔄 REFRESHING ALL WINDOWS to keep them active...", log_type='system')
+                
+                def refresh_and_inject(driver, worker):
+                    driver.refresh()
                     time.sleep(1)
+                    inject_script(driver, worker['script'], worker['name'])
+                    return True
+                
+                results = poller.run({
+                    i: (lambda driver=drivers[i], worker=workers[i]: refresh_and_inject(driver, worker))
+                    for i in range(min(len(drivers), len(workers))) if i not in parked_windows
+                }, timeout=POLL_TIMEOUT * 3)
+                poller.record(results)
+                for i, result in sorted(results.items()):
+                    if result is True:
+                        console.add_log("Window refreshed and script re-injected", workers[i]['name'], 'success')
+                    else:
+                        console.add_log(f"Refresh error: {result}", workers[i]['name'], 'error')
+                        console.update_worker_heartbeat(i+1, alive=False)
                 
                 console.add_log("✅ All windows refreshed and scripts re-injected", log_type='success')
                 last_refresh = now
@@ -1061,8 +5622,42 @@ def main():
         console.add_log("\n⏸️  Monitoring stopped by user", log_type='system')
         console.add_log("Workers are still running in browser windows!", log_type='system')
         console.update()
+        stop_reason = 'interrupted'
+    
+    except LoginRequired as e:
+        console.add_log(f"FATAL: {e}", log_type='error')
+        stop_reason = 'login required'
         
     finally:
+        poller.shutdown()
+        summary = console.progress()
+        summary.update(
+            reason=stop_reason,
+            windows=len(drivers),
+            dead_letters=len(retries.dead),
+            retries_pending=len(retries.items),
+            failure_reasons=dict(retries.by_reason),
+            remaining=workload.remaining()[0],
+        )
+        workload.close()
+        history.finish(summary, phases)
+        history.close()
+        for line in phases.report():
+            console.add_log(f"📊 Phase {line}", log_type='system')
+        if cdp_engine is not None:
+            try:
+                cdp_engine.close()
+            except Exception:
+                pass
+        if CLOSE_BROWSERS_ON_EXIT:
+            for worker_num in list(process_monitor.workers):
+                process_monitor.kill(worker_num)
+            # Nothing left to reattach to
+            try:
+                os.remove(STATE_FILE)
+            except OSError:
+                pass
+        
         # Re-enable sleep mode
         allow_sleep()
         try:
@@ -1084,9 +5679,20 @@ def main():
             print("║ >> SLEEP MODE RE-ENABLED" + " " * 52 + "║")
             print("║ >> [!] Browser windows still open with active workers" + " " * 23 + "║")
             print("╚" + "═" * 78 + "╝")
-        input("\n>> Press Enter to exit...")
+        console.finish(summary)
+        console.update()
+        if web is not None:
+            web.stop()
+        if log_file is not None:
+            log_file.close()
+        if console.interactive:
+            input("\n>> Press Enter to exit...")
+    
+    if stop_reason == 'done':
+        return 0
+    return 1 if stop_reason == 'login required' else 3
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
 
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The controller is a flat script next to this folder, not an installed package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,92 @@
+import pytest
+
+pytest.importorskip("selenium")
+
+import quinix_dashboard as qd
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(qd.time, 'time', lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def scaler(clock):
+    scaler = qd.Autoscaler(max_workers=4, min_workers=1)
+    assert scaler.evaluate(2, 0, 0, 0)[0] == 'hold'  # Baseline
+    return scaler
+
+
+def step(scaler, clock, active, processed, clicks=None, server_errors=0, cpu=None, free_mb=None):
+    clock[0] += 60
+    return scaler.evaluate(active, processed, processed if clicks is None else clicks,
+                           server_errors, cpu, free_mb)
+
+
+def test_adds_while_there_is_headroom(scaler, clock):
+    decision, _, throughput = step(scaler, clock, 2, 100, cpu=20, free_mb=8000)
+    assert decision == 'add'
+    assert throughput == 100
+
+
+def add(scaler, clock, active, processed):
+    """An 'add' decision whose worker really joined"""
+    decision, _, throughput = step(scaler, clock, active, processed)
+    assert decision == 'add'
+    scaler.added(throughput)
+
+
+def test_keeps_an_added_worker_that_raised_throughput(scaler, clock):
+    add(scaler, clock, 2, 100)
+    assert step(scaler, clock, 3, 140)[0] == 'add'
+
+
+def test_retires_on_host_pressure_and_server_errors(scaler, clock):
+    assert step(scaler, clock, 2, 100, cpu=95)[0] == 'retire'
+    assert step(scaler, clock, 2, 100, free_mb=100)[0] == 'retire'
+    assert step(scaler, clock, 2, 100, clicks=100, server_errors=20)[0] == 'retire'
+
+
+def test_no_gain_retires_and_holds_the_ceiling(scaler, clock):
+    add(scaler, clock, 2, 100)
+    decision, reason, _ = step(scaler, clock, 3, 102)
+    assert decision == 'retire'
+    assert "capping at 2" in reason
+    assert step(scaler, clock, 2, 100)[0] == 'hold'  # Ceiling
+    clock[0] += qd.AUTOSCALE_CEILING_TTL
+    assert step(scaler, clock, 2, 100)[0] == 'add'
+
+
+def test_relaunched_worker_with_zeroed_counters_is_kept(scaler, clock):
+    """Window 3 comes back from a retire with its page counters at 0"""
+    counters = qd.WorkerCounters()
+    stats = {n: {'deleted': 1000, 'failed': 0, 'unconfirmed': 0} for n in (1, 2, 3)}
+    counters.prime(stats)
+    
+    def evaluate(active):
+        deltas = counters.update(stats).values()
+        processed = sum(denied for denied, _ in deltas)
+        return step(scaler, clock, active, processed, sum(handled for _, handled in deltas))
+    
+    stats[1]['deleted'] += 50
+    stats[2]['deleted'] += 50
+    decision, _, throughput = evaluate(2)
+    assert decision == 'add'
+    scaler.added(throughput)
+    stats[1]['deleted'] += 50
+    stats[2]['deleted'] += 50
+    stats[3]['deleted'] = 45  # Relaunched: old 1000 is gone, 45 new rows since
+    decision, _, throughput = evaluate(3)
+    assert throughput == 145
+    assert decision == 'add'
+    assert scaler.ceiling == 4
+
+
+def test_skipped_add_is_not_judged_as_a_worker_without_gain(scaler, clock):
+    """The add was skipped (no slice left, no candidate, failed unpark) - the fleet did not change"""
+    assert step(scaler, clock, 2, 100)[0] == 'add'
+    decision, _, _ = step(scaler, clock, 2, 100)
+    assert decision == 'add'
+    assert scaler.ceiling == 4
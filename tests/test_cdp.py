@@ -0,0 +1,349 @@
+import asyncio
+import json
+import re
+import time
+
+import pytest
+
+pytest.importorskip("selenium")
+
+import quinix_dashboard as qd
+
+
+class FakeConnection:
+    closed = False
+    
+    def __init__(self, delay, value=None):
+        self.delay = delay
+        self.value = value
+        self.cancelled = False
+    
+    async def evaluate(self, body):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return self.value
+    
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def controller(monkeypatch):
+    monkeypatch.setattr(qd, 'CDP_CALL_TIMEOUT', 0.2)
+    controller = qd.AsyncCdpController()
+    yield controller
+    controller.close()
+
+
+def test_slow_window_fails_only_its_own_poll(controller):
+    slow = FakeConnection(delay=30)
+    controller.connections = {0: FakeConnection(0, value={'logs': []}), 1: slow}
+    started = time.time()
+    results = controller.poll_each({0: "return 1;", 1: "return 1;"})
+    assert time.time() - started < 2
+    assert results[0] == {'logs': []}
+    assert isinstance(results[1], TimeoutError)
+    time.sleep(0.05)
+    assert slow.cancelled
+
+
+def test_timed_out_poll_feeds_the_breaker(controller, monkeypatch):
+    monkeypatch.setattr(qd, 'BREAKER_FAILURE_THRESHOLD', 2)
+    controller.connections = {0: FakeConnection(delay=30)}
+    poller = qd.ConcurrentPoller(max_workers=1)
+    tripped = []
+    for _ in range(2):
+        tripped += poller.record(controller.poll_each({0: "return 1;"}))
+    assert tripped == [0]
+    assert poller.allowed([0]) == []
+    poller.shutdown()
+
+
+class SlowDriver:
+    def __init__(self, delay):
+        self.delay = delay
+        self.scripts = []
+    
+    def refresh(self):
+        time.sleep(self.delay)
+    
+    def execute_script(self, script):
+        self.scripts.append(script)
+
+
+def test_selenium_fallback_gets_the_callers_deadline(controller):
+    # No websocket: the reload takes longer than CDP_CALL_TIMEOUT but fits refresh_and_inject's budget
+    driver = SlowDriver(delay=0.4)
+    controller.drivers = {0: driver}
+    controller.connections = {}
+    assert controller.refresh_and_inject({0: "worker();"}) == {0: True}
+    assert driver.scripts == ["worker();"]
+
+
+def test_crash_events_from_the_loop_are_not_lost(controller):
+    for i in range(50):
+        controller.loop.call_soon_threadsafe(controller._mark_crashed, i)
+    seen = set()
+    deadline = time.time() + 2
+    while len(seen) < 50 and time.time() < deadline:
+        seen |= controller.pop_crashed()
+    assert seen == set(range(50))
+
+
+# ---- CdpConnection websocket framing against a local server ----
+
+def server_frame(payload, opcode=0x1, fin=True):
+    """Unmasked server->client frame"""
+    header = bytearray([(0x80 if fin else 0) | opcode])
+    if len(payload) < 126:
+        header.append(len(payload))
+    elif len(payload) < 65536:
+        header += bytes([126]) + qd.struct.pack('>H', len(payload))
+    else:
+        header += bytes([127]) + qd.struct.pack('>Q', len(payload))
+    return bytes(header) + payload
+
+
+async def read_client_frame(reader):
+    """Read one client frame, asserting it is masked; returns (fin, opcode, payload, wire_length_code)"""
+    first, second = await reader.readexactly(2)
+    assert second & 0x80, "client frames must be masked"
+    code = length = second & 0x7F
+    if length == 126:
+        length = qd.struct.unpack('>H', await reader.readexactly(2))[0]
+    elif length == 127:
+        length = qd.struct.unpack('>Q', await reader.readexactly(8))[0]
+    mask = await reader.readexactly(4)
+    payload = qd.CdpConnection.apply_mask(await reader.readexactly(length), mask)
+    return bool(first & 0x80), first & 0x0F, payload, code
+
+
+def run_with_server(handler, client_body, status="101 Switching Protocols", accept=None):
+    """Start a fake DevTools websocket server, run handler(reader, writer) for the
+    connection and client_body(connection) against it"""
+    async def main():
+        async def serve(reader, writer):
+            request = await reader.readuntil(b"\r\n\r\n")
+            key = re.search(rb"Sec-WebSocket-Key: (\S+)", request).group(1).decode()
+            expected = qd.base64.b64encode(qd.hashlib.sha1((key + qd.CdpConnection.WEBSOCKET_GUID).encode()).digest()).decode()
+            writer.write((
+                f"HTTP/1.1 {status}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {accept or expected}\r\n\r\n").encode())
+            await writer.drain()
+            try:
+                await handler(reader, writer)
+            finally:
+                writer.close()
+        
+        server = await asyncio.start_server(serve, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        connection = qd.CdpConnection(f"ws://127.0.0.1:{port}/devtools/page/1")
+        try:
+            await connection.connect()
+            return await asyncio.wait_for(client_body(connection), 5)
+        finally:
+            await connection.close()
+            server.close()
+            await server.wait_closed()
+    return asyncio.run(main())
+
+
+async def idle(reader, writer):
+    await asyncio.sleep(5)
+
+
+def test_apply_mask_round_trips():
+    payload = bytes(range(256)) * 3 + b'\x00\x01'
+    mask = b'\x12\x34\x56\x78'
+    masked = qd.CdpConnection.apply_mask(payload, mask)
+    assert masked == bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    assert qd.CdpConnection.apply_mask(masked, mask) == payload
+    assert qd.CdpConnection.apply_mask(b'', mask) == b''
+
+
+def test_handshake_rejects_non_101_status():
+    with pytest.raises(ConnectionError, match="handshake failed"):
+        run_with_server(idle, lambda connection: asyncio.sleep(0), status="403 Forbidden")
+
+
+def test_handshake_rejects_wrong_accept_key():
+    with pytest.raises(ConnectionError, match="Sec-WebSocket-Accept"):
+        run_with_server(idle, lambda connection: asyncio.sleep(0), accept="bm90LXRoZS1yaWdodC1rZXk=")
+
+
+def padded_message(message_id, size):
+    """JSON CDP reply of exactly `size` bytes"""
+    base = json.dumps({'id': message_id, 'result': {'pad': ''}}).encode()
+    return json.dumps({'id': message_id, 'result': {'pad': 'p' * (size - len(base))}}).encode()
+
+
+@pytest.mark.parametrize("size,length_code", [(125, 125), (126, 126), (65535, 126), (65536, 127), (200000, 127)])
+def test_frame_lengths_round_trip_in_both_directions(size, length_code):
+    seen = {}
+    
+    async def handler(reader, writer):
+        fin, opcode, payload, code = await read_client_frame(reader)
+        seen.update(fin=fin, opcode=opcode, code=code, size=len(payload), payload=payload)
+        _, _, request, _ = await read_client_frame(reader)
+        writer.write(server_frame(padded_message(json.loads(request)['id'], size)))
+        await writer.drain()
+        await asyncio.sleep(5)
+    
+    async def body(connection):
+        await connection._send_frame(padded_message(0, size))
+        return await connection.send('Runtime.evaluate')
+    
+    result = run_with_server(handler, body)
+    assert len(padded_message(1, size)) == size
+    assert result == json.loads(padded_message(1, size))['result']
+    assert seen == {'fin': True, 'opcode': 0x1, 'code': length_code, 'size': size, 'payload': padded_message(0, size)}
+
+
+def test_fragmented_message_with_interleaved_ping():
+    pongs = []
+    
+    async def handler(reader, writer):
+        _, _, payload, _ = await read_client_frame(reader)
+        message = json.dumps({'id': json.loads(payload)['id'], 'result': {'result': {'value': 'assembled'}}}).encode()
+        parts = [message[:5], message[5:20], message[20:]]
+        writer.write(server_frame(parts[0], opcode=0x1, fin=False))
+        writer.write(server_frame(parts[1], opcode=0x0, fin=False))
+        writer.write(server_frame(b'are-you-there', opcode=0x9))
+        await writer.drain()
+        pongs.append(await read_client_frame(reader))
+        writer.write(server_frame(parts[2], opcode=0x0, fin=True))
+        await writer.drain()
+        await asyncio.sleep(5)
+    
+    assert run_with_server(handler, lambda connection: connection.evaluate('return 1;')) == 'assembled'
+    fin, opcode, payload, _ = pongs[0]
+    assert (fin, opcode, payload) == (True, 0xA, b'are-you-there')
+
+
+def test_events_reach_listeners():
+    async def handler(reader, writer):
+        await read_client_frame(reader)  # Inspector.enable
+        writer.write(server_frame(json.dumps({'method': 'Inspector.targetCrashed', 'params': {'why': 'oom'}}).encode()))
+        await writer.drain()
+        await asyncio.sleep(5)
+    
+    async def body(connection):
+        received = asyncio.get_running_loop().create_future()
+        connection.on('Inspector.targetCrashed', received.set_result)
+        await connection._send_frame(json.dumps({'id': 1, 'method': 'Inspector.enable'}).encode())
+        return await received
+    
+    assert run_with_server(handler, body) == {'why': 'oom'}
+
+
+def test_close_frame_fails_pending_calls_and_is_answered():
+    replies = []
+    
+    async def handler(reader, writer):
+        await read_client_frame(reader)
+        writer.write(server_frame(qd.struct.pack('>H', 1000), opcode=0x8))
+        await writer.drain()
+        replies.append(await read_client_frame(reader))
+    
+    async def body(connection):
+        closed = []
+        connection.on('__closed__', closed.append)
+        with pytest.raises(ConnectionError):
+            await connection.send('Runtime.evaluate', {'expression': '1'}, timeout=3)
+        await asyncio.sleep(0)
+        with pytest.raises(ConnectionError):
+            await connection.send('Runtime.evaluate')
+        return closed, connection.closed
+    
+    closed, is_closed = run_with_server(handler, body)
+    assert closed == [{}] and is_closed
+    fin, opcode, payload, _ = replies[0]
+    assert (opcode, payload) == (0x8, qd.struct.pack('>H', 1000))
+
+
+# ---- Context tabs: one flat target session each on the browser websocket ----
+
+class NoFleetLock:
+    """Tabs with their own target session must never take the fleet lock"""
+    
+    def __enter__(self):
+        raise AssertionError("fleet lock taken")
+    
+    def __exit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def browser_endpoint():
+    """Fake browser-level DevTools websocket: attachToTarget hands out sessions, the 'slow' tab answers late"""
+    seen = []
+    loop = asyncio.new_event_loop()
+    ready = qd.threading.Event()
+    
+    async def reply(writer, request):
+        params = request.get('params', {})
+        if request['method'] == 'Target.attachToTarget':
+            assert params['flatten'] is True
+            result = {'sessionId': f"S-{params['targetId']}"}
+        else:
+            if request.get('sessionId') == 'S-slow':
+                await asyncio.sleep(1)
+            result = {'result': {'value': request.get('sessionId')}}
+        writer.write(server_frame(json.dumps({'id': request['id'], 'sessionId': request.get('sessionId'),
+                                              'result': result}).encode()))
+        await writer.drain()
+    
+    async def serve(reader, writer):
+        request = await reader.readuntil(b"\r\n\r\n")
+        key = re.search(rb"Sec-WebSocket-Key: (\S+)", request).group(1).decode()
+        accept = qd.base64.b64encode(qd.hashlib.sha1((key + qd.CdpConnection.WEBSOCKET_GUID).encode()).digest()).decode()
+        writer.write((f"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode())
+        await writer.drain()
+        try:
+            while True:
+                _, _, payload, _ = await read_client_frame(reader)
+                request = json.loads(payload)
+                seen.append(request)
+                asyncio.ensure_future(reply(writer, request))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+    
+    async def start():
+        server = await asyncio.start_server(serve, '127.0.0.1', 0)
+        seen.append(server.sockets[0].getsockname()[1])
+        ready.set()
+    
+    qd.threading.Thread(target=loop.run_forever, daemon=True).start()
+    asyncio.run_coroutine_threadsafe(start(), loop)
+    ready.wait(5)
+    port = seen.pop()
+    targets = qd.TargetSessions(f"ws://127.0.0.1:{port}/devtools/browser/1")
+    targets._run(targets.connection.connect(), 5)
+    yield targets, seen
+    targets.close()
+    loop.call_soon_threadsafe(loop.stop)
+
+
+def test_context_tabs_run_side_by_side_on_their_own_sessions(browser_endpoint):
+    targets, seen = browser_endpoint
+    slow = qd.ContextDriver(None, 'slow', None, NoFleetLock(), targets)
+    fast = qd.ContextDriver(None, 'fast', None, NoFleetLock(), targets)
+    assert (slow.session_id, fast.session_id) == ('S-slow', 'S-fast')
+    
+    pending = qd.ThreadPoolExecutor(1).submit(slow.execute_script, "return 1;")
+    time.sleep(0.1)
+    started = time.monotonic()
+    assert fast.execute_script("return arguments[0];", 5) == 'S-fast'
+    assert time.monotonic() - started < 0.5  # Did not wait for the slow tab
+    assert not pending.done()
+    assert pending.result(timeout=5) == 'S-slow'
+    
+    evaluations = [r for r in seen if r['method'] == 'Runtime.evaluate']
+    assert [r['sessionId'] for r in evaluations] == ['S-slow', 'S-fast']
+    assert evaluations[1]['params']['expression'].endswith(".apply(null, [5])")
+    assert fast.execute_cdp_cmd('Emulation.setFocusEmulationEnabled', {'enabled': True}) == {'result': {'value': 'S-fast'}}
+    assert seen[-1]['sessionId'] == 'S-fast'
@@ -0,0 +1,92 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("selenium")
+
+import quinix_dashboard as qd
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(qd.time, 'time', lambda: now[0])
+    return now
+
+
+def test_trips_after_threshold_failures(clock):
+    breaker = qd.CircuitBreaker(threshold=3, cooldown=60)
+    assert [breaker.record_failure() for _ in range(3)] == [False, False, True]
+    assert breaker.state == 'open' and not breaker.allow()
+
+
+def test_success_resets_the_count(clock):
+    breaker = qd.CircuitBreaker(threshold=3, cooldown=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    assert breaker.record_failure() is False
+    assert breaker.state == 'closed'
+
+
+def test_half_open_trial_success_closes(clock):
+    breaker = qd.CircuitBreaker(threshold=1, cooldown=60)
+    breaker.record_failure()
+    clock[0] += 59
+    assert breaker.state == 'open'
+    clock[0] += 1
+    assert breaker.state == 'half-open' and breaker.allow()
+    breaker.record_success()
+    assert breaker.state == 'closed' and breaker.failures == 0
+
+
+def test_half_open_trial_failure_reopens_at_once(clock):
+    breaker = qd.CircuitBreaker(threshold=3, cooldown=60)
+    for _ in range(3):
+        breaker.record_failure()
+    clock[0] += 60
+    assert breaker.record_failure() is True  # One failed trial is enough
+    assert breaker.state == 'open'
+    clock[0] += 30
+    assert not breaker.allow()
+
+
+@pytest.fixture
+def poller():
+    poller = qd.ConcurrentPoller(max_workers=4)
+    yield poller
+    poller.shutdown()
+
+
+def test_poller_collects_results_errors_and_timeouts(poller):
+    release = threading.Event()
+    
+    def fail():
+        raise RuntimeError("no such window")
+    
+    started = time.time()
+    results = poller.run({0: lambda: 'ok', 1: fail, 2: lambda: release.wait(5)}, timeout=0.3)
+    release.set()
+    assert time.time() - started < 2
+    assert results[0] == 'ok'
+    assert isinstance(results[1], RuntimeError)
+    assert isinstance(results[2], TimeoutError)
+
+
+def test_poller_parks_a_failing_window_and_skips_it(poller, monkeypatch):
+    monkeypatch.setattr(qd, 'BREAKER_FAILURE_THRESHOLD', 2)
+    calls = []
+    
+    def broken():
+        calls.append(1)
+        raise RuntimeError("dead")
+    
+    tripped = []
+    for _ in range(2):
+        tripped += poller.record(poller.run({0: lambda: 'ok', 1: broken}))
+    assert tripped == [1]
+    assert poller.parked() == [1] and poller.allowed([0, 1]) == [0]
+    results = poller.run({0: lambda: 'ok', 1: broken})
+    assert isinstance(results[1], qd.CircuitOpen) and len(calls) == 2
+    assert poller.record(results) == []  # A skipped call is not another failure
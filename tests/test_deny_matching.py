@@ -0,0 +1,97 @@
+import glob
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKER_FILES = sorted(glob.glob(os.path.join(ROOT, "worker-*.txt")))
+
+pytestmark = pytest.mark.skipif(not shutil.which("node"), reason="node is needed to run the worker's network hook")
+
+HOOK_DRIVER = """
+const src = require('fs').readFileSync(process.argv[1], 'utf8');
+const start = src.indexOf('// NETWORK CONFIRM');
+const end = src.indexOf('// Dashboard logging setup');
+global.window = global;
+global.performance = { now: () => Date.now() };
+global.fetch = (input, init) => Promise.resolve({ status: init.status, ok: init.status < 300, clone() { return this; }, json: async () => ({}) });
+global.XMLHttpRequest = class {
+    open() {}
+    addEventListener(name, callback) { this.onloadend = callback; }
+    send() { this.status = 200; setTimeout(() => this.onloadend(), 0); }
+};
+(new Function(src.slice(start, end) + '; window.waitForDenyResponse = waitForDenyResponse;'))();
+// One line in: [requestId, [[method, url, body, status, via], ...]] -> the response taken as the deny confirmation (or null)
+require('readline').createInterface({ input: process.stdin }).on('line', async line => {
+    const [requestId, responses] = JSON.parse(line);
+    const pending = window.waitForDenyResponse(window.__quinixNetHook.seq, 200, requestId);
+    for (const [method, url, body, status, via] of responses) {
+        if (via === 'xhr') {
+            const xhr = new XMLHttpRequest();
+            xhr.open(method, url);
+            xhr.send(body);
+            await new Promise(resolve => setTimeout(resolve, 5));
+        } else {
+            await window.fetch(url, { method: method, body: body, status: status || 200 });
+        }
+    }
+    const match = await pending;
+    console.log(JSON.stringify(match && { method: match.method, url: match.url, status: match.status }));
+});
+"""
+
+
+@pytest.fixture
+def hook(request):
+    """The worker's own fetch/XHR hook and deny matcher running in node"""
+    process = subprocess.Popen(["node", "-e", HOOK_DRIVER, request.param], stdin=subprocess.PIPE,
+                               stdout=subprocess.PIPE, text=True)
+
+    def confirmation(request_id, *responses):
+        process.stdin.write(json.dumps([request_id, [list(r) for r in responses]]) + "\n")
+        process.stdin.flush()
+        return json.loads(process.stdout.readline())
+    yield confirmation
+    process.stdin.close()
+    process.wait(timeout=10)
+
+
+@pytest.mark.parametrize("hook", WORKER_FILES, ids=os.path.basename, indirect=True)
+def test_only_the_clicked_rows_request_confirms(hook):
+    # Unrelated writes right after the click are skipped, the row's own deny is taken
+    match = hook("4711",
+                 ("POST", "/api/absence/requests/4711/read", "", 200),
+                 ("POST", "/telemetry/leave-request-clicked", '{"id": 4711}', 200),
+                 ("POST", "/api/leaverequests/4712/deny", "", 200),
+                 ("GET", "/api/leaverequests/4711", "", 200),
+                 ("POST", "/api/leaverequests/4711/deny", "", 200))
+    assert match == {'method': 'POST', 'url': '/api/leaverequests/4711/deny', 'status': 200}
+
+
+@pytest.mark.parametrize("hook", WORKER_FILES, ids=os.path.basename, indirect=True)
+def test_request_id_in_the_body_counts(hook):
+    match = hook("R15", ("PATCH", "/api/leave/requests", '{"ids":["R15"],"status":"DENIED"}', 409))
+    assert match == {'method': 'PATCH', 'url': '/api/leave/requests', 'status': 409}
+    # An id that only contains the row's id is another row
+    assert hook("R15", ("PATCH", "/api/leave/requests", '{"ids":["R150"],"status":"DENIED"}', 200)) is None
+
+
+@pytest.mark.parametrize("hook", WORKER_FILES, ids=os.path.basename, indirect=True)
+def test_unmatched_responses_leave_the_click_unconfirmed(hook):
+    assert hook("4711",
+                ("POST", "/api/requests/prefetch", "", 200),
+                ("PUT", "/api/absence/requests/4712", '{"status":"DENIED"}', 200)) is None
+
+
+@pytest.mark.parametrize("hook", WORKER_FILES, ids=os.path.basename, indirect=True)
+def test_rows_without_an_id_need_the_deny_endpoint(hook):
+    assert hook(None, ("POST", "/api/requests/mark-seen", "", 200)) is None
+    match = hook(None,
+                 ("POST", "/api/notifications/seen", "", 200),
+                 ("POST", "/api/absence/requests/88/reject", "", 200, "xhr"))
+    assert match == {'method': 'POST', 'url': '/api/absence/requests/88/reject', 'status': 200}
+    match = hook(None, ("PATCH", "/api/leaverequests/88", "status=denied", 200))
+    assert match['url'] == "/api/leaverequests/88"
@@ -0,0 +1,48 @@
+import pytest
+
+pytest.importorskip("selenium")
+
+import quinix_dashboard as qd
+
+
+@pytest.fixture(autouse=True)
+def thresholds(monkeypatch):
+    monkeypatch.setattr(qd, 'ENDGAME_THRESHOLD', 60)
+    monkeypatch.setattr(qd, 'ENDGAME_SOLO_THRESHOLD', 5)
+
+
+@pytest.mark.parametrize("remaining,expected", [
+    (None, {0, 1, 2, 3, 4, 5}),
+    (500, {0, 1, 2, 3, 4, 5}),
+    (60, {0, 5}),       # Top and bottom worker can never pick the same row
+    (6, {0, 5}),
+    (5, {0}),
+    (0, {0}),
+])
+def test_active_workers_collapse_as_the_list_shrinks(remaining, expected):
+    assert qd.endgame_active_workers(remaining, 6) == expected
+
+
+def test_a_single_worker_is_never_doubled():
+    assert qd.endgame_active_workers(30, 1) == {0}
+
+
+def test_phase_stats_count_collisions_and_latency_per_phase():
+    phases = qd.PhaseStats()
+    for latency in (100, 200, 300):
+        phases.record({'type': 'denied', 'latencyMs': latency})
+    phases.record({'type': 'failed', 'reason': 'SERVER_ERROR'})
+    phases.record({'type': 'heartbeat'})
+    phases.switch('endgame')
+    phases.switch('endgame')
+    phases.record({'type': 'denied', 'latencyMs': 900})
+    phases.record({'type': 'failed', 'reason': 'NO_DENY_BUTTON'})
+    
+    assert phases.stats['bulk'] == {'denied': 3, 'failed': 1, 'unconfirmed': 0, 'collisions': 0}
+    assert phases.stats['endgame'] == {'denied': 1, 'failed': 1, 'unconfirmed': 0, 'collisions': 1}
+    assert phases.latency_summary('bulk') == {'count': 3, 'avg_ms': 200, 'p50_ms': 200, 'p95_ms': 300}
+    assert phases.latency_summary('never')['count'] == 0
+    assert phases.report() == [
+        "bulk: 4 clicks, 25.0% failed, 0.0% probable collisions",
+        "endgame: 2 clicks, 50.0% failed, 50.0% probable collisions",
+    ]
@@ -0,0 +1,41 @@
+import io
+import json
+
+import pytest
+
+pytest.importorskip("selenium")
+
+import quinix_dashboard as qd
+
+
+def test_headless_reports_a_worker_beyond_the_scripts():
+    stream = io.StringIO()
+    console = qd.HeadlessConsole(stream=stream, progress_interval=1)
+    console.started = True
+    extra = len(qd.WORKER_FILES) + 1
+    console.update_worker_heartbeat(extra, alive=True)
+    console.update_worker_stats(extra, 7, 1)
+    console.update_worker_stats(1, 3, 0)
+    console.update()
+    progress = json.loads(stream.getvalue().splitlines()[-1])
+    assert progress['workers'][str(extra)]['state'] == 'online'
+    assert progress['workers'][str(extra)]['denied'] == 7
+    assert progress['denied'] == 10
+
+
+def test_web_dashboard_adds_and_publishes_a_new_worker():
+    web = qd.WebDashboard(port=0)
+    client = qd.queue.Queue()
+    web.clients.add(client)
+    extra = len(qd.WORKER_FILES) + 1
+    web.update_worker_stats(extra, 5, 0)
+    assert web.snapshot()['workers'][extra]['denied'] == 5
+    assert list(client.queue) == [('worker', {'worker': extra, 'fields': {'denied': 5, 'failed': 0, 'unconfirmed': 0}})]
+
+
+def test_worker_numbers_below_one_are_ignored():
+    console = qd.HeadlessConsole(stream=io.StringIO())
+    console.update_worker_stats(0, 5, 0)
+    console.mark_worker_parked(-1)
+    assert 0 not in console.worker_stats and -1 not in console.workers
+    assert sorted(console.worker_stats) == list(range(1, len(qd.WORKER_FILES) + 1))
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+pytest.importorskip("selenium")
+
+import quinix_dashboard as qd
+
+
+@pytest.fixture
+def config(tmp_path):
+    return qd.LiveConfig(str(tmp_path / "changes.jsonl"))
+
+
+def pushed(script):
+    args = script.rsplit("quinixSetConfig(", 1)[1].rsplit(")", 1)[0]
+    values, version = args.rsplit(", ", 1)
+    return json.loads(values), int(version)
+
+
+def test_parse_accepts_numbers_and_switches():
+    assert qd.LiveConfig.parse("delayBetweenDeletes=500, pipeline=off;batchSize=3") == {
+        'delayBetweenDeletes': 500, 'pipeline': False, 'batchSize': 3,
+    }
+    assert qd.LiveConfig.parse("  pipeline=ON  ") == {'pipeline': True}
+
+
+@pytest.mark.parametrize("text, message", [
+    ("", "nothing to change"),
+    ("speed=9", "unknown setting 'speed'"),
+    ("batchSize=0", "at least 1"),
+    ("denyResponseTimeout=999", "at least 1000"),
+    ("batchSize=1.5", "whole number"),
+    ("batchSize=true", "whole number"),
+    ("delayBetweenDeletes=", "whole number"),
+    ("pipeline=maybe", "on or off"),
+])
+def test_parse_rejects(text, message):
+    with pytest.raises(ValueError, match=message):
+        qd.LiveConfig.parse(text)
+
+
+def test_per_worker_overrides_win_over_the_fleet(config):
+    config.set({'batchSize': 4, 'delayBetweenDeletes': 100}, targets=[0, 1])
+    config.set({'batchSize': 1}, index=1)
+    assert config.desired(0) == {'batchSize': 4, 'delayBetweenDeletes': 100}
+    assert config.desired(1) == {'batchSize': 1, 'delayBetweenDeletes': 100}
+    assert config.describe() == "v2 batchSize=4 | delayBetweenDeletes=100 | W2: batchSize=1"
+
+
+def test_version_is_sent_until_acknowledged(config):
+    assert config.script(0) == ""  # Nothing overridden
+    config.set({'batchSize': 2}, targets=[0])
+    assert pushed(config.script(0)) == ({'batchSize': 2}, 1)
+    config.ack(0, False)  # Poll failed - send again
+    assert pushed(config.script(0)) == ({'batchSize': 2}, 1)
+    config.ack(0, True)
+    assert config.script(0) == ""
+    config.forget(0)  # Page reloaded - it lost the overrides
+    assert pushed(config.script(0)) == ({'batchSize': 2}, 1)
+
+
+def test_change_is_measured_before_and_after(config, monkeypatch):
+    monkeypatch.setattr(qd, 'CONFIG_WINDOW', 60)
+    for t in range(0, 61, 10):
+        config.sample(0, t, now=1000 + t)  # 60/min
+    monkeypatch.setattr(qd.time, 'time', lambda: 1060)
+    change = config.set({'delayBetweenDeletes': 0}, targets=[0])
+    assert change['before'] == pytest.approx(60)
+    config.script(0)
+    config.ack(0, True)
+    for t in range(70, 121, 10):
+        config.sample(0, 60 + 2 * (t - 60), now=1000 + t)  # 120/min after the change
+    assert config.settle(now=1100) == []  # After-window still open
+    done, = config.settle(now=1121)
+    assert done['after'] == pytest.approx(120)
+    assert qd.LiveConfig.format_change(done).endswith("60.0/min -> 120.0/min (+100%)")
+    record = json.loads(open(config.log_file).read())
+    assert (record['version'], record['before_per_min'], record['after_per_min']) == (1, 60.0, 120.0)
@@ -0,0 +1,126 @@
+import glob
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+pytest.importorskip("selenium")
+
+import quinix_dashboard as qd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKER_FILES = sorted(glob.glob(os.path.join(ROOT, "worker-*.txt")))
+
+
+def batch(epoch, seq, entries=(), dropped=0, reset=False, discovered=()):
+    return {'epoch': epoch, 'seq': seq, 'entries': list(entries), 'dropped': dropped,
+            'reset': reset, 'discovered': list(discovered)}
+
+
+def cursor_of(drain, index):
+    """The (cursor, epoch) a drain script asks the page for"""
+    script = drain.script(index)
+    args = script.split("quinixDrainLogs(", 1)[1].split(")", 1)[0]
+    cursor, epoch = args.split(", ", 1)
+    return int(cursor), json.loads(epoch)
+
+
+def test_first_drain_starts_from_zero_and_is_not_a_reload():
+    drain = qd.WorkerLogDrain()
+    assert cursor_of(drain, 0) == (0, None)
+    entries, dropped, reset = drain.consume(0, batch('e1', 3, [{'seq': 0}, {'seq': 1}, {'seq': 2}], reset=True))
+    assert (len(entries), dropped, reset) == (3, 0, False)
+    assert cursor_of(drain, 0) == (3, 'e1')
+
+
+def test_new_epoch_is_a_reload():
+    drain = qd.WorkerLogDrain()
+    drain.consume(0, batch('e1', 5, reset=True))
+    _, _, reset = drain.consume(0, batch('e2', 2, reset=True))
+    assert reset and cursor_of(drain, 0) == (2, 'e2')
+
+
+def test_gaps_are_counted_per_worker():
+    drain = qd.WorkerLogDrain()
+    drain.consume(0, batch('e1', 600, dropped=88, reset=True))
+    drain.consume(0, batch('e1', 1200, dropped=12))
+    drain.consume(1, batch('e9', 10))
+    assert drain.lost == {0: 100}
+
+
+def test_empty_poll_keeps_the_cursor_and_discoveries_are_collected():
+    drain = qd.WorkerLogDrain()
+    drain.consume(0, batch('e1', 4, discovered=[{'id': 'R1'}]))
+    assert drain.consume(0, None) == ([], 0, False)
+    assert cursor_of(drain, 0) == (4, 'e1')
+    assert drain.discovered == [{'id': 'R1'}]
+
+
+def test_forget_restarts_the_cursor():
+    drain = qd.WorkerLogDrain()
+    drain.consume(0, batch('e1', 4))
+    drain.forget(0)
+    assert cursor_of(drain, 0) == (0, None)
+    assert drain.consume(0, batch('e2', 1, reset=True))[2] is False
+
+
+RING_DRIVER = """
+const src = require('fs').readFileSync(process.argv[1], 'utf8');
+const start = src.indexOf('const WORKER_LOG_CAPACITY');
+const end = src.indexOf('function updateDashboardLogs');
+global.window = global;
+(new Function(src.slice(start, end)))();
+const ring = window.workerLogs;
+// One line in: [entries to log, cursor, epoch] -> one line out: what quinixDrainLogs returns
+require('readline').createInterface({ input: process.stdin }).on('line', line => {
+    const [n, cursor, epoch] = JSON.parse(line);
+    for (let i = 0; i < n; i++) { ring.entries[ring.seq % ring.capacity] = { seq: ring.seq }; ring.seq++; }
+    console.log(JSON.stringify(window.quinixDrainLogs(cursor, epoch)));
+});
+"""
+
+
+@pytest.fixture
+def page(request):
+    """The worker's own ring buffer running in node"""
+    process = subprocess.Popen(["node", "-e", RING_DRIVER, request.param], stdin=subprocess.PIPE,
+                               stdout=subprocess.PIPE, text=True)
+    
+    def log_and_drain(count, cursor, epoch):
+        process.stdin.write(json.dumps([count, cursor, epoch]) + "\n")
+        process.stdin.flush()
+        return json.loads(process.stdout.readline())
+    yield log_and_drain
+    process.stdin.close()
+    process.wait(timeout=10)
+
+
+@pytest.mark.skipif(not shutil.which("node"), reason="node is needed to run the worker's ring buffer")
+@pytest.mark.parametrize("page", WORKER_FILES, ids=os.path.basename, indirect=True)
+def test_drain_against_the_real_ring_buffer(page):
+    drain = qd.WorkerLogDrain()
+    capacity = 512
+    
+    def step(count):
+        return drain.consume(0, page(count, *cursor_of(drain, 0)))
+    
+    entries, dropped, reset = step(capacity + 88)  # Overflowed before the first drain
+    assert (dropped, reset) == (88, False)
+    assert [entry['seq'] for entry in entries] == list(range(88, capacity + 88))
+    
+    entries, dropped, reset = step(10)
+    assert (dropped, reset) == (0, False)
+    assert [entry['seq'] for entry in entries] == list(range(capacity + 88, capacity + 98))
+    
+    assert step(0) == ([], 0, False)
+    
+    entries, dropped, reset = step(capacity + 5)  # Lapped between two drains
+    assert (dropped, reset, len(entries)) == (5, False, capacity)
+    assert drain.lost == {0: 93}
+    
+    # A cursor from another page (reload) starts over at the oldest entry still there
+    batch_from_old_epoch = page(0, 3, 'some-old-epoch')
+    assert batch_from_old_epoch['reset'] is True
+    assert batch_from_old_epoch['entries'][0]['seq'] == batch_from_old_epoch['seq'] - capacity
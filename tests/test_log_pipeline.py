@@ -0,0 +1,132 @@
+import gzip
+import json
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("selenium")
+
+import quinix_dashboard as qd
+
+
+def records(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_rotates_into_gzipped_backups(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    log = qd.LogFile(path, max_mb=0.002, backups=2)
+    for i in range(300):
+        log.add_log(f"line {i} " + "x" * 40, 'WORKER-1-TOP')
+        time.sleep(0.0005)
+    log.finish({'reason': 'done'})
+    log.close()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["log.jsonl", "log.jsonl.1.gz", "log.jsonl.2.gz"]
+    with gzip.open(path + ".1.gz", 'rt', encoding='utf-8') as f:
+        assert json.loads(f.readline())['type'] in ('log', 'summary')
+
+
+def test_failed_rotation_keeps_the_writer_alive(tmp_path, monkeypatch):
+    path = str(tmp_path / "log.jsonl")
+    
+    def broken_gzip(*args, **kwargs):
+        raise OSError("disk full")
+    monkeypatch.setattr(qd.gzip, 'open', broken_gzip)
+    log = qd.LogFile(path, max_mb=0.0005, backups=1)
+    for i in range(50):
+        log.add_log(f"line {i} " + "x" * 40)
+        time.sleep(0.002)
+    log.close()
+    assert log.thread.is_alive() is False
+    messages = [r['message'] for r in records(path)]
+    assert messages[0] == "line 0 " + "x" * 40
+    assert messages[-1] == "line 49 " + "x" * 40
+    assert len(messages) == 50  # Nothing truncated away when compressing failed
+
+
+def test_close_does_not_hang_on_a_full_queue(tmp_path, monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(qd.LogFile, '_run', lambda self: release.wait(3))
+    monkeypatch.setattr(qd, 'LOG_QUEUE_MAX', 5)
+    log = qd.LogFile(str(tmp_path / "log.jsonl"))
+    for i in range(10):
+        log.add_log(f"line {i}")
+    assert log.dropped == 5
+    started = time.time()
+    log.close()
+    assert time.time() - started < 5
+
+
+def test_banner_lines_are_not_logged(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    log = qd.LogFile(path)
+    log.add_log("=" * 80)
+    log.add_log("Loaded worker-1-top.txt", 'WORKER-1-TOP', 'success')
+    log.close()
+    assert [(r['level'], r['worker']) for r in records(path)] == [('success', 'WORKER-1-TOP')]
+
+
+class FakeText:
+    """The bits of a Tk Text widget LogView uses"""
+    
+    def __init__(self):
+        self.lines = []
+        self.inserts = 0
+        self.scrolls = 0
+    
+    def after(self, ms, callback):
+        self.callback = callback
+    
+    def insert(self, index, *chunks):
+        self.inserts += 1
+        self.tags = chunks[1::2]
+        self.lines += "".join(chunks[0::2]).splitlines(True)
+    
+    def index(self, index):
+        return f"{len(self.lines) + 1}.0"
+    
+    def delete(self, start, end):
+        del self.lines[:int(end.split('.')[0]) - 1]
+    
+    def see(self, index):
+        self.scrolls += 1
+
+
+def test_log_view_writes_batches_and_trims():
+    widget = FakeText()
+    view = qd.LogView(widget, max_lines=50, interval_ms=60000, queue_max=1000)
+    for i in range(120):
+        view.push(f"line {i}\n", 'system' if i < 60 else 'error')
+    assert widget.inserts == 0
+    view.flush()
+    assert (widget.inserts, widget.scrolls) == (1, 1)
+    assert widget.tags == ('system', 'error')  # Runs of the same tag are joined
+    assert len(widget.lines) < 50 and widget.lines[-1] == "line 119\n"
+    assert widget.callback == view.flush
+
+
+def test_log_view_skips_the_oldest_when_flooded():
+    widget = FakeText()
+    view = qd.LogView(widget, max_lines=500, queue_max=10)
+    for i in range(25):
+        view.push(f"line {i}\n", 'system')
+    view.flush()
+    assert widget.lines[0] == "... 15 log lines skipped in the window\n"
+    assert widget.lines[1] == "line 15\n"
+
+
+def test_log_view_keeps_writing_while_the_tk_loop_is_blocked(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(qd.time, 'monotonic', lambda: clock[0])
+    widget = FakeText()
+    view = qd.LogView(widget, max_lines=500, interval_ms=250)
+    for i in range(10):
+        view.push(f"setup {i}\n", 'system')
+    assert widget.inserts == 0
+    clock[0] += 0.3  # No update() call - the after() timer never fires
+    view.push("setup 10\n", 'system')
+    assert widget.inserts == 1 and len(widget.lines) == 11
+    view.push("setup 11\n", 'system')
+    assert widget.inserts == 1 and list(view.pending) == [("setup 11\n", 'system')]
@@ -0,0 +1,88 @@
+import pytest
+
+pytest.importorskip("selenium")
+
+import quinix_dashboard as qd
+
+
+class FakeDriver:
+    """Reports a fixed heap/DOM size and records the CDP commands it gets"""
+    
+    def __init__(self, heap_mb, nodes=1000):
+        self.heap_mb = heap_mb
+        self.nodes = nodes
+        self.commands = []
+    
+    def execute_cdp_cmd(self, command, params):
+        self.commands.append(command)
+        if command == 'Performance.getMetrics':
+            return {'metrics': [{'name': 'JSHeapUsedSize', 'value': self.heap_mb * 1024 * 1024},
+                                {'name': 'Nodes', 'value': self.nodes}]}
+        return {}
+    
+    def execute_script(self, script):
+        return 7
+
+
+def trims(driver):
+    return [c for c in driver.commands if c not in ('Performance.enable', 'Performance.getMetrics')]
+
+
+def test_under_the_limits_nothing_happens():
+    trimmer = qd.MemoryTrimmer()
+    driver = FakeDriver(heap_mb=qd.MEMORY_HEAP_LIMIT_MB - 1)
+    metrics, action = trimmer.check(1, driver)
+    assert action is None and trims(driver) == []
+    assert round(metrics['heap_mb']) == qd.MEMORY_HEAP_LIMIT_MB - 1
+
+
+def test_escalates_step_by_step_and_reload_is_last():
+    trimmer = qd.MemoryTrimmer()
+    driver = FakeDriver(heap_mb=10, nodes=qd.MEMORY_NODE_LIMIT + 1)
+    actions = [trimmer.check(1, driver)[1] for _ in range(5)]
+    assert actions == ['gc', 'prune (7 rows)', 'pressure', 'reload', 'gc']
+    assert trims(driver) == ['HeapProfiler.collectGarbage', 'HeapProfiler.collectGarbage',
+                             'Memory.simulatePressureNotification', 'HeapProfiler.collectGarbage']
+
+
+def test_recovery_resets_the_escalation_per_worker():
+    trimmer = qd.MemoryTrimmer()
+    big, small = FakeDriver(heap_mb=qd.MEMORY_HEAP_LIMIT_MB + 50), FakeDriver(heap_mb=10)
+    assert trimmer.check(1, big)[1] == 'gc'
+    assert trimmer.check(2, big)[1] == 'gc'  # Other worker has its own ladder
+    assert trimmer.check(1, small)[1] is None
+    assert trimmer.check(1, big)[1] == 'gc'
+
+
+def test_trend_is_heap_growth_over_the_history(monkeypatch):
+    monkeypatch.setattr(qd, 'MEMORY_HISTORY_POINTS', 3)
+    trimmer = qd.MemoryTrimmer()
+    assert trimmer.trend(1) == 0.0
+    for heap in (100, 120, 150, 190):
+        trimmer.check(1, FakeDriver(heap_mb=heap))
+    assert trimmer.trend(1) == pytest.approx(70)
+
+
+class HungDriver(FakeDriver):
+    """A renderer that stopped answering"""
+    
+    def execute_cdp_cmd(self, command, params):
+        qd.time.sleep(5)
+        return super().execute_cdp_cmd(command, params)
+
+
+def test_checks_run_through_the_poller_with_a_deadline_per_window():
+    """The monitor loop fans the checks out - a hung window only fails its own check"""
+    trimmer = qd.MemoryTrimmer()
+    poller = qd.ConcurrentPoller(max_workers=3)
+    drivers = [FakeDriver(heap_mb=100), HungDriver(heap_mb=100), FakeDriver(heap_mb=qd.MEMORY_HEAP_LIMIT_MB + 1)]
+    started = qd.time.monotonic()
+    results = poller.run({
+        i: (lambda i=i, driver=driver: trimmer.check(i+1, driver)) for i, driver in enumerate(drivers)
+    }, timeout=0.5)
+    assert qd.time.monotonic() - started < 2
+    assert results[0][1] is None
+    assert isinstance(results[1], TimeoutError)
+    assert results[2][1] == 'gc'
+    assert sorted(trimmer.history) == [1, 3]
+    poller.shutdown()
@@ -0,0 +1,93 @@
+import os
+import socket
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("selenium")
+
+import quinix_dashboard as qd
+
+
+@pytest.fixture
+def profiles(tmp_path, monkeypatch):
+    monkeypatch.setattr(qd, 'PROFILE_ROOT', str(tmp_path))
+    monkeypatch.setattr(qd, 'PROFILE_TMPFS', None)
+    monkeypatch.setattr(qd, 'relocated_profiles', {})
+    golden = tmp_path / "GoldenProfile"
+    (golden / qd.GOLDEN_INNER_PROFILE).mkdir(parents=True)
+    (golden / qd.GOLDEN_INNER_PROFILE / "Cookies").write_text("session")
+    return qd.ProfileManager(str(golden))
+
+
+@pytest.fixture
+def live_pid():
+    process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    yield process.pid
+    process.kill()
+    process.wait()
+
+
+def lock(path, pid):
+    os.makedirs(path, exist_ok=True)
+    os.symlink(f"{socket.gethostname()}-{pid}", os.path.join(path, 'SingletonLock'))
+
+
+def test_clone_replaces_an_unused_profile(profiles):
+    target = qd.get_profile_dir(1)
+    os.makedirs(target)
+    open(os.path.join(target, "old"), "w").close()
+    profiles.clone(1)
+    assert not os.path.exists(os.path.join(target, "old"))
+    assert os.path.exists(os.path.join(target, "Profile1", "Cookies"))
+    assert qd.relocated_profiles == {}
+
+
+@pytest.mark.skipif(os.name == 'nt', reason="SingletonLock is the POSIX lock")
+def test_clone_never_deletes_a_profile_a_browser_still_holds(profiles, live_pid):
+    target = qd.get_profile_dir(2)
+    lock(target, live_pid)
+    open(os.path.join(target, "in-use"), "w").close()
+    profiles.clone(2)
+    assert os.path.exists(os.path.join(target, "in-use"))
+    relocated = qd.relocated_profiles[2]
+    assert relocated != target and qd.get_profile_dir(2) == relocated
+    assert os.path.exists(os.path.join(relocated, "Profile2", "Cookies"))
+
+
+@pytest.mark.skipif(os.name == 'nt', reason="SingletonLock is the POSIX lock")
+def test_stale_lock_from_a_dead_browser_is_reused(profiles, tmp_path):
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    target = qd.get_profile_dir(3)
+    lock(target, process.pid)
+    assert not qd.profile_in_use(target)
+    profiles.clone(3)
+    assert qd.relocated_profiles == {}
+
+
+def test_recorded_browser_pid_counts_as_in_use(tmp_path, live_pid):
+    if not qd.read_process_table():
+        pytest.skip("no process table on this platform")
+    assert qd.profile_in_use(str(tmp_path), browser_pid=live_pid)
+    assert not qd.profile_in_use(str(tmp_path))
+
+
+def test_in_use_check_leaves_stale_locks_alone(profiles):
+    target = qd.get_profile_dir(4)
+    os.makedirs(target)
+    lockfile = os.path.join(target, 'lockfile')
+    open(lockfile, "w").close()
+    assert not qd.profile_in_use(target)
+    assert os.path.exists(lockfile)
+    qd.clear_stale_locks(target)
+    assert not os.path.exists(lockfile)
+
+
+@pytest.mark.skipif(os.name == 'nt', reason="SingletonLock is the POSIX lock")
+def test_clone_keeps_the_lock_of_a_live_browser(profiles, live_pid):
+    target = qd.get_profile_dir(5)
+    lock(target, live_pid)
+    profiles.clone(5)
+    assert os.path.islink(os.path.join(target, 'SingletonLock'))
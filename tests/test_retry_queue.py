@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+pytest.importorskip("selenium")
+
+import quinix_dashboard as qd
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(qd.time, 'time', lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def retries(tmp_path, clock):
+    return qd.RetryQueue(str(tmp_path / "dead.jsonl"))
+
+
+def failed(key, reason='SERVER_ERROR'):
+    return {'type': 'failed', 'key': key, 'reason': reason, 'status': 503}
+
+
+def state(script):
+    assert script.startswith("if (window.quinixSetRetryState)")
+    return json.loads(script.rsplit("quinixSetRetryState(", 1)[1].rsplit(")", 1)[0])
+
+
+def test_backoff_doubles_and_hands_the_key_back_when_due(retries, clock):
+    assert retries.record(0, failed('A')) == 'queued'
+    assert retries.script(0) == ""  # Not due yet
+    clock[0] += qd.RETRY_BASE_DELAY
+    assert state(retries.script(0)) == {'retry': ['A'], 'dead': []}
+    retries.ack(0, True)
+    assert retries.script(0) == ""  # Delivered once
+    
+    assert retries.record(0, failed('A')) == 'queued'
+    clock[0] += qd.RETRY_BASE_DELAY
+    assert retries.script(0) == ""
+    clock[0] += qd.RETRY_BASE_DELAY  # Second attempt waits twice as long
+    assert state(retries.script(0))['retry'] == ['A']
+
+
+def test_backoff_is_capped(retries, clock, monkeypatch):
+    monkeypatch.setattr(qd, 'RETRY_MAX_ATTEMPTS', 10)
+    for _ in range(8):
+        retries.record(0, failed('A'))
+    assert retries.items['A']['due_at'] - clock[0] == qd.RETRY_MAX_DELAY
+
+
+def test_dead_letter_after_max_attempts(retries, tmp_path):
+    outcomes = [retries.record(2, failed('A')) for _ in range(qd.RETRY_MAX_ATTEMPTS)]
+    assert outcomes[-1] == 'dead' and set(outcomes[:-1]) == {'queued'}
+    assert 'A' not in retries.items and retries.dead['A']['attempts'] == qd.RETRY_MAX_ATTEMPTS
+    assert state(retries.script(2)) == {'retry': [], 'dead': ['A']}
+    record = json.loads((tmp_path / "dead.jsonl").read_text())
+    assert (record['worker'], record['key'], record['reason'], record['status']) == (3, 'A', 'SERVER_ERROR', 503)
+
+
+def test_non_retryable_reason_is_dead_at_once(retries):
+    assert retries.record(0, failed('B', 'CLIENT_ERROR')) == 'dead'
+    assert retries.by_reason == {'CLIENT_ERROR': 1}
+
+
+def test_failed_delivery_is_sent_again(retries, clock):
+    retries.record(1, failed('A'))
+    retries.record(1, failed('D', 'CLIENT_ERROR'))
+    clock[0] += qd.RETRY_BASE_DELAY
+    first = state(retries.script(1))
+    retries.ack(1, False)  # The poll carrying it failed
+    assert state(retries.script(1)) == first == {'retry': ['A'], 'dead': ['D']}
+
+
+def test_success_or_disappearance_resolves(retries):
+    retries.record(0, failed('A'))
+    retries.record(0, failed('B'))
+    assert retries.record(0, {'type': 'denied', 'key': 'A'}) == 'resolved'
+    assert retries.record(0, {'type': 'retry-missing', 'key': 'B'}) == 'resolved'
+    assert retries.record(0, {'type': 'denied', 'key': 'C'}) is None
+    assert retries.items == {}
+
+
+def test_retries_stay_with_their_worker(retries, clock):
+    retries.record(0, failed('A'))
+    clock[0] += qd.RETRY_BASE_DELAY
+    assert retries.script(1) == ""
+    assert state(retries.script(0))['retry'] == ['A']
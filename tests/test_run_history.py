@@ -0,0 +1,71 @@
+import pytest
+
+pytest.importorskip("selenium")
+
+import quinix_dashboard as qd
+
+
+def stats(**workers):
+    """stats(w1=(denied, failed)) -> console.worker_stats layout"""
+    return {int(name[1:]): {'deleted': d, 'failed': f, 'unconfirmed': 0} for name, (d, f) in workers.items()}
+
+
+def minutes(history):
+    return [row[0] for row in history.db.execute(
+        "SELECT processed FROM run_minutes WHERE run_id = ? ORDER BY minute", (history.run_id,))]
+
+
+@pytest.fixture
+def history(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(qd.time, 'time', lambda: clock[0])
+    history = qd.RunHistory(":memory:")
+    history.clock = clock
+    yield history
+    history.close()
+
+
+def test_worker_counters_treat_a_drop_as_a_reset():
+    counters = qd.WorkerCounters()
+    counters.prime(stats(w1=(100, 0), w2=(50, 5)))
+    assert counters.update(stats(w1=(110, 0), w2=(60, 5))) == {1: (10, 10), 2: (10, 10)}
+    # Window 1 restarted and has handled 4 rows since
+    assert counters.update(stats(w1=(3, 1), w2=(70, 5))) == {1: (3, 4), 2: (10, 10)}
+    assert counters.update(stats(w1=(8, 1), w2=(70, 5))) == {1: (5, 5), 2: (0, 0)}
+
+
+def test_sample_counts_work_after_a_counter_reset(history):
+    history.begin(2, ["a"], stats(w1=(500, 0), w2=(500, 0)))  # Reattached with old counts
+    history.clock[0] += 30
+    history.sample(stats(w1=(520, 0), w2=(520, 0)))
+    history.clock[0] += 60
+    history.sample(stats(w1=(10, 0), w2=(540, 0)))  # Window 1 reloaded
+    history.clock[0] += 60
+    history.sample(stats(w1=(30, 0), w2=(560, 0)))
+    assert minutes(history) == [40, 30, 40]
+    assert history.handled == 110
+
+
+def test_finish_rate_uses_handled_not_page_totals(history):
+    history.begin(1, ["a"], stats(w1=(1000, 0)))
+    history.clock[0] += 120
+    history.sample(stats(w1=(60, 0)))  # Restarted: 60 new rows, page total far below the start
+    history.finish(dict(reason='done', processed=60, denied=60, failed=0, unconfirmed=0, dead_letters=0),
+                   qd.PhaseStats())
+    per_min, = history.db.execute("SELECT per_min FROM runs WHERE id = ?", (history.run_id,)).fetchone()
+    assert per_min == 30.0
+
+
+def test_report_flags_a_regression_against_earlier_runs(history):
+    for rate in (100, 100, 100, 100, 100, 60):
+        history.begin(1, ["a"], stats(w1=(0, 0)))
+        total = 0
+        for _ in range(5):
+            history.clock[0] += 60
+            total += rate
+            history.sample(stats(w1=(total, 0)))
+        history.finish(dict(reason='done', processed=total, denied=total, failed=0, unconfirmed=0,
+                            dead_letters=0), qd.PhaseStats())
+    report = history.report(10)
+    assert report.count("REGRESSION") == 1
+    assert "40% below" in report
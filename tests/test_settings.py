@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+pytest.importorskip("selenium")
+
+import quinix_dashboard as qd
+
+
+@pytest.fixture(autouse=True)
+def restore(monkeypatch):
+    """apply_settings writes module globals - put every default back afterwards"""
+    for name, value in list(vars(qd).items()):
+        if name.isupper() and not callable(value):
+            monkeypatch.setattr(qd, name, value)
+
+
+def settings(*items, config=None, headless=False, tmp_path=None):
+    argv = [arg for item in items for arg in ('--set', item)]
+    if config is not None:
+        path = tmp_path / "quinix.json"
+        path.write_text(json.dumps(config))
+        argv += ['--config', str(path)]
+    if headless:
+        argv.append('--headless')
+    return qd.load_settings(qd.parse_args(argv))
+
+
+def test_values_are_converted_to_the_default_type():
+    qd.apply_settings(settings('POLL_TIMEOUT=20', 'ANTI_THROTTLE_FLAGS=["--a"]', 'FLEET_MODE=contexts'))
+    assert qd.POLL_TIMEOUT == 20
+    assert qd.ANTI_THROTTLE_FLAGS == ["--a"]
+    assert qd.FLEET_MODE == 'contexts'
+
+
+def test_wrong_type_is_rejected():
+    with pytest.raises(ValueError, match="POLL_TIMEOUT must be int"):
+        qd.apply_settings({'POLL_TIMEOUT': "soon"})
+    with pytest.raises(ValueError, match="must be int"):
+        qd.apply_settings({'POLL_TIMEOUT': True})
+
+
+def test_none_defaults_are_checked_against_their_declared_type():
+    with pytest.raises(ValueError, match="BROWSER_BINARY must be str"):
+        qd.apply_settings(settings('BROWSER_BINARY=123'))
+    with pytest.raises(ValueError, match="WEB_DASHBOARD_PORT must be int"):
+        qd.apply_settings({'WEB_DASHBOARD_PORT': "8765"})
+    qd.apply_settings(settings('BROWSER_BINARY=/usr/bin/chromium', 'WEB_DASHBOARD_PORT=8765'))
+    assert (qd.BROWSER_BINARY, qd.WEB_DASHBOARD_PORT) == ("/usr/bin/chromium", 8765)
+
+
+def test_every_none_default_has_a_declared_type():
+    nullable = {name for name, value in vars(qd).items() if name.isupper() and value is None}
+    assert nullable <= set(qd.NULLABLE_SETTING_TYPES)
+
+
+def test_none_switches_a_setting_off():
+    qd.apply_settings({'LOG_FILE': None, 'DEBUG_PORT_BASE': None})
+    assert qd.LOG_FILE is None and qd.DEBUG_PORT_BASE is None
+
+
+def test_unknown_or_lowercase_names_are_rejected():
+    for name in ('NO_SUCH_SETTING', 'time', 'apply_settings'):
+        with pytest.raises(ValueError, match="unknown setting"):
+            qd.apply_settings({name: 1})
+
+
+def test_config_file_then_set_later_wins(tmp_path):
+    result = settings('POLL_TIMEOUT=5', config={'POLL_TIMEOUT': 9, 'STATUS_CHECK_INTERVAL': 10}, tmp_path=tmp_path)
+    assert result == {'POLL_TIMEOUT': 5, 'STATUS_CHECK_INTERVAL': 10}
+
+
+def test_headless_flag_implies_headless_browsers_unless_set():
+    assert settings(headless=True)['HEADLESS'] is True
+    assert settings('HEADLESS=false', headless=True)['HEADLESS'] is False
@@ -0,0 +1,40 @@
+from datetime import date
+
+import pytest
+
+pytest.importorskip("selenium")
+
+import quinix_dashboard as qd
+
+URL = "https://web.quinyx.com/schedule/1?end=2026-02-28&start=2026-02-01&timeframe=multiday_month"
+
+
+def test_assign_splits_into_disjoint_slices():
+    planner = qd.ShardPlanner(URL)
+    ranges = planner.assign(6)
+    assert ranges[0][0] == date(2026, 2, 1) and ranges[5][1] == date(2026, 2, 28)
+    for index in range(5):
+        assert (ranges[index + 1][0] - ranges[index][1]).days == 1
+    assert "start=2026-02-01" in planner.url(0) and "end=2026-02-05" in planner.url(0)
+
+
+def test_no_overlap_between_honoured_slices():
+    top_keys = {0: ["A1", "A2", "A3"], 1: ["B1", "B2", "B3"], 2: ["C1"]}
+    assert qd.ShardPlanner.overlap(top_keys) is None
+
+
+def test_a_request_spanning_a_boundary_is_not_an_overlap():
+    top_keys = {0: ["A1", "A2", "SPAN"], 1: ["SPAN", "B1", "B2"]}
+    assert qd.ShardPlanner.overlap(top_keys) is None
+
+
+def test_ignored_date_filter_is_detected():
+    same = ["R1", "R2", "R3"]
+    top_keys = {0: ["A1", "A2", "A3"], 2: same, 4: list(same)}
+    first, second, shared = qd.ShardPlanner.overlap(top_keys)
+    assert (first, second) == (2, 4)
+    assert shared == set(same)
+
+
+def test_missing_keys_are_ignored():
+    assert qd.ShardPlanner.overlap({0: None, 1: [], 2: ["R1", "R2"]}) is None
@@ -0,0 +1,56 @@
+import pytest
+
+pytest.importorskip("selenium")
+
+import quinix_dashboard as qd
+
+SLOW = {'p95LagMs': 2500}
+FAST = {'p95LagMs': 40}
+
+
+@pytest.fixture(autouse=True)
+def settings(monkeypatch):
+    monkeypatch.setattr(qd, 'THROTTLE_LAG_MS', 1000)
+    monkeypatch.setattr(qd, 'THROTTLE_STRIKES', 3)
+    monkeypatch.setattr(qd, 'THROTTLE_ACTION', 'restart')
+
+
+def actions(detector, index, samples):
+    return [detector.check(index, lag)[1] for lag in samples]
+
+
+def test_needs_strikes_in_a_row_before_acting():
+    detector = qd.ThrottleDetector()
+    assert detector.check(0, SLOW) == (True, None)
+    assert detector.check(0, SLOW) == (True, None)
+    assert detector.check(0, SLOW) == (True, 'focus')
+
+
+def test_escalates_to_restart_and_stays_there():
+    detector = qd.ThrottleDetector()
+    assert actions(detector, 0, [SLOW] * 9) == [None, None, 'focus', None, None, 'restart', None, None, 'restart']
+
+
+def test_recovery_and_forget_start_the_ladder_over():
+    detector = qd.ThrottleDetector()
+    actions(detector, 0, [SLOW] * 3)
+    assert detector.check(0, FAST) == (False, None)
+    assert actions(detector, 0, [SLOW] * 3)[-1] == 'focus'
+    detector.forget(0)
+    assert actions(detector, 0, [SLOW] * 3)[-1] == 'focus'
+
+
+def test_missing_samples_do_not_count_either_way():
+    detector = qd.ThrottleDetector()
+    actions(detector, 0, [SLOW, SLOW])
+    assert detector.check(0, None) == (False, None)
+    assert detector.check(0, {}) == (False, None)
+    assert detector.check(0, SLOW) == (True, 'focus')
+
+
+def test_action_ceiling(monkeypatch):
+    monkeypatch.setattr(qd, 'THROTTLE_ACTION', 'focus')
+    detector = qd.ThrottleDetector()
+    assert actions(detector, 0, [SLOW] * 6)[-1] == 'focus'
+    monkeypatch.setattr(qd, 'THROTTLE_ACTION', None)
+    assert actions(qd.ThrottleDetector(), 1, [SLOW] * 6) == [None] * 6
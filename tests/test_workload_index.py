@@ -0,0 +1,43 @@
+import pytest
+
+pytest.importorskip("selenium")
+
+import quinix_dashboard as qd
+
+
+@pytest.fixture
+def index():
+    index = qd.WorkloadIndex()
+    yield index
+    index.close()
+
+
+def test_falls_back_to_the_longest_visible_list(index):
+    assert index.remaining() == (None, None)
+    index.visible_rows = {0: 12, 1: None, 2: 40}
+    assert index.remaining() == (40, 'visible rows')
+
+
+def test_discovered_ids_are_counted_once_and_done_statuses_are_not_pending(index):
+    assert index.add([{'id': 1, 'status': 'PENDING'}, {'id': '2', 'status': None}, {'id': None}]) == 2
+    assert index.add([{'id': '1', 'status': 'PENDING'}, {'id': 3, 'status': 'DENIED'}]) == 1
+    assert (index.known(), index.pending()) == (3, 2)
+    index.visible_rows = {0: 99}
+    assert index.remaining() == (2, 'discovered')
+
+
+def test_a_row_that_is_done_stays_done(index):
+    index.add([{'id': 'R7', 'status': 'DENIED'}])
+    index.add([{'id': 'R7', 'status': 'PENDING'}])  # Stale listing from another worker
+    assert index.pending() == 0
+
+
+def test_deny_urls_are_matched_by_id_once(index):
+    index.add([{'id': '4711'}, {'id': '4712'}])
+    assert index.mark_handled("/api/leaverequests/4711/deny?x=1", 'W1') == '4711'
+    assert index.mark_handled("/api/leaverequests/4711/deny", 'W2') is None
+    assert index.mark_handled("/api/leaverequests/47/deny", 'W1') is None
+    assert index.mark_handled(None, 'W1') is None
+    assert index.pending() == 1
+    handled_by = index.db.execute("SELECT handled_by FROM requests WHERE id = '4711'").fetchone()[0]
+    assert handled_by == 'W1'